@@ -0,0 +1,171 @@
+import argparse
+import json
+import multiprocessing
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.fixture_site import FixtureSite
+
+DB_WRITE_FUNCTIONS: tuple = (
+    "Database.save_card_info",
+    "Database.save_series_database",
+    "Database.normalize_database",
+    "Database.flush_file_info",
+    "Database.save_image_meta",
+    "Database.link_file_info_cid",
+)
+""" 計入資料庫寫入時間的函式 """
+
+
+def get_peak_rss_mb() -> float:
+    """
+    取得目前行程的最高常駐記憶體
+
+    Returns:
+        float: MB，平台不支援時為 None
+    """
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 單位為 KB，macOS 為 bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_scenario(work_dir: str, site_url: str, scenario: dict) -> dict:
+    """
+    在獨立行程中以 Runner 完整執行一次單一語言流程，並整理效能統計
+
+    Args:
+        work_dir (str): 輸出目錄，作為腳本目錄
+        site_url (str): 模擬網站網址
+        scenario (dict): Runner 參數，另含 name
+
+    Returns:
+        dict: 此情境的量測結果
+    """
+    # pylint: disable=import-outside-toplevel
+    from functions.metrics.metrics import METRICS
+    from functions.network.rate_limiter import RATE_LIMITER
+    from functions.runner.runner import Runner
+
+    runner = Runner(
+        work_dir,
+        incremental=scenario.get("incremental", False),
+        pipeline=scenario.get("pipeline", True),
+        crawl_workers=scenario.get("crawl_workers", 1),
+        metrics=True,
+        # 各情境共用輸出目錄，不使用頁面快取才能量測實際的爬取
+        page_cache_ttl=0,
+    )
+    summary = runner.run_language("", site_url)
+    report = METRICS.build_report()
+
+    duration = report["duration_seconds"]
+    counters = report["counters"]
+    functions = report["functions"]
+    return {
+        "name": scenario["name"],
+        "duration_seconds": duration,
+        "series_per_second": counters.get("series", 0) / duration,
+        "cards_per_second": report["rates"]["cards_per_second"],
+        "images_per_second": report["rates"]["images_per_second"],
+        "downloaded_mb": counters.get("bytes_downloaded", 0) / (1024 * 1024),
+        "db_write_seconds": sum(
+            functions[name]["total_seconds"]
+            for name in DB_WRITE_FUNCTIONS
+            if name in functions
+        ),
+        "peak_rss_mb": get_peak_rss_mb(),
+        "retries": counters.get("request_retries", 0),
+        "host_concurrency": RATE_LIMITER.report(),
+        "images": summary,
+    }
+
+
+def main() -> None:
+    """
+    以本機模擬網站量測爬取、儲存與下載的吞吐量
+    """
+    parser = argparse.ArgumentParser(description="爬取與下載吞吐量測試")
+    parser.add_argument("--series", type=int, default=8)
+    parser.add_argument("--cards-per-series", type=int, default=120)
+    parser.add_argument("--image-bytes", type=int, default=200_000)
+    parser.add_argument("--latency", type=float, default=0.02, help="每個請求的延遲秒數")
+    parser.add_argument("--pages-dir", help="錄製頁面的目錄")
+    parser.add_argument("--crawl-workers", type=int, default=4)
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=0,
+        help="模擬網站超過此並行請求數時回應 503，用於觀察速率限制的調整",
+    )
+    parser.add_argument("--json", help="將結果另存為 JSON 檔")
+    args = parser.parse_args()
+
+    scenarios = [
+        {"name": "serial", "pipeline": False},
+        {"name": "pipeline", "pipeline": True},
+        {
+            "name": f"pipeline x{args.crawl_workers}",
+            "pipeline": True,
+            "crawl_workers": args.crawl_workers,
+        },
+        {
+            "name": "incremental rerun",
+            "pipeline": True,
+            "crawl_workers": args.crawl_workers,
+            "incremental": True,
+        },
+    ]
+
+    results = []
+    with FixtureSite(
+        args.series,
+        args.cards_per_series,
+        args.image_bytes,
+        args.latency,
+        pages_dir=args.pages_dir,
+        max_concurrency=args.max_concurrency,
+    ) as site:
+        work_dir = tempfile.mkdtemp(prefix="bench_crawl_")
+        try:
+            for scenario in scenarios:
+                # 每個情境使用新的行程，最高記憶體才不會互相影響
+                with ProcessPoolExecutor(
+                    max_workers=1, mp_context=multiprocessing.get_context("spawn")
+                ) as executor:
+                    results.append(
+                        executor.submit(
+                            run_scenario, work_dir, site.url, scenario
+                        ).result()
+                    )
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print()
+    print(
+        f"{'情境':<20}{'秒':>8}{'系列/秒':>10}{'卡片/秒':>10}{'圖片/秒':>10}"
+        f"{'下載MB':>10}{'DB寫入秒':>10}{'最高RSS MB':>12}{'重試':>6}  並行上限"
+    )
+    for result in results:
+        peak_rss = result["peak_rss_mb"]
+        print(
+            f"{result['name']:<20}{result['duration_seconds']:>8.2f}"
+            f"{result['series_per_second']:>10.2f}{result['cards_per_second']:>10.1f}"
+            f"{result['images_per_second']:>10.1f}{result['downloaded_mb']:>10.1f}"
+            f"{result['db_write_seconds']:>10.3f}"
+            f"{(f'{peak_rss:.1f}' if peak_rss is not None else '-'):>12}"
+            f"{result['retries']:>6}  {result['host_concurrency']}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_normalize import build_synthetic_cards
+from benchmarks.fixture_site import FixtureSite
+from functions.database.database import Database
+from functions.download.image_download import Download
+
+
+def build_database(work_dir: str, site_url: str, cards_per_language: int) -> int:
+    """
+    建立已正規化的模擬資料庫，圖片網址指向本機模擬網站
+
+    Args:
+        work_dir (str): 腳本目錄
+        site_url (str): 模擬網站網址
+        cards_per_language (int): 每個語言的卡片列數
+
+    Returns:
+        int: 卡圖列數
+    """
+    cards = build_synthetic_cards(cards_per_language)
+    for card in cards:
+        card["img_src"] = card["img_src"].replace(
+            "https://example.com", f"{site_url}/images/cardlist/card"
+        )
+    database = Database(work_dir)
+    try:
+        database.check_db_folder()
+        database.save_card_info(
+            {f"series {series_id}": series_id for series_id in {c["series_id"] for c in cards}}
+        )
+        database.save_series_database(cards)
+        database.normalize_database()
+    finally:
+        database.close()
+    return len(cards)
+
+
+def run_case(work_dir: str, streaming: bool) -> tuple:
+    """
+    下載所有卡圖並量測 Python 配置的最高記憶體
+
+    Args:
+        work_dir (str): 腳本目錄
+        streaming (bool): 是否以產生器逐批讀取並逐一處理結果
+
+    Returns:
+        tuple: (秒數, 最高記憶體 MB, 結果數量)
+    """
+    database = Database(work_dir)
+    download = Download(work_dir, database=database)
+    download.check_image_folder()
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        if streaming:
+            count = sum(
+                1
+                for _ in download.iter_download_images(
+                    database.iter_card_info_with_series_id(), remember_results=False
+                )
+            )
+        else:
+            # 原本的作法：一次取出所有列並保留所有下載結果
+            count = len(
+                download.download_images(database.fetch_card_info_with_series_id())
+            )
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+        database.close()
+    return elapsed, peak, count
+
+
+def main() -> None:
+    """
+    比較一次讀取全部卡圖與串流讀取時，下載階段的最高記憶體是否隨卡片數量增加
+    """
+    parser = argparse.ArgumentParser(description="下載階段記憶體測試")
+    parser.add_argument(
+        "--cards-per-language",
+        type=lambda value: [int(size) for size in value.split(",")],
+        default=[250, 1000],
+        help="每個語言的卡片列數，逗號分隔可比較多種規模",
+    )
+    parser.add_argument("--image-bytes", type=int, default=2_000)
+    args = parser.parse_args()
+
+    print(f"{'情境':<12}{'卡圖列數':>10}{'秒':>10}{'最高記憶體MB':>16}")
+    with FixtureSite(image_bytes=args.image_bytes) as site:
+        for cards_per_language in args.cards_per_language:
+            work_dir = tempfile.mkdtemp(prefix="bench_download_memory_")
+            try:
+                rows = build_database(work_dir, site.url, cards_per_language)
+                for name, streaming in (("list", False), ("streaming", True)):
+                    elapsed, peak, count = run_case(work_dir, streaming)
+                    assert count == rows, (count, rows)
+                    print(f"{name:<12}{rows:>10}{elapsed:>10.2f}{peak:>16.2f}")
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
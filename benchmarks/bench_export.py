@@ -0,0 +1,158 @@
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.bench_normalize import build_synthetic_cards
+from functions.database.database import Database
+from functions.export.columnar_export import ColumnarExport
+
+
+def aggregate_columnar(export_dir: str) -> dict:
+    """
+    以記憶體映射讀取欄式匯出，計算各顏色的平均力量與費用分布
+
+    Args:
+        export_dir (str): 匯出目錄
+
+    Returns:
+        dict: 鍵為顏色，值為 (卡片數, 平均力量, 平均反擊值, 費用分布)
+    """
+    cards = ColumnarExport.load(export_dir)["cards_info"]
+    colors = cards["color"]
+    power = cards["power"]
+    counter = cards["counter"]
+    cost = cards["cost"]
+    dictionary = cards.dictionary("color")
+    counts = np.bincount(colors, minlength=len(dictionary))
+    power_sums = np.bincount(colors, weights=power, minlength=len(dictionary))
+    counter_sums = np.bincount(colors, weights=counter, minlength=len(dictionary))
+    return {
+        color: (
+            int(counts[code]),
+            power_sums[code] / counts[code],
+            counter_sums[code] / counts[code],
+            np.bincount(cost[colors == code], minlength=11).tolist(),
+        )
+        for code, color in enumerate(dictionary)
+        if counts[code]
+    }
+
+
+def aggregate_sqlite(db_path: str) -> dict:
+    """
+    以 SQLite 計算相同的統計
+
+    Args:
+        db_path (str): 資料庫路徑
+
+    Returns:
+        dict: 與 aggregate_columnar 相同格式
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        result = {}
+        for color, count, power, counter in conn.execute(
+            """SELECT color, COUNT(*), AVG(power), AVG(counter)
+            FROM cards_info GROUP BY color ORDER BY color"""
+        ):
+            costs = [0] * 11
+            for cost, cost_count in conn.execute(
+                "SELECT cost, COUNT(*) FROM cards_info WHERE color = ? GROUP BY cost",
+                (color,),
+            ):
+                costs[cost] = cost_count
+            result[color] = (count, power, counter, costs)
+    finally:
+        conn.close()
+    return result
+
+
+def aggregate_python(db_path: str) -> dict:
+    """
+    先將整個資料表讀成 Python 字典再計算，為目前分析腳本的做法
+
+    Args:
+        db_path (str): 資料庫路徑
+
+    Returns:
+        dict: 與 aggregate_columnar 相同格式
+    """
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = [dict(row) for row in conn.execute("SELECT * FROM cards_info")]
+    finally:
+        conn.close()
+    groups = {}
+    for row in rows:
+        groups.setdefault(row["color"], []).append(row)
+    result = {}
+    for color in sorted(groups):
+        group = groups[color]
+        costs = [0] * 11
+        for row in group:
+            costs[row["cost"]] += 1
+        result[color] = (
+            len(group),
+            sum(row["power"] for row in group) / len(group),
+            sum(row["counter"] for row in group) / len(group),
+            costs,
+        )
+    return result
+
+
+def main() -> None:
+    """
+    比較欄式匯出、SQLite 與 Python 字典三種方式計算全語言統計的耗時
+    """
+    parser = argparse.ArgumentParser(description="欄式匯出效能測試")
+    parser.add_argument("--cards-per-language", type=int, default=2500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_export_")
+    try:
+        database = Database(work_dir)
+        database.check_db_folder()
+        database.save_series_database(build_synthetic_cards(args.cards_per_language))
+        database.normalize_database()
+        export_dir = os.path.join(work_dir, "export", "optcg")
+        start = time.perf_counter()
+        manifest = ColumnarExport(database).export(export_dir)
+        print(
+            f"匯出 {manifest['cards_info']['rows']} 張卡片，"
+            f"耗時 {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+        database.close()
+        db_path = os.path.join(work_dir, "storage", "optcg.db")
+
+        expected = aggregate_python(db_path)
+        for name, func, source in (
+            ("欄式 mmap", aggregate_columnar, export_dir),
+            ("SQLite GROUP BY", aggregate_sqlite, db_path),
+            ("Python 字典", aggregate_python, db_path),
+        ):
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                result = func(source)
+                timings.append((time.perf_counter() - start) * 1000)
+            same = result.keys() == expected.keys() and all(
+                result[color][0] == expected[color][0]
+                and result[color][3] == expected[color][3]
+                and abs(result[color][1] - expected[color][1]) < 1e-6
+                for color in expected
+            )
+            median = sorted(timings)[len(timings) // 2]
+            print(f"{name:<16}中位數 {median:8.2f} ms，結果一致：{same}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import argparse
+import os
+import random
+import re
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from functions.database.database import Database
+
+LANGUAGES: tuple = ("ja", "cn", "hk", "tw", "th", "asia-en", "en", "fr")
+""" 模擬的語言網站 """
+
+
+def build_synthetic_cards(cards_per_language: int, seed: int = 0) -> list:
+    """
+    產生模擬多語言規模的卡片資料，包含重印與異圖
+
+    Args:
+        cards_per_language (int): 每個語言的卡片列數
+        seed (int): 亂數種子
+
+    Returns:
+        list: 卡片信息字典列表
+    """
+    rng = random.Random(seed)
+    cards = []
+    for language in LANGUAGES:
+        unique_cards = max(1, cards_per_language * 2 // 3)
+        for index in range(cards_per_language):
+            number = rng.randrange(unique_cards)
+            card_id = f"{language}-OP{number // 120:02d}-{number % 120:03d}"
+            suffix = f"_p{rng.randint(1, 3)}" if rng.random() < 0.2 else ""
+            cards.append(
+                {
+                    "card_id": card_id,
+                    "card_name": f"name {card_id}",
+                    "card_species": "C",
+                    "card_type": "CHARACTER",
+                    "img_src": f"https://example.com/{language}/{card_id}{suffix}.png",
+                    "cost": rng.randint(0, 10),
+                    "attribute": "斬",
+                    "power": rng.randint(0, 12) * 1000,
+                    "counter": rng.choice((0, 1000, 2000)),
+                    "color": rng.choice(("赤", "緑", "青", "紫", "黒", "黄")),
+                    "feature": "麦わらの一味",
+                    "effect": "【登場時】カードを1枚引く。" * 3,
+                    "get_info": f"series {index // 120}",
+                    "series_id": f"{language}-{index // 120}",
+                }
+            )
+    return cards
+
+
+def legacy_normalize(db_path: str) -> None:
+    """
+    原本逐筆查詢的正規化流程，僅供比較效能與結果
+
+    Args:
+        db_path (str): 資料庫路徑
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+        CREATE TABLE new_cards_info AS
+        SELECT row_number() OVER (ORDER BY card_id) as cid, card_id, card_name,
+            card_type, cost, attribute, power, counter, color, feature, effect
+        FROM (
+            SELECT card_id, card_name, card_type, cost, attribute, power, counter,
+                color, feature, effect,
+                ROW_NUMBER() OVER (PARTITION BY card_id ORDER BY img_src NOT LIKE '%_p%XX.png') as rn
+            FROM raw_cards_info
+        ) as RankedCards
+        WHERE rn = 1;
+        """
+        )
+        cursor.execute(
+            """CREATE TABLE cards_image_info (cid INTEGER, img_src TEXT,
+            card_species TEXT, get_info TEXT, series_id TEXT, is_diff INTEGER)"""
+        )
+        rows = cursor.execute(
+            "SELECT card_id, img_src, card_species, get_info, series_id FROM raw_cards_info"
+        ).fetchall()
+        for card_id, img_src, card_species, get_info, series_id in rows:
+            is_diff = 1 if re.search(r"_p\d+\.png$", img_src) else 0
+            cursor.execute("SELECT cid FROM new_cards_info WHERE card_id = ?", (card_id,))
+            cid = cursor.fetchone()[0]
+            cursor.execute(
+                "INSERT INTO cards_image_info VALUES (?, ?, ?, ?, ?, ?)",
+                (cid, img_src, card_species, get_info, series_id, is_diff),
+            )
+        cursor.execute("ALTER TABLE new_cards_info RENAME TO cards_info;")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def dump_tables(db_path: str) -> tuple:
+    """
+    讀出正規化後的資料表內容供比對
+
+    Args:
+        db_path (str): 資料庫路徑
+
+    Returns:
+        tuple: (cards_info 列表, cards_image_info 列表)
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        cards = conn.execute("SELECT * FROM cards_info ORDER BY cid").fetchall()
+        images = conn.execute("SELECT * FROM cards_image_info").fetchall()
+    finally:
+        conn.close()
+    return cards, images
+
+
+def main() -> None:
+    """
+    比較逐筆查詢與集合式 SQL 正規化的耗時，並確認結果一致
+    """
+    parser = argparse.ArgumentParser(description="normalize_database 效能測試")
+    parser.add_argument("--cards-per-language", type=int, default=2500)
+    parser.add_argument("--skip-legacy", action="store_true", help="不執行原本的逐筆流程")
+    args = parser.parse_args()
+
+    cards = build_synthetic_cards(args.cards_per_language)
+    work_dir = tempfile.mkdtemp(prefix="bench_normalize_")
+    try:
+        database = Database(work_dir)
+        database.check_db_folder()
+        database.save_series_database(cards)
+        database.close()
+        db_path = os.path.join(work_dir, "storage", "optcg.db")
+        legacy_path = os.path.join(work_dir, "legacy.db")
+        shutil.copyfile(db_path, legacy_path)
+
+        start = time.perf_counter()
+        database.normalize_database()
+        database.close()
+        elapsed = time.perf_counter() - start
+        print(f"集合式 SQL：{len(cards)} 列，耗時 {elapsed * 1000:.1f} ms")
+
+        if not args.skip_legacy:
+            start = time.perf_counter()
+            legacy_normalize(legacy_path)
+            legacy_elapsed = time.perf_counter() - start
+            print(f"逐筆查詢：{len(cards)} 列，耗時 {legacy_elapsed * 1000:.1f} ms")
+            same = dump_tables(db_path) == dump_tables(legacy_path)
+            print(f"結果一致：{same}，加速 {legacy_elapsed / elapsed:.1f} 倍")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+
+from benchmarks.bench_normalize import LANGUAGES, build_synthetic_cards
+from functions.database.database import Database
+
+LANGUAGE_TEXTS: dict = {
+    "ja": ("麦わらの一味", "【登場時】自分のデッキから1枚を手札に加える。"),
+    "cn": ("草帽一伙", "【登场时】从自己的卡组中选择1张加入手牌。"),
+    "hk": ("草帽一夥", "【登場時】從自己的牌組中選擇1張加入手牌。"),
+    "tw": ("草帽一夥", "【登場時】從自己的牌組中選擇1張加入手牌。"),
+    "th": ("กลุ่มหมวกฟาง", "[เมื่อลงสนาม] จั่วการ์ด 1 ใบจากเด็ค"),
+    "asia-en": ("Straw Hat Crew", "[On Play] Draw 1 card from your deck."),
+    "en": ("Straw Hat Crew", "[On Play] Draw 1 card from your deck."),
+    "fr": ("Équipage du Chapeau de paille", "[Jouée] Piochez 1 carte de votre deck."),
+}
+""" 各語言的特徵與效果文字 """
+
+QUERIES: tuple = (
+    "手札",
+    "草帽",
+    "加入手牌",
+    "Straw Hat",
+    "Chapeau",
+    "หมวกฟาง",
+    "ja-OP03-042",
+    "fr-OP10-007",
+)
+""" 量測的搜尋關鍵字，涵蓋兩字詞、中日文、英法文、泰文與只符合少數卡片的卡號 """
+
+
+def build_language_cards(cards_per_language: int) -> list:
+    """
+    產生各語言文字不同的模擬卡片資料
+
+    Args:
+        cards_per_language (int): 每個語言的卡片列數
+
+    Returns:
+        list: 卡片信息字典列表
+    """
+    cards = build_synthetic_cards(cards_per_language)
+    for card in cards:
+        language = next(
+            language
+            for language in LANGUAGES
+            if card["card_id"].startswith(f"{language}-OP")
+        )
+        feature, effect = LANGUAGE_TEXTS[language]
+        card["feature"] = feature
+        card["effect"] = f"{effect} {card['card_id']}"
+    return cards
+
+
+def measure(func, repeat: int) -> tuple:
+    """
+    重複執行並回傳中位數與 p95 耗時
+
+    Args:
+        func (callable): 欲量測的函式
+        repeat (int): 重複次數
+
+    Returns:
+        tuple: (中位數毫秒, p95 毫秒, 最後一次的回傳值)
+    """
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1], result
+
+
+def main() -> None:
+    """
+    量測全文檢索與 LIKE 掃描在多語言資料上的查詢延遲；依相關度排序需要找出所有符合的卡片，
+    因此 LIKE 以掃描全表計算
+    """
+    parser = argparse.ArgumentParser(description="search_cards 效能測試")
+    parser.add_argument("--cards-per-language", type=int, default=2500)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    cards = build_language_cards(args.cards_per_language)
+    work_dir = tempfile.mkdtemp(prefix="bench_search_")
+    try:
+        database = Database(work_dir)
+        database.check_db_folder()
+        database.save_series_database(cards)
+        start = time.perf_counter()
+        database.normalize_database()
+        elapsed = time.perf_counter() - start
+        print(f"正規化並建立索引：{len(cards)} 列，耗時 {elapsed:.2f} 秒")
+
+        print(
+            f"{'關鍵字':<14}{'符合':>8}{'FTS 中位數ms':>14}{'FTS p95ms':>12}"
+            f"{'LIKE 中位數ms':>15}"
+        )
+        for query in QUERIES:
+            fts_median, fts_p95, _ = measure(
+                lambda query=query: database.search_cards(query, limit=20), args.repeat
+            )
+
+            def like_scan(query=query):
+                with database.connection() as conn:
+                    return conn.execute(
+                        """SELECT * FROM cards_info
+                        WHERE card_name LIKE ?1 OR feature LIKE ?1 OR effect LIKE ?1""",
+                        (f"%{query}%",),
+                    ).fetchall()
+
+            like_median, _, matches = measure(like_scan, args.repeat)
+            print(
+                f"{query:<14}{len(matches):>8}{fts_median:>14.2f}"
+                f"{fts_p95:>12.2f}{like_median:>15.2f}"
+            )
+        database.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HEAVY_MODULES: tuple = ("selenium", "webdriver_manager", "numpy", "PIL")
+""" 載入耗時、只在特定功能需要的套件 """
+
+PROJECT_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+""" 專案根目錄 """
+
+
+def measure_command(args: list, cwd: str, repeat: int) -> float:
+    """
+    重複執行命令並回傳中位數耗時
+
+    Args:
+        args (list): 命令與參數
+        cwd (str): 工作目錄
+        repeat (int): 重複次數
+
+    Returns:
+        float: 中位數毫秒
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            args, cwd=cwd, check=False, capture_output=True, stdin=subprocess.DEVNULL
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def get_loaded_heavy_modules(args: list, cwd: str) -> list:
+    """
+    以 -X importtime 執行命令，列出載入的重量級套件
+
+    Args:
+        args (list): 命令與參數，第一個元素為 Python 執行檔
+        cwd (str): 工作目錄
+
+    Returns:
+        list: 已載入的套件名稱
+    """
+    stderr = subprocess.run(
+        [args[0], "-X", "importtime", *args[1:]],
+        cwd=cwd,
+        check=False,
+        capture_output=True,
+        stdin=subprocess.DEVNULL,
+        text=True,
+    ).stderr
+    loaded = set()
+    for line in stderr.splitlines():
+        if line.startswith("import time:"):
+            module = line.rsplit("|", 1)[-1].strip().split(".")[0]
+            if module in HEAVY_MODULES:
+                loaded.add(module)
+    return sorted(loaded)
+
+
+def main() -> None:
+    """
+    量測各種呼叫方式的啟動時間，以及載入了哪些重量級套件；
+    匯出與查詢等不需要瀏覽器的呼叫不應載入 selenium
+    """
+    parser = argparse.ArgumentParser(description="啟動時間測試")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_startup_")
+    try:
+        # 複製程式碼到暫存目錄，避免 --export 寫入專案目錄
+        shutil.copytree(
+            os.path.join(PROJECT_DIR, "functions"),
+            os.path.join(work_dir, "functions"),
+            ignore=shutil.ignore_patterns("__pycache__"),
+        )
+        shutil.copy(os.path.join(PROJECT_DIR, "main.py"), work_dir)
+        if os.path.isdir(os.path.join(PROJECT_DIR, "json")):
+            shutil.copytree(
+                os.path.join(PROJECT_DIR, "json"), os.path.join(work_dir, "json")
+            )
+
+        cases = (
+            ("python -c pass（基準）", [sys.executable, "-c", "pass"]),
+            ("import main", [sys.executable, "-c", "import main"]),
+            ("main.py --help", [sys.executable, "main.py", "--help"]),
+            # 沒有資料庫時只會顯示錯誤訊息，量測的是進入匯出前的啟動時間
+            ("main.py --export", [sys.executable, "main.py", "--export"]),
+            (
+                "CardQuery",
+                [
+                    sys.executable,
+                    "-c",
+                    "from functions.database.card_query import CardQuery",
+                ],
+            ),
+        )
+        print(f"{'呼叫方式':<28}{'中位數ms':>10}  已載入的重量級套件")
+        for name, command in cases:
+            median = measure_command(command, work_dir, args.repeat)
+            loaded = get_loaded_heavy_modules(command, work_dir)
+            print(f"{name:<28}{median:>10.1f}  {', '.join(loaded) or '-'}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,439 @@
+import argparse
+import hashlib
+import os
+import random
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+CARD_TEMPLATE: str = """<dl class="modalCol" id="{card_id}">
+<dt><div class="infoCol"><span>{card_id}</span> | <span>{card_species}</span> | <span>CHARACTER</span></div>
+<div class="cardName">{card_name}</div></dt>
+<dd><div class="frontCol"><img class="lazy" data-src="../images/cardlist/card/{image_name}.png?250301" alt="{card_name}"></div>
+<div class="backCol">
+<div class="col2"><div class="cost"><h3>コスト</h3>{cost}</div>
+<div class="attribute"><h3>属性</h3><img src="../images/cardlist/attribute/ico_type01.png" alt="斬"><i>斬</i></div></div>
+<div class="col2"><div class="power"><h3>パワー</h3>{power}</div><div class="counter"><h3>カウンター</h3>{counter}</div></div>
+<div class="col2"><div class="color"><h3>色</h3>{color}</div><div class="block"><h3>ブロックアイコン</h3>1</div></div>
+<div class="feature"><h3>特徴</h3>{feature}</div>
+<div class="text"><h3>テキスト</h3>{effect}</div>
+<div class="getInfo"><h3>入手情報</h3>{get_info}</div>
+</div></dd></dl>"""
+""" 與卡表網站相同結構的卡片標記 """
+
+COLORS: tuple = ("赤", "緑", "青", "紫", "黒", "黄")
+""" 卡片顏色 """
+
+
+class FixtureSite:
+    """
+    模擬卡表網站的本機 HTTP 伺服器，提供系列列表、系列卡片頁面與合成圖片，
+    可設定延遲與圖片大小，亦可改用錄製下來的頁面
+    """
+
+    def __init__(
+        self,
+        series_count: int = 8,
+        cards_per_series: int = 120,
+        image_bytes: int = 200_000,
+        latency: float = 0.0,
+        reprint_ratio: float = 0.1,
+        parallel_art_ratio: float = 0.15,
+        pages_dir: str = None,
+        seed: int = 0,
+        max_concurrency: int = 0,
+    ):
+        """
+        模擬卡表網站 建構子
+
+        Args:
+        series_count (int): 系列數量
+        cards_per_series (int): 每個系列的卡片數量
+        image_bytes (int): 每張合成圖片的位元組數
+        latency (float): 每個請求回應前等待的秒數
+        reprint_ratio (float): 重印自前一個系列的卡片比例，重印卡共用圖片網址
+        parallel_art_ratio (float): 異圖卡片的比例
+        pages_dir (str): 錄製頁面的目錄，存在 cardlist.html 或 series_<ID>.html 時優先使用
+        seed (int): 亂數種子
+        max_concurrency (int): 同時處理的請求超過此數量時回應 503，模擬限流的網站；0 代表不限制
+        """
+        self._latency: float = latency
+        """ 每個請求回應前等待的秒數 """
+        self._image_bytes: int = image_bytes
+        """ 每張合成圖片的位元組數 """
+        self._pages_dir: str = pages_dir
+        """ 錄製頁面的目錄 """
+        self._server: ThreadingHTTPServer = None
+        """ HTTP 伺服器 """
+        self._thread: threading.Thread = None
+        """ 伺服器執行緒 """
+        self._max_concurrency: int = max_concurrency
+        """ 同時處理的請求上限 """
+        self._in_flight: int = 0
+        """ 處理中的請求數量 """
+        self.request_counts: dict = {
+            "cardlist": 0,
+            "series": 0,
+            "image": 0,
+            "throttled": 0,
+        }
+        """ 各類請求的次數 """
+        self._counts_lock: threading.Lock = threading.Lock()
+        """ 保護請求次數的鎖 """
+        self.series: dict = self.build_series(
+            series_count, cards_per_series, reprint_ratio, parallel_art_ratio, seed
+        )
+        """ 鍵為系列ID，值為該系列的卡片列表 """
+
+    @staticmethod
+    def build_series(
+        series_count: int,
+        cards_per_series: int,
+        reprint_ratio: float,
+        parallel_art_ratio: float,
+        seed: int,
+    ) -> dict:
+        """
+        產生各系列的卡片資料
+
+        Args:
+            series_count (int): 系列數量
+            cards_per_series (int): 每個系列的卡片數量
+            reprint_ratio (float): 重印自前一個系列的卡片比例
+            parallel_art_ratio (float): 異圖卡片的比例
+            seed (int): 亂數種子
+
+        Returns:
+            dict: 鍵為系列ID，值為卡片欄位字典列表
+        """
+        rng = random.Random(seed)
+        series = {}
+        previous = []
+        for series_index in range(1, series_count + 1):
+            series_id = f"5690{series_index:02d}"
+            cards = []
+            for number in range(cards_per_series):
+                if previous and rng.random() < reprint_ratio:
+                    reprint = dict(rng.choice(previous), get_info=f"OP{series_index:02d}")
+                    cards.append(reprint)
+                    continue
+                card_id = f"OP{series_index:02d}-{number + 1:03d}"
+                image_name = card_id
+                if rng.random() < parallel_art_ratio:
+                    image_name = f"{card_id}_p{rng.randint(1, 2)}"
+                cards.append(
+                    {
+                        "card_id": card_id,
+                        "card_name": f"キャラクター {card_id}",
+                        "card_species": rng.choice(("C", "UC", "R", "SR", "L")),
+                        "image_name": image_name,
+                        "cost": rng.randint(0, 10),
+                        "power": rng.randint(0, 12) * 1000,
+                        "counter": rng.choice(("-", "1000", "2000")),
+                        "color": rng.choice(COLORS),
+                        "feature": "麦わらの一味/超新星",
+                        "effect": "【登場時】カード1枚を引く。<br>【ブロッカー】" * 2,
+                        "get_info": f"OP{series_index:02d}",
+                    }
+                )
+            series[series_id] = cards
+            previous = cards
+        return series
+
+    def render_cardlist(self) -> bytes:
+        """
+        產生系列列表頁面
+
+        Returns:
+            bytes: 頁面 HTML
+        """
+        recorded = self.load_recorded_page("cardlist.html")
+        if recorded is not None:
+            return recorded
+        options = "".join(
+            f'<option value="{series_id}">BOOSTER PACK<br class="spInline">'
+            f"【ROMANCE DAWN {series_id}】[OP{index:02d}]</option>"
+            for index, series_id in enumerate(self.series, start=1)
+        )
+        return (
+            '<html><body><div class="formsetDefaultArea"><div class="seriesCol">'
+            f'<select name="series"><option value="">すべて</option>{options}</select>'
+            "</div></div></body></html>"
+        ).encode("utf-8")
+
+    def render_series(self, series_id: str) -> bytes:
+        """
+        產生系列卡片頁面
+
+        Args:
+            series_id (str): 系列ID
+
+        Returns:
+            bytes: 頁面 HTML，沒有此系列時為 None
+        """
+        recorded = self.load_recorded_page(f"series_{series_id}.html")
+        if recorded is not None:
+            return recorded
+        if series_id not in self.series:
+            return None
+        cards = "".join(CARD_TEMPLATE.format(**card) for card in self.series[series_id])
+        return (
+            f'<html><body><div class="resultCol">{cards}</div></body></html>'
+        ).encode("utf-8")
+
+    def render_image(self, path: str, width: int = 240) -> bytes:
+        """
+        依圖片路徑產生固定內容的合成 PNG，內容為雜訊，檔案大小接近 image_bytes
+
+        Args:
+            path (str): 圖片路徑
+            width (int): 圖片寬度
+
+        Returns:
+            bytes: 圖片內容
+        """
+        rng = random.Random(path)
+        row_bytes = width * 3
+        height = max(1, self._image_bytes // (row_bytes + 1))
+        raw = b"".join(b"\x00" + rng.randbytes(row_bytes) for _ in range(height))
+
+        def chunk(chunk_type: bytes, data: bytes) -> bytes:
+            return (
+                struct.pack(">I", len(data))
+                + chunk_type
+                + data
+                + struct.pack(">I", zlib.crc32(chunk_type + data))
+            )
+
+        return (
+            b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw, 1))
+            + chunk(b"IEND", b"")
+        )
+
+    def load_recorded_page(self, file_name: str) -> bytes:
+        """
+        讀取錄製的頁面
+
+        Args:
+            file_name (str): 頁面檔名
+
+        Returns:
+            bytes: 頁面內容，沒有錄製時為 None
+        """
+        if not self._pages_dir:
+            return None
+        page_path = os.path.join(self._pages_dir, file_name)
+        if not os.path.exists(page_path):
+            return None
+        with open(page_path, "rb") as file:
+            return file.read()
+
+    def count_request(self, kind: str) -> None:
+        """
+        累加請求次數
+
+        Args:
+            kind (str): 請求類型
+        """
+        with self._counts_lock:
+            self.request_counts[kind] += 1
+
+    def enter_request(self) -> bool:
+        """
+        開始處理請求
+
+        Returns:
+            bool: 是否超過同時處理的請求上限，超過時不計入處理中的數量
+        """
+        with self._counts_lock:
+            if self._max_concurrency and self._in_flight >= self._max_concurrency:
+                self.request_counts["throttled"] += 1
+                return False
+            self._in_flight += 1
+            return True
+
+    def exit_request(self) -> None:
+        """
+        結束處理請求
+        """
+        with self._counts_lock:
+            self._in_flight -= 1
+
+    def build_handler(self):
+        """
+        建立處理請求的 handler 類別
+
+        Returns:
+            type: BaseHTTPRequestHandler 子類別
+        """
+        site = self
+
+        class FixtureHandler(BaseHTTPRequestHandler):
+            """
+            模擬網站的請求處理
+            """
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                """
+                不輸出每個請求的存取紀錄
+                """
+
+            def send_body(self, body: bytes, content_type: str, etag: str = None):
+                """
+                回應 200 與內容
+
+                Args:
+                    body (bytes): 回應內容
+                    content_type (str): Content-Type
+                    etag (str): ETag，未指定時不送出
+                """
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                if etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """
+                處理 GET 請求，超過同時處理的請求上限時回應 503
+                """
+                if not site.enter_request():
+                    self.send_response(503)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                try:
+                    self.handle_get()
+                finally:
+                    site.exit_request()
+
+            def handle_get(self):
+                """
+                依路徑回應系列列表、系列卡片頁面或圖片，圖片支援 If-None-Match
+                """
+                if site.latency:
+                    time.sleep(site.latency)
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                body = None
+                if url.path.startswith("/images/"):
+                    site.count_request("image")
+                    etag = f'"{hashlib.md5(url.path.encode("utf-8")).hexdigest()}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        self.send_response(304)
+                        self.send_header("ETag", etag)
+                        self.end_headers()
+                        return
+                    self.send_body(site.render_image(url.path), "image/png", etag)
+                    return
+                if url.path.rstrip("/") == "/cardlist" and "series" in query:
+                    site.count_request("series")
+                    body = site.render_series(query["series"][0])
+                elif url.path.rstrip("/") == "/cardlist":
+                    site.count_request("cardlist")
+                    body = site.render_cardlist()
+                if body is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                self.send_body(body, "text/html; charset=UTF-8")
+
+        return FixtureHandler
+
+    @property
+    def url(self) -> str:
+        """
+        網站根網址，等同 json/language_url.json 中的語言網址
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def latency(self) -> float:
+        """
+        每個請求回應前等待的秒數
+        """
+        return self._latency
+
+    @latency.setter
+    def latency(self, latency: float) -> None:
+        """
+        設定每個請求回應前等待的秒數，伺服器執行中也會立即套用
+
+        Args:
+            latency (float): 秒數
+        """
+        self._latency = max(0.0, latency)
+
+    def start(self, port: int = 0) -> "FixtureSite":
+        """
+        在背景執行緒啟動伺服器
+
+        Args:
+            port (int): 連接埠，0 代表自動選擇
+
+        Returns:
+            FixtureSite: 本身
+        """
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self.build_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        停止伺服器
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FixtureSite":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main() -> None:
+    """
+    單獨啟動模擬網站，可搭配 main.py 手動測試
+    """
+    parser = argparse.ArgumentParser(description="模擬卡表網站")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--series", type=int, default=8)
+    parser.add_argument("--cards-per-series", type=int, default=120)
+    parser.add_argument("--image-bytes", type=int, default=200_000)
+    parser.add_argument("--latency", type=float, default=0.0, help="每個請求的延遲秒數")
+    parser.add_argument("--pages-dir", help="錄製頁面的目錄")
+    parser.add_argument(
+        "--max-concurrency", type=int, default=0, help="超過此並行請求數時回應 503"
+    )
+    args = parser.parse_args()
+
+    site = FixtureSite(
+        args.series,
+        args.cards_per_series,
+        args.image_bytes,
+        args.latency,
+        pages_dir=args.pages_dir,
+        max_concurrency=args.max_concurrency,
+    ).start(args.port)
+    print(f"模擬網站已啟動：{site.url}，按 Ctrl+C 結束")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        site.stop()
+
+
+if __name__ == "__main__":
+    main()
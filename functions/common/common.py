@@ -1,8 +1,12 @@
+import functools
 import json
 import logging
 import os
 import re
 import sys
+import time
+
+from functions.metrics.metrics import METRICS
 
 
 class Common:
@@ -13,15 +17,30 @@ class Common:
     @staticmethod
     def exception_handler(func):
         """
-        統一處理異常。
+        統一處理異常。啟用效能統計時一併記錄呼叫次數與耗時。
         """
 
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
+            if not METRICS.enabled:
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    logging.error("在 %s 發生錯誤: %s", func.__name__, e)
+                    raise
+
+            start = time.perf_counter()
+            failed = False
             try:
                 return func(*args, **kwargs)
             except Exception as e:
+                failed = True
                 logging.error("在 %s 發生錯誤: %s", func.__name__, e)
                 raise
+            finally:
+                METRICS.record_call(
+                    func.__qualname__, time.perf_counter() - start, failed
+                )
 
         return wrapper
 
@@ -55,6 +74,41 @@ class Common:
             return match.group(1)
         return series_name.split("<br")[0].strip()
 
+    @exception_handler
+    def load_language_urls(self) -> dict:
+        """
+        讀取各語言網站的網址設定
+
+        Returns:
+            dict: 鍵為語言代碼，值為網址
+        """
+        with open("json/language_url.json", "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    @exception_handler
+    def get_language_urls(self, languages: str) -> dict:
+        """
+        依逗號分隔的語言代碼取得對應的網址，輸入 all 時回傳全部語言
+
+        Args:
+            languages (str): 逗號分隔的語言代碼，例如 "ja,en" 或 "all"
+
+        Returns:
+            dict: 鍵為語言代碼，值為網址
+
+        Raises:
+            ValueError: 含有無效的語言代碼
+        """
+        language_urls = self.load_language_urls()
+        choices = [choice.strip().lower() for choice in languages.split(",")]
+        if "all" in choices:
+            return language_urls
+
+        invalid = [choice for choice in choices if choice not in language_urls]
+        if invalid:
+            raise ValueError(f"無效的語言代碼: {', '.join(invalid)}")
+        return {choice: language_urls[choice] for choice in choices if choice}
+
     @exception_handler
     def get_user_choice_language_url(self) -> str:
         """
@@ -66,8 +120,7 @@ class Common:
         Returns:
             str: 返回用戶選擇的語言對應的網址。
         """
-        with open("json/language_url.json", "r", encoding="utf-8") as file:
-            language_urls = json.load(file)
+        language_urls = self.load_language_urls()
 
         language_prompt = (
             "請輸入語言代碼：\n"
@@ -1,15 +1,36 @@
+import functools
+import importlib
+import queue
+import threading
 import time
-
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
+from types import SimpleNamespace
 
 from functions.common.common import Common
+from functions.crawler.driver_pool import DriverPool
+from functions.crawler.http_crawler import HttpCrawler
+from functions.crawler.page_cache import PageCache
 from functions.database.database import Database
+from functions.metrics.metrics import METRICS
+from functions.network.rate_limiter import RATE_LIMITER
+
+
+@functools.lru_cache(maxsize=None)
+def _selenium() -> SimpleNamespace:
+    """
+    第一次需要瀏覽器時才載入 selenium，以 HTTP 引擎爬取時不會載入
+
+    Returns:
+        SimpleNamespace: 爬蟲使用的 selenium 類別與模組
+    """
+    return SimpleNamespace(
+        By=importlib.import_module("selenium.webdriver.common.by").By,
+        EC=importlib.import_module("selenium.webdriver.support.expected_conditions"),
+        WebDriverWait=importlib.import_module("selenium.webdriver.support.ui").WebDriverWait,
+        Options=importlib.import_module("selenium.webdriver.chrome.options").Options,
+        TimeoutException=importlib.import_module(
+            "selenium.common.exceptions"
+        ).TimeoutException,
+    )
 
 
 class Crawler:
@@ -17,14 +38,41 @@ class Crawler:
     爬蟲相關類別
     """
 
-    def __init__(self, script_directory: str):
+    def __init__(
+        self,
+        script_directory: str,
+        max_sessions: int = 1,
+        max_pages_per_session: int = 20,
+        bulk_extract: bool = True,
+        engine: str = "http",
+        database: Database = None,
+        ready_timeout: float = 15.0,
+        settle_seconds: float = 0.5,
+        poll_interval: float = 0.1,
+        crawl_workers: int = 1,
+        max_retries: int = 2,
+        page_cache: PageCache = None,
+    ):
         """
         爬蟲相關類別 建構子
 
         Args:
         script_directory (str): 腳本目錄的路徑
-        """
-        self._database: Database = Database(script_directory)
+        max_sessions (int): 同時存在的瀏覽器 session 上限
+        max_pages_per_session (int): 單一瀏覽器 session 處理多少頁面後回收
+        bulk_extract (bool): 是否以單次腳本批次提取整頁卡片資訊
+        engine (str): 爬蟲引擎，"http" 會先以 HTTP 解析頁面，缺少標記時才改用瀏覽器；
+            "selenium" 則一律使用瀏覽器
+        database (Database): 共用的 DB存取類別，未指定時自行建立
+        ready_timeout (float): 等待卡片列表載入完成的最長秒數
+        settle_seconds (float): 卡片數量維持不變多少秒後視為載入完成
+        poll_interval (float): 檢查卡片列表狀態的間隔秒數
+        crawl_workers (int): 同時爬取系列的 worker 數量，瀏覽器 session 上限至少與其相同
+        max_retries (int): 單一系列爬取失敗後的重試次數
+        page_cache (PageCache): HTTP 引擎使用的頁面快取，未指定時不快取；
+            瀏覽器取得的頁面需要執行腳本，不會快取
+        """
+        self._database: Database = database or Database(script_directory)
         """ DB存取類別 """
         self._common: Common = Common()
         """ 通用方法類別 """
@@ -36,6 +84,85 @@ class Crawler:
             "return arguments[0].childNodes[1].nodeValue;"
         )
         """ 取得第二個子節點的值 """
+        self._crawl_workers: int = max(1, crawl_workers)
+        """ 同時爬取系列的 worker 數量 """
+        self._max_retries: int = max(0, max_retries)
+        """ 單一系列爬取失敗後的重試次數 """
+        self._driver_pool: DriverPool = DriverPool(
+            self.setup_driver_options,
+            max(max_sessions, self._crawl_workers),
+            max_pages_per_session,
+        )
+        """ 瀏覽器 session 連線池 """
+        self._bulk_extract: bool = bulk_extract
+        """ 是否以單次腳本批次提取整頁卡片資訊 """
+        self._engine: str = engine
+        """ 爬蟲引擎 """
+        self._ready_timeout: float = ready_timeout
+        """ 等待卡片列表載入完成的最長秒數 """
+        self._settle_seconds: float = settle_seconds
+        """ 卡片數量維持不變多少秒後視為載入完成 """
+        self._poll_interval: float = poll_interval
+        """ 檢查卡片列表狀態的間隔秒數 """
+        self.series_wait_times: dict = {}
+        """ 各系列等待頁面載入的秒數，鍵為系列ID """
+        self.card_grid_state_script = """
+            const modalCols = document.querySelectorAll(".resultCol .modalCol");
+            let pending = 0;
+            for (const img of document.querySelectorAll(".resultCol .frontCol img")) {
+                if (!img.getAttribute("data-src")) {
+                    pending += 1;
+                }
+            }
+            return [document.readyState, modalCols.length, pending];
+        """
+        """ 取得卡片列表載入狀態：文件狀態、modalCol 數量、尚未設定 data-src 的圖片數量 """
+        self._http_crawler: HttpCrawler = HttpCrawler(
+            pool_size=max(10, self._crawl_workers), page_cache=page_cache
+        )
+        """ 免瀏覽器爬蟲類別 """
+        self.bulk_extract_script = """
+            const nodeValue = (element, index) => {
+                if (!element || !element.childNodes[index]) {
+                    return null;
+                }
+                return element.childNodes[index].nodeValue;
+            };
+            const modalCols = arguments[0].getElementsByClassName("modalCol");
+            return Array.from(modalCols).map((modalCol) => {
+                const card = {};
+                for (const frontCol of modalCol.getElementsByClassName("frontCol")) {
+                    const img = frontCol.querySelector("img");
+                    card.img_src = img.getAttribute("data-src");
+                    card.card_name = img.getAttribute("alt");
+                }
+
+                const infoCol = modalCol.querySelector(".infoCol");
+                const spans = infoCol ? infoCol.querySelectorAll("span") : [];
+                card.card_id = spans.length > 0 ? nodeValue(spans[0], 0) : "";
+                card.card_species = spans.length > 1 ? nodeValue(spans[1], 0) : "";
+                card.card_type = spans.length > 2 ? nodeValue(spans[2], 0) : "";
+
+                const backCol = modalCol.querySelector(".backCol");
+                const field = (className) =>
+                    nodeValue(backCol.querySelector("." + className), 1);
+                card.cost = field("cost");
+                const attribute = backCol.querySelector(".attribute");
+                const attributeImg = attribute ? attribute.querySelector("img") : null;
+                card.attribute = attributeImg ? attributeImg.getAttribute("alt") : "-";
+                card.power = field("power");
+                card.counter = field("counter");
+                card.color = field("color");
+                card.feature = field("feature");
+                let effect = backCol.querySelector(".text").innerHTML;
+                effect = effect.replace(/<h3[^>]*>.*?<\\/h3>/gi, '');
+                effect = effect.replace(/<br\\s*\\/?>/gi, ' ');
+                card.effect = effect.trim();
+                card.get_info = field("getInfo");
+                return card;
+            });
+        """
+        """ 一次提取 resultCol 內所有 modalCol 卡片資訊的腳本 """
 
     @Common.exception_handler
     def get_card_list(self, language_url) -> None:
@@ -45,22 +172,55 @@ class Crawler:
         Args:
         language_url (str): 用戶選擇的語言對應的網址
         """
-        options = self.setup_driver_options()
-        driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()), options=options
+        option_dict = None
+        if self._engine == "http":
+            option_dict = self._http_crawler.get_card_list(language_url)
+        if not option_dict:
+            option_dict = self.get_card_list_with_driver(language_url)
+
+        self._database.save_card_info(option_dict)
+
+    @staticmethod
+    def load_page(driver, url: str) -> None:
+        """
+        以瀏覽器載入頁面，與 HTTP 請求共用主機並行限制；
+        失敗時由系列層級的重試處理，此處只在逾時時降低並行數量
+
+        Args:
+            driver (webdriver.Chrome): 瀏覽器
+            url (str): 頁面網址
+        """
+        RATE_LIMITER.call(
+            url,
+            driver.get,
+            url,
+            max_retries=0,
+            congestion_errors=(_selenium().TimeoutException,),
         )
 
-        try:
-            driver.get(f"{language_url}/cardlist")
+    @Common.exception_handler
+    def get_card_list_with_driver(self, language_url) -> dict:
+        """
+        以瀏覽器取得系列列表
 
-            wait = WebDriverWait(driver, 10)
+        Args:
+        language_url (str): 用戶選擇的語言對應的網址
+
+        Returns:
+            dict: 鍵為系列名稱、值為系列ID
+        """
+        with self._driver_pool.session() as driver:
+            self.load_page(driver, f"{language_url}/cardlist")
+            METRICS.increment("pages")
+
+            wait = _selenium().WebDriverWait(driver, 10)
             series_col = wait.until(
-                EC.visibility_of_element_located(
-                    (By.CSS_SELECTOR, ".formsetDefaultArea .seriesCol")
+                _selenium().EC.visibility_of_element_located(
+                    (_selenium().By.CSS_SELECTOR, ".formsetDefaultArea .seriesCol")
                 )
             )
-            select_element = series_col.find_element(By.TAG_NAME, "select")
-            options = select_element.find_elements(By.TAG_NAME, "option")
+            select_element = series_col.find_element(_selenium().By.TAG_NAME, "select")
+            options = select_element.find_elements(_selenium().By.TAG_NAME, "option")
             option_dict = {}
             for option in options:
                 option_text = driver.execute_script(
@@ -80,10 +240,7 @@ class Crawler:
                 if option_text and option_value:
                     option_dict[option_text] = option_value
 
-            self._database.save_card_info(option_dict)
-            driver.refresh()
-        finally:
-            driver.quit()
+        return option_dict
 
     @Common.exception_handler
     def extract_card_info(self, modal_col, language_url) -> dict:
@@ -97,10 +254,10 @@ class Crawler:
         Returns:
             dict: 卡片信息字典
         """
-        front_cols = modal_col.find_elements(By.CLASS_NAME, "frontCol")
+        front_cols = modal_col.find_elements(_selenium().By.CLASS_NAME, "frontCol")
         card_info = {}
         for front_col in front_cols:
-            img_tag = front_col.find_element(By.TAG_NAME, "img")
+            img_tag = front_col.find_element(_selenium().By.TAG_NAME, "img")
             img_src = img_tag.get_attribute("data-src")
             card_name = img_tag.get_attribute("alt")
 
@@ -140,7 +297,7 @@ class Crawler:
         Returns:
             int: 卡片成本值
         """
-        cost_element = back_col.find_element(By.CLASS_NAME, "cost")
+        cost_element = back_col.find_element(_selenium().By.CLASS_NAME, "cost")
         cost_value = self.get_element_text(
             driver, cost_element, self.child_second_node_value_script
         )
@@ -157,9 +314,9 @@ class Crawler:
         Returns:
             str: 卡片屬性值
         """
-        attribute_element = back_col.find_elements(By.CLASS_NAME, "attribute")
+        attribute_element = back_col.find_elements(_selenium().By.CLASS_NAME, "attribute")
         if attribute_element:
-            img_element = attribute_element[0].find_elements(By.TAG_NAME, "img")
+            img_element = attribute_element[0].find_elements(_selenium().By.TAG_NAME, "img")
             if img_element:
                 return img_element[0].get_attribute("alt")
         return "-"
@@ -176,7 +333,7 @@ class Crawler:
         Returns:
             int: 卡片力量值
         """
-        power_element = back_col.find_element(By.CLASS_NAME, "power")
+        power_element = back_col.find_element(_selenium().By.CLASS_NAME, "power")
         power_value = self.get_element_text(
             driver, power_element, self.child_second_node_value_script
         )
@@ -194,7 +351,7 @@ class Crawler:
         Returns:
             int: 卡片反擊值
         """
-        counter_element = back_col.find_element(By.CLASS_NAME, "counter")
+        counter_element = back_col.find_element(_selenium().By.CLASS_NAME, "counter")
         counter_value = self.get_element_text(
             driver, counter_element, self.child_second_node_value_script
         )
@@ -212,7 +369,7 @@ class Crawler:
         Returns:
             str: 卡片顏色值
         """
-        color_element = back_col.find_element(By.CLASS_NAME, "color")
+        color_element = back_col.find_element(_selenium().By.CLASS_NAME, "color")
         return self.get_element_text(
             driver, color_element, self.child_second_node_value_script
         )
@@ -229,7 +386,7 @@ class Crawler:
         Returns:
             str: 卡片特徵值
         """
-        feature = back_col.find_element(By.CLASS_NAME, "feature")
+        feature = back_col.find_element(_selenium().By.CLASS_NAME, "feature")
         return self.get_element_text(
             driver, feature, self.child_second_node_value_script
         )
@@ -246,7 +403,7 @@ class Crawler:
         Returns:
             str: 卡片效果值
         """
-        effect = back_col.find_element(By.CLASS_NAME, "text")
+        effect = back_col.find_element(_selenium().By.CLASS_NAME, "text")
         return driver.execute_script(
             """
             let element = arguments[0];
@@ -270,7 +427,7 @@ class Crawler:
         Returns:
             str: 卡片信息值
         """
-        get_info = back_col.find_element(By.CLASS_NAME, "getInfo")
+        get_info = back_col.find_element(_selenium().By.CLASS_NAME, "getInfo")
         return self.get_element_text(
             driver, get_info, self.child_second_node_value_script
         )
@@ -308,14 +465,14 @@ class Crawler:
         }
 
     @Common.exception_handler
-    def setup_driver_options(self) -> Options:
+    def setup_driver_options(self) -> "Options":
         """
         設置 WebDriver 選項
 
         Returns:
             Options: 設置好的 WebDriver 選項
         """
-        options = Options()
+        options = _selenium().Options()
         options.add_argument("start-maximized")
         options.add_argument("disable-infobars")
         options.add_argument("--disable-extensions")
@@ -349,10 +506,10 @@ class Crawler:
         """
         card_info = self.extract_card_info(modal_col, language_url)
 
-        info_col = WebDriverWait(modal_col, 10).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "infoCol"))
+        info_col = _selenium().WebDriverWait(modal_col, 10).until(
+            _selenium().EC.presence_of_element_located((_selenium().By.CLASS_NAME, "infoCol"))
         )
-        spans = info_col.find_elements(By.TAG_NAME, "span")
+        spans = info_col.find_elements(_selenium().By.TAG_NAME, "span")
         card_id = (
             driver.execute_script(self.child_first_node_value_script, spans[0]).strip()
             if len(spans) > 0
@@ -369,7 +526,7 @@ class Crawler:
             else ""
         )
 
-        back_col = modal_col.find_element(By.CLASS_NAME, "backCol")
+        back_col = modal_col.find_element(_selenium().By.CLASS_NAME, "backCol")
         card_attributes = self.extract_card_attributes(driver, back_col)
 
         card_info.update(
@@ -385,51 +542,355 @@ class Crawler:
         return card_info
 
     @Common.exception_handler
-    def handle_series_card_list(self, series_id: str, language_url: str) -> None:
+    def build_card_record(self, raw_card: dict, language_url, series_id) -> dict:
         """
-        處理系列卡片列表，儲存資訊至資料庫
+        將批次提取的原始欄位整理為與逐一提取相同格式的卡片信息
 
         Args:
-            series_id (str): 系列ID
+            raw_card (dict): 批次提取的原始卡片欄位
             language_url (str): 用戶選擇的語言對應的網址
+            series_id (str): 系列ID
+
+        Returns:
+            dict: 卡片信息字典
         """
-        options = self.setup_driver_options()
-        driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()), options=options
+
+        def to_text(value) -> str:
+            return (value or "").strip()
+
+        def to_int(value) -> int:
+            value = to_text(value)
+            return 0 if not value.isdigit() else int(value)
+
+        card_info = {}
+        if raw_card.get("img_src") is not None:
+            img_src = raw_card["img_src"]
+            if "?" in img_src:
+                img_src = img_src.split("?")[0]
+
+            card_info["img_src"] = img_src.replace(
+                "../images/", f"{language_url}/images/"
+            )
+            card_info["card_name"] = raw_card.get("card_name")
+
+        card_info.update(
+            {
+                "card_id": to_text(raw_card.get("card_id")),
+                "card_species": to_text(raw_card.get("card_species")),
+                "card_type": to_text(raw_card.get("card_type")),
+                "series_id": series_id,
+                "cost": to_int(raw_card.get("cost")),
+                "attribute": raw_card.get("attribute"),
+                "power": to_int(raw_card.get("power")),
+                "counter": to_int(raw_card.get("counter")),
+                "color": to_text(raw_card.get("color")),
+                "feature": to_text(raw_card.get("feature")),
+                "effect": to_text(raw_card.get("effect")),
+                "get_info": to_text(raw_card.get("get_info")),
+            }
         )
+        return card_info
 
-        try:
-            card_list = []
+    @Common.exception_handler
+    def extract_series_cards(
+        self, driver, result_col, language_url, series_id
+    ) -> list:
+        """
+        以單次腳本提取 resultCol 內所有卡片信息
+
+        Args:
+            driver (webdriver): 爬蟲driver
+            result_col (WebElement): 卡片列表元素
+            language_url (str): 用戶選擇的語言對應的網址
+            series_id (str): 系列ID
+
+        Returns:
+            list: 卡片信息字典列表
+        """
+        raw_cards = driver.execute_script(self.bulk_extract_script, result_col)
+        return [
+            self.build_card_record(raw_card, language_url, series_id)
+            for raw_card in raw_cards
+        ]
+
+    @Common.exception_handler
+    def get_series_cards(self, series_id: str, language_url: str) -> list:
+        """
+        取得系列卡片信息，HTTP 引擎缺少卡片標記時改用瀏覽器
+
+        Args:
+            series_id (str): 系列ID
+            language_url (str): 用戶選擇的語言對應的網址
+
+        Returns:
+            list: 卡片信息字典列表
+        """
+        if self._engine == "http":
+            raw_cards = self._http_crawler.get_series_cards(series_id, language_url)
+            if raw_cards is not None:
+                return [
+                    self.build_card_record(raw_card, language_url, series_id)
+                    for raw_card in raw_cards
+                ]
+            print(f"系列 {series_id} 頁面缺少卡片標記，改用瀏覽器")
+
+        return self.get_series_cards_with_driver(series_id, language_url)
+
+    @Common.exception_handler
+    def wait_for_card_grid(self, driver) -> float:
+        """
+        等待卡片列表載入完成：文件載入完畢、modalCol 數量在穩定期間內不再變化，
+        且所有卡圖都已設定 data-src；超過等待上限時直接返回
+
+        Args:
+            driver (webdriver): 爬蟲driver
+
+        Returns:
+            float: 實際等待的秒數
+        """
+        start = time.perf_counter()
+        deadline = start + self._ready_timeout
+        last_count = -1
+        stable_since = start
+        while True:
+            ready_state, count, pending = driver.execute_script(
+                self.card_grid_state_script
+            )
+            now = time.perf_counter()
+            if count != last_count:
+                last_count = count
+                stable_since = now
+            elif (
+                ready_state == "complete"
+                and count > 0
+                and pending == 0
+                and now - stable_since >= self._settle_seconds
+            ):
+                break
+
+            if now >= deadline:
+                print(f"等待卡片列表逾時（{self._ready_timeout} 秒），目前 {count} 張")
+                break
+            time.sleep(self._poll_interval)
+
+        return time.perf_counter() - start
+
+    @Common.exception_handler
+    def get_series_cards_with_driver(self, series_id: str, language_url: str) -> list:
+        """
+        以瀏覽器取得系列卡片信息
+
+        Args:
+            series_id (str): 系列ID
+            language_url (str): 用戶選擇的語言對應的網址
+
+        Returns:
+            list: 卡片信息字典列表
+
+        Raises:
+            TimeoutException: 等待後卡片列表仍是空的，交由系列層級的重試處理
+        """
+        card_list = []
+        with self._driver_pool.session() as driver:
             url = f"{language_url}/cardlist/?series={series_id}"
-            driver.get(url)
-            print("稍後5秒")
-            time.sleep(5)
+            self.load_page(driver, url)
+            METRICS.increment("pages")
+            wait_seconds = self.wait_for_card_grid(driver)
+            self.series_wait_times[series_id] = wait_seconds
 
-            result_col = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "resultCol"))
+            result_col = _selenium().WebDriverWait(driver, 10).until(
+                _selenium().EC.presence_of_element_located((_selenium().By.CLASS_NAME, "resultCol"))
             )
-            modal_cols = result_col.find_elements(By.CLASS_NAME, "modalCol")
-            for modal_col in modal_cols:
-                card_info = self.process_card_info(
-                    driver, modal_col, language_url, series_id
+            if self._bulk_extract:
+                card_list = self.extract_series_cards(
+                    driver, result_col, language_url, series_id
                 )
-                card_list.append(card_info)
+            else:
+                modal_cols = result_col.find_elements(_selenium().By.CLASS_NAME, "modalCol")
+                for modal_col in modal_cols:
+                    card_info = self.process_card_info(
+                        driver, modal_col, language_url, series_id
+                    )
+                    card_list.append(card_info)
+
+        if not card_list:
+            # 只有 HTTP 頁面沒有卡片標記時才會用瀏覽器，此時列表由 JS 渲染，
+            # 空列表多半是渲染太慢；視為失敗以免整個系列被記錄為移除
+            raise _selenium().TimeoutException(f"系列 {series_id} 的卡片列表沒有載入任何卡片")
+        return card_list
 
-            self._database.save_series_database(card_list)
-            driver.refresh()
-        finally:
-            driver.quit()
+    @Common.exception_handler
+    def handle_series_card_list(self, series_id: str, language_url: str) -> None:
+        """
+        處理系列卡片列表，儲存資訊至資料庫
+
+        Args:
+            series_id (str): 系列ID
+            language_url (str): 用戶選擇的語言對應的網址
+        """
+        card_list = self.get_series_cards(series_id, language_url)
+        self._database.save_series_database(card_list)
+
+    @Common.exception_handler
+    def crawl_all_series(
+        self,
+        series: dict,
+        language_url: str,
+        on_series_cards,
+        stop_event: threading.Event = None,
+    ) -> dict:
+        """
+        以多個 worker 從共用佇列取出系列並行爬取，失敗的系列會重新排入佇列重試
+
+        Args:
+            series (dict): 鍵為系列名稱、值為系列ID
+            language_url (str): 用戶選擇的語言對應的網址
+            on_series_cards (callable): 每個系列爬取完成後以 (系列名稱, 卡片信息列表) 呼叫，
+                會在 worker 執行緒中執行，必須是執行緒安全的
+            stop_event (threading.Event): 設定後 worker 不再取出新的系列
+
+        Returns:
+            dict: 重試後仍失敗的系列，鍵為系列名稱、值為錯誤訊息
+        """
+        work_queue = queue.Queue()
+        for product_name, product_id in series.items():
+            work_queue.put((product_name, product_id, 0))
+
+        failed_series = {}
+        failed_lock = threading.Lock()
+        stop_event = stop_event or threading.Event()
+
+        def worker():
+            while True:
+                item = work_queue.get()
+                if item is None:
+                    work_queue.task_done()
+                    return
+                product_name, product_id, attempt = item
+                try:
+                    if stop_event.is_set():
+                        continue
+                    card_list = self.get_series_cards(product_id, language_url)
+                    METRICS.increment("series")
+                    METRICS.increment("cards", len(card_list))
+                    on_series_cards(product_name, card_list)
+                except Exception as err:  # pylint: disable=broad-exception-caught
+                    if attempt < self._max_retries and not stop_event.is_set():
+                        print(f"{product_name} 爬取失敗，重試第 {attempt + 1} 次: {err}")
+                        METRICS.increment("retries")
+                        time.sleep(RATE_LIMITER.get_retry_delay(attempt))
+                        work_queue.put((product_name, product_id, attempt + 1))
+                    else:
+                        with failed_lock:
+                            failed_series[product_name] = str(err)
+                        print(f"{product_name} 爬取失敗: {err}")
+                finally:
+                    work_queue.task_done()
+
+        workers = [
+            threading.Thread(target=worker, daemon=True)
+            for _ in range(min(self._crawl_workers, max(1, len(series))))
+        ]
+        for thread in workers:
+            thread.start()
+        # 等待所有系列（含重試）完成後再通知 worker 結束
+        work_queue.join()
+        for _ in workers:
+            work_queue.put(None)
+        for thread in workers:
+            thread.join()
+
+        return failed_series
 
     @Common.exception_handler
-    def handle_all_card_list(self, language_url) -> None:
+    def handle_all_card_list(self, language_url) -> dict:
         """
         處理全系列卡表，儲存資訊至資料庫
 
         Args:
             language_url (str): 用戶選擇的語言對應的網址
+
+        Returns:
+            dict: 重試後仍失敗的系列，鍵為系列名稱、值為錯誤訊息
         """
-        self.get_card_list(language_url)
-        all_card_list_infos = self._database.load_card_info()
-        for product_name, product_id in all_card_list_infos.items():
-            self.handle_series_card_list(product_id, language_url)
+
+        def save_series_cards(product_name: str, card_list: list) -> None:
+            self._database.save_series_database(card_list)
             print(f"{product_name} 已處理完畢，並存入資料庫")
+
+        try:
+            self.get_card_list(language_url)
+            all_card_list_infos = self._database.load_card_info()
+            return self.crawl_all_series(
+                all_card_list_infos, language_url, save_series_cards
+            )
+        finally:
+            self.close()
+
+    @Common.exception_handler
+    def close(self) -> None:
+        """
+        關閉 HTTP session 與瀏覽器 session，並輸出瀏覽器使用統計
+        """
+        self._http_crawler.close()
+        self._driver_pool.close()
+        self.report_driver_pool_stats()
+        self.report_wait_times()
+
+    @Common.exception_handler
+    def report_driver_pool_stats(self) -> dict:
+        """
+        輸出瀏覽器 session 重複使用所節省的啟動時間
+
+        Returns:
+            dict: 連線池統計數據
+        """
+        stats = self._driver_pool.get_stats()
+        if not stats["page_count"]:
+            return stats
+        print(
+            f"瀏覽器共啟動 {stats['launch_count']} 次，處理 {stats['page_count']} 個頁面，"
+            f"平均啟動耗時 {stats['average_launch_seconds']:.2f} 秒，"
+            f"估計節省 {stats['saved_seconds']:.2f} 秒"
+        )
+        return stats
+
+    def get_wait_stats(self, fixed_wait_seconds: float = 5.0) -> dict:
+        """
+        統計各系列等待頁面載入的時間，並與原本固定等待的秒數比較
+
+        Args:
+            fixed_wait_seconds (float): 原本每個系列固定等待的秒數
+
+        Returns:
+            dict: 等待時間統計，series_wait_seconds 為各系列的等待秒數
+        """
+        wait_times = list(self.series_wait_times.values())
+        return {
+            "series_count": len(wait_times),
+            "total_wait_seconds": sum(wait_times),
+            "max_wait_seconds": max(wait_times, default=0.0),
+            "saved_seconds": fixed_wait_seconds * len(wait_times) - sum(wait_times),
+            "series_wait_seconds": dict(self.series_wait_times),
+        }
+
+    @Common.exception_handler
+    def report_wait_times(self, fixed_wait_seconds: float = 5.0) -> dict:
+        """
+        輸出各系列等待頁面載入的時間，並與原本固定等待的秒數比較
+
+        Args:
+            fixed_wait_seconds (float): 原本每個系列固定等待的秒數
+
+        Returns:
+            dict: 等待時間統計
+        """
+        stats = self.get_wait_stats(fixed_wait_seconds)
+        if stats["series_count"]:
+            print(
+                f"瀏覽器等待 {stats['series_count']} 個系列頁面載入，"
+                f"共 {stats['total_wait_seconds']:.2f} 秒，"
+                f"最長 {stats['max_wait_seconds']:.2f} 秒，"
+                f"相較固定等待 {fixed_wait_seconds:g} 秒節省 {stats['saved_seconds']:.2f} 秒"
+            )
+        return stats
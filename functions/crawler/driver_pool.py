@@ -0,0 +1,189 @@
+import functools
+import importlib
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+
+@functools.lru_cache(maxsize=None)
+def _selenium() -> SimpleNamespace:
+    """
+    第一次啟動瀏覽器時才載入 selenium 與 webdriver_manager
+
+    Returns:
+        SimpleNamespace: 連線池使用的 selenium 類別與模組
+    """
+    return SimpleNamespace(
+        webdriver=importlib.import_module("selenium.webdriver"),
+        Service=importlib.import_module("selenium.webdriver.chrome.service").Service,
+        WebDriverException=importlib.import_module(
+            "selenium.common.exceptions"
+        ).WebDriverException,
+        ChromeDriverManager=importlib.import_module(
+            "webdriver_manager.chrome"
+        ).ChromeDriverManager,
+    )
+
+
+class DriverPool:
+    """
+    Chrome WebDriver 連線池
+
+    整個執行期間只解析一次 driver 路徑，並重複使用已啟動的瀏覽器 session，
+    session 在處理達 N 個頁面或發生崩潰時會被回收重建。
+    """
+
+    def __init__(
+        self, options_factory, max_sessions: int = 1, max_pages_per_session: int = 20
+    ):
+        """
+        Chrome WebDriver 連線池 建構子
+
+        Args:
+        options_factory (callable): 產生 WebDriver 選項的方法
+        max_sessions (int): 同時存在的瀏覽器 session 上限
+        max_pages_per_session (int): 單一 session 處理多少頁面後回收
+        """
+        self._options_factory = options_factory
+        """ 產生 WebDriver 選項的方法 """
+        self._max_pages_per_session: int = max(1, max_pages_per_session)
+        """ 單一 session 處理多少頁面後回收 """
+        self._slots: threading.BoundedSemaphore = threading.BoundedSemaphore(
+            max(1, max_sessions)
+        )
+        """ 控制同時使用中的 session 數量 """
+        self._idle_drivers: queue.LifoQueue = queue.LifoQueue()
+        """ 閒置中的瀏覽器 session """
+        self._page_counts: dict = {}
+        """ 各 session 已處理的頁面數，鍵為 id(driver) """
+        self._lock: threading.Lock = threading.Lock()
+        """ 保護 driver 路徑與統計數據的鎖 """
+        self._driver_path: str = ""
+        """ 已解析的 chromedriver 路徑 """
+        self._stats: dict = {
+            "resolve_seconds": 0.0,
+            "launch_count": 0,
+            "launch_seconds": 0.0,
+            "page_count": 0,
+            "recycle_count": 0,
+            "crash_count": 0,
+        }
+        """ 連線池統計數據 """
+
+    def get_driver_path(self) -> str:
+        """
+        取得 chromedriver 路徑，整個執行期間只解析一次
+
+        Returns:
+            str: chromedriver 路徑
+        """
+        with self._lock:
+            if not self._driver_path:
+                start = time.perf_counter()
+                self._driver_path = _selenium().ChromeDriverManager().install()
+                self._stats["resolve_seconds"] += time.perf_counter() - start
+            return self._driver_path
+
+    def _launch_driver(self):
+        """
+        啟動新的瀏覽器 session
+
+        Returns:
+            webdriver.Chrome: 瀏覽器 session
+        """
+        driver_path = self.get_driver_path()
+        start = time.perf_counter()
+        driver = _selenium().webdriver.Chrome(
+            service=_selenium().Service(driver_path), options=self._options_factory()
+        )
+        with self._lock:
+            self._stats["launch_count"] += 1
+            self._stats["launch_seconds"] += time.perf_counter() - start
+        self._page_counts[id(driver)] = 0
+        return driver
+
+    def _discard_driver(self, driver) -> None:
+        """
+        關閉並捨棄瀏覽器 session
+
+        Args:
+            driver (webdriver.Chrome): 瀏覽器 session
+        """
+        self._page_counts.pop(id(driver), None)
+        try:
+            driver.quit()
+        except _selenium().WebDriverException:
+            # session 已崩潰時 quit 也可能失敗，直接捨棄即可
+            pass
+
+    @contextmanager
+    def session(self):
+        """
+        借出一個瀏覽器 session 處理單一頁面，用畢自動歸還
+
+        Yields:
+            webdriver.Chrome: 瀏覽器 session
+        """
+        self._slots.acquire()
+        try:
+            try:
+                driver = self._idle_drivers.get_nowait()
+            except queue.Empty:
+                driver = self._launch_driver()
+
+            try:
+                yield driver
+            except _selenium().WebDriverException:
+                # session 崩潰，回收後讓下一次借用重新啟動
+                with self._lock:
+                    self._stats["crash_count"] += 1
+                self._discard_driver(driver)
+                raise
+            except BaseException:
+                self._idle_drivers.put(driver)
+                raise
+
+            self._page_counts[id(driver)] = self._page_counts.get(id(driver), 0) + 1
+            with self._lock:
+                self._stats["page_count"] += 1
+            if self._page_counts[id(driver)] >= self._max_pages_per_session:
+                with self._lock:
+                    self._stats["recycle_count"] += 1
+                self._discard_driver(driver)
+            else:
+                self._idle_drivers.put(driver)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """
+        關閉所有閒置中的瀏覽器 session
+        """
+        while True:
+            try:
+                driver = self._idle_drivers.get_nowait()
+            except queue.Empty:
+                break
+            self._discard_driver(driver)
+
+    def get_stats(self) -> dict:
+        """
+        取得連線池統計數據，並估算相較每頁啟動一次瀏覽器所節省的時間
+
+        Returns:
+            dict: 統計數據
+        """
+        with self._lock:
+            stats = dict(self._stats)
+
+        launch_count = stats["launch_count"]
+        page_count = stats["page_count"]
+        average_launch = stats["launch_seconds"] / launch_count if launch_count else 0.0
+        # 原本每頁都會啟動瀏覽器並重新解析 driver 路徑
+        stats["average_launch_seconds"] = average_launch
+        stats["saved_seconds"] = max(0, page_count - launch_count) * average_launch + (
+            max(0, page_count - 1) * stats["resolve_seconds"]
+        )
+        return stats
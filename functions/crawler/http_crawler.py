@@ -0,0 +1,231 @@
+import re
+
+import requests
+from bs4 import BeautifulSoup, NavigableString
+from requests.adapters import HTTPAdapter
+
+from functions.common.common import Common
+from functions.crawler.page_cache import PageCache
+from functions.metrics.metrics import METRICS
+from functions.network.rate_limiter import RATE_LIMITER
+
+
+class HttpCrawler:
+    """
+    免瀏覽器爬蟲類別，以 HTTP 取得伺服器端渲染的卡表頁面並解析 HTML
+    """
+
+    def __init__(
+        self, pool_size: int = 10, timeout: int = 10, page_cache: PageCache = None
+    ):
+        """
+        免瀏覽器爬蟲類別 建構子
+
+        Args:
+        pool_size (int): 每個主機保留的連線數量
+        timeout (int): 請求逾時秒數
+        page_cache (PageCache): 頁面快取，未指定時一律從網路取得
+        """
+        self._common: Common = Common()
+        """ 通用方法類別 """
+        self._timeout: int = timeout
+        """ 請求逾時秒數 """
+        self._page_cache: PageCache = page_cache
+        """ 頁面快取 """
+        self._session: requests.Session = requests.Session()
+        """ 共用連線的 HTTP session """
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.headers.update(
+            {
+                "User-Agent": (
+                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                    "AppleWebKit/537.36 (KHTML, like Gecko) "
+                    "Chrome/91.0.4472.124 Safari/537.36"
+                )
+            }
+        )
+
+    @Common.exception_handler
+    def fetch_page(self, url: str) -> str:
+        """
+        取得頁面 HTML，有未過期的快取時不連線
+
+        Args:
+            url (str): 頁面網址
+
+        Returns:
+            str: 頁面 HTML
+        """
+        if self._page_cache is not None:
+            html = self._page_cache.get(url)
+            if html is not None:
+                return html
+
+        def request_page() -> requests.Response:
+            response = self._session.get(url, timeout=self._timeout)
+            response.raise_for_status()
+            return response
+
+        # 與圖片下載共用主機並行限制，遇到 429、5xx 或逾時時退避重試
+        response = RATE_LIMITER.call(url, request_page)
+        METRICS.increment("pages")
+        METRICS.increment("page_bytes", len(response.content))
+        if not response.encoding or response.encoding.lower() == "iso-8859-1":
+            # 未宣告編碼時 requests 預設為 ISO-8859-1，卡表網站皆為 UTF-8
+            response.encoding = "utf-8"
+        html = response.text
+        if self._page_cache is not None:
+            self._page_cache.put(url, html)
+        return html
+
+    @staticmethod
+    def get_node_value(element, index: int):
+        """
+        取得第 index 個子節點的文字，行為等同 DOM 的 childNodes[index].nodeValue
+
+        Args:
+            element (Tag): 目標元素
+            index (int): 子節點索引
+
+        Returns:
+            str | None: 文字節點內容，非文字節點則為 None
+        """
+        if element is None:
+            return None
+        children = list(element.children)
+        if index >= len(children) or not isinstance(children[index], NavigableString):
+            return None
+        return str(children[index])
+
+    @Common.exception_handler
+    def parse_series_options(self, html: str):
+        """
+        解析卡表頁面中的系列選單
+
+        Args:
+            html (str): 卡表頁面 HTML
+
+        Returns:
+            dict | None: 鍵為系列名稱、值為系列ID，找不到選單時為 None
+        """
+        soup = BeautifulSoup(html, "lxml")
+        select_element = soup.select_one(".formsetDefaultArea .seriesCol select")
+        if select_element is None:
+            return None
+
+        option_dict = {}
+        for option in select_element.find_all("option"):
+            option_value = (option.get("value") or "").strip()
+            if not option_value:
+                continue
+
+            # 與 HTMLOptionElement.text 相同，合併連續空白
+            option_text = " ".join(option.get_text().split())
+            option_text = self._common.process_series_name(option_text)
+
+            if option_text and option_value:
+                option_dict[option_text] = option_value
+
+        return option_dict
+
+    @Common.exception_handler
+    def parse_series_cards(self, html: str):
+        """
+        解析系列卡片頁面，欄位與批次提取腳本的回傳值相同
+
+        Args:
+            html (str): 系列卡片頁面 HTML
+
+        Returns:
+            list | None: 原始卡片欄位列表，有 resultCol 但沒有卡片的系列為空列表；
+                找不到 resultCol 或卡片缺少必要的標記時為 None，由呼叫端改用瀏覽器
+        """
+        soup = BeautifulSoup(html, "lxml")
+        result_col = soup.select_one(".resultCol")
+        if result_col is None:
+            return None
+
+        raw_cards = []
+        for modal_col in result_col.select(".modalCol"):
+            back_col = modal_col.select_one(".backCol")
+            text_col = back_col.select_one(".text") if back_col is not None else None
+            front_imgs = [front_col.find("img") for front_col in modal_col.select(".frontCol")]
+            if text_col is None or None in front_imgs:
+                # 標記與預期不同，交給瀏覽器處理以免得到不完整的卡片
+                return None
+
+            card = {}
+            for img_tag in front_imgs:
+                card["img_src"] = img_tag.get("data-src")
+                card["card_name"] = img_tag.get("alt")
+
+            info_col = modal_col.select_one(".infoCol")
+            spans = info_col.find_all("span") if info_col is not None else []
+            for index, key in enumerate(("card_id", "card_species", "card_type")):
+                card[key] = (
+                    self.get_node_value(spans[index], 0) if len(spans) > index else ""
+                )
+
+            for key, class_name in (
+                ("cost", "cost"),
+                ("power", "power"),
+                ("counter", "counter"),
+                ("color", "color"),
+                ("feature", "feature"),
+                ("get_info", "getInfo"),
+            ):
+                card[key] = self.get_node_value(
+                    back_col.select_one(f".{class_name}"), 1
+                )
+
+            attribute = back_col.select_one(".attribute")
+            attribute_img = attribute.find("img") if attribute is not None else None
+            card["attribute"] = (
+                attribute_img.get("alt") if attribute_img is not None else "-"
+            )
+
+            effect = text_col.decode_contents()
+            effect = re.sub(r"<h3[^>]*>.*?</h3>", "", effect, flags=re.IGNORECASE)
+            effect = re.sub(r"<br\s*/?>", " ", effect, flags=re.IGNORECASE)
+            card["effect"] = effect.strip()
+
+            raw_cards.append(card)
+
+        return raw_cards
+
+    @Common.exception_handler
+    def get_card_list(self, language_url: str):
+        """
+        取得系列列表
+
+        Args:
+            language_url (str): 用戶選擇的語言對應的網址
+
+        Returns:
+            dict | None: 鍵為系列名稱、值為系列ID，頁面缺少選單時為 None
+        """
+        return self.parse_series_options(self.fetch_page(f"{language_url}/cardlist"))
+
+    @Common.exception_handler
+    def get_series_cards(self, series_id: str, language_url: str):
+        """
+        取得系列卡片的原始欄位
+
+        Args:
+            series_id (str): 系列ID
+            language_url (str): 用戶選擇的語言對應的網址
+
+        Returns:
+            list | None: 原始卡片欄位列表，頁面缺少卡片標記時為 None
+        """
+        return self.parse_series_cards(
+            self.fetch_page(f"{language_url}/cardlist/?series={series_id}")
+        )
+
+    def close(self) -> None:
+        """
+        關閉 HTTP session
+        """
+        self._session.close()
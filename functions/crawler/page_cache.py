@@ -0,0 +1,183 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+from functions.metrics.metrics import METRICS
+
+DEFAULT_TTL_SECONDS: float = 3600.0
+""" 快取頁面的預設有效秒數 """
+
+DEFAULT_MAX_BYTES: int = 200 * 1024 * 1024
+""" 快取目錄的預設容量上限 """
+
+
+class PageCache:
+    """
+    頁面快取類別，以網址與語言為鍵將卡表頁面 HTML 存放在 cache/pages/，
+    檔案修改時間為取得時間，存取時間為最後讀取時間，超過容量時先刪除最久未讀取的頁面
+    """
+
+    def __init__(
+        self,
+        script_directory: str,
+        language: str = "",
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        refresh: bool = False,
+    ):
+        """
+        頁面快取類別 建構子
+
+        Args:
+        script_directory (str): 腳本目錄的路徑
+        language (str): 語言代碼，與網址一同組成快取鍵
+        ttl_seconds (float): 頁面取得後多少秒內有效，0 代表不使用快取
+        max_bytes (int): 快取目錄的容量上限（位元組）
+        refresh (bool): 忽略既有的快取一律重新取得，取得的頁面仍會寫入快取
+        """
+        self._cache_dir: str = os.path.join(script_directory, "cache", "pages")
+        """ 快取目錄 """
+        self._language: str = language
+        """ 語言代碼 """
+        self._ttl_seconds: float = ttl_seconds
+        """ 頁面有效秒數 """
+        self._max_bytes: int = max_bytes
+        """ 快取目錄的容量上限 """
+        self._refresh: bool = refresh
+        """ 是否忽略既有的快取 """
+        self._total_bytes: int = None
+        """ 快取目錄目前的大小，第一次寫入時計算 """
+        self._lock: threading.Lock = threading.Lock()
+        """ 保護快取大小與淘汰的鎖 """
+
+    @property
+    def enabled(self) -> bool:
+        """
+        是否使用快取
+        """
+        return self._ttl_seconds > 0
+
+    def get_cache_path(self, url: str) -> str:
+        """
+        取得頁面的快取路徑
+
+        Args:
+            url (str): 頁面網址
+
+        Returns:
+            str: 快取檔案路徑
+        """
+        key = hashlib.sha256(f"{self._language}\n{url}".encode("utf-8")).hexdigest()
+        return os.path.join(self._cache_dir, key[:2], f"{key}.html")
+
+    def get(self, url: str):
+        """
+        取得未過期的快取頁面
+
+        Args:
+            url (str): 頁面網址
+
+        Returns:
+            str | None: 頁面 HTML，沒有快取、已過期或指定重新取得時為 None
+        """
+        if not self.enabled or self._refresh:
+            return None
+        cache_path = self.get_cache_path(url)
+        try:
+            fetched_at = os.path.getmtime(cache_path)
+            if time.time() - fetched_at > self._ttl_seconds:
+                METRICS.increment("page_cache_expired")
+                return None
+            with open(cache_path, "r", encoding="utf-8") as file:
+                html = file.read()
+            # 明確設定存取時間，不受 noatime 掛載選項影響
+            os.utime(cache_path, (time.time(), fetched_at))
+        except FileNotFoundError:
+            METRICS.increment("page_cache_misses")
+            return None
+        METRICS.increment("page_cache_hits")
+        return html
+
+    def put(self, url: str, html: str) -> None:
+        """
+        寫入頁面快取，超過容量上限時淘汰最久未讀取的頁面
+
+        Args:
+            url (str): 頁面網址
+            html (str): 頁面 HTML
+        """
+        if not self.enabled:
+            return
+        cache_path = self.get_cache_path(url)
+        data = html.encode("utf-8")
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.chmod(temp_path, 0o644)
+            previous_size = (
+                os.path.getsize(cache_path) if os.path.exists(cache_path) else 0
+            )
+            os.replace(temp_path, cache_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, _, size in self.list_entries())
+            else:
+                self._total_bytes += len(data) - previous_size
+            if self._total_bytes > self._max_bytes:
+                self.evict()
+
+    def list_entries(self) -> list:
+        """
+        列出快取檔案
+
+        Returns:
+            list: (最後讀取時間, 路徑, 大小) 列表
+        """
+        entries = []
+        if not os.path.isdir(self._cache_dir):
+            return entries
+        for directory, _, file_names in os.walk(self._cache_dir):
+            for file_name in file_names:
+                if not file_name.endswith(".html"):
+                    continue
+                path = os.path.join(directory, file_name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    # 其他語言的行程可能同時淘汰
+                    continue
+                entries.append((stat.st_atime, path, stat.st_size))
+        return entries
+
+    def evict(self) -> int:
+        """
+        刪除最久未讀取的頁面直到低於容量上限的九成，避免每次寫入都觸發淘汰
+
+        Returns:
+            int: 刪除的頁面數量
+        """
+        entries = sorted(self.list_entries())
+        total_bytes = sum(size for _, _, size in entries)
+        target_bytes = self._max_bytes * 0.9
+        removed = 0
+        for _, path, size in entries:
+            if total_bytes <= target_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+            removed += 1
+        self._total_bytes = total_bytes
+        METRICS.increment("page_cache_evictions", removed)
+        return removed
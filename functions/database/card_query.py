@@ -0,0 +1,372 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+
+from functions.common.common import Common
+from functions.database.database import Database
+
+ORDER_COLUMNS: tuple = ("cid", "card_id", "card_name", "cost", "power", "counter")
+""" 允許排序的欄位 """
+
+
+@dataclass(frozen=True)
+class CardRecord:
+    """
+    正規化後 cards_info 的一列卡片資料
+    """
+
+    cid: int
+    card_id: str
+    card_name: str
+    card_type: str
+    cost: int
+    attribute: str
+    power: int
+    counter: int
+    color: str
+    feature: str
+    effect: str
+    language: str = ""
+
+
+@dataclass(frozen=True)
+class CardImageRecord:
+    """
+    cards_image_info 的一列圖片資料
+    """
+
+    cid: int
+    img_src: str
+    card_species: str
+    get_info: str
+    series_id: str
+    is_diff: int
+    language: str = ""
+
+
+@dataclass(frozen=True)
+class CardFilter:
+    """
+    卡片查詢條件，各條件之間為 AND；未指定的條件不限制。
+    序列型條件請使用 tuple，使條件可作為快取鍵
+    """
+
+    card_ids: tuple = ()
+    """ 卡號 """
+    colors: tuple = ()
+    """ 顏色完全相符，多色卡的值為 "赤/緑" 這類組合 """
+    color_includes: tuple = ()
+    """ 顏色包含任一指定顏色，多色卡也會符合 """
+    card_types: tuple = ()
+    """ 卡片類型，例如 CHARACTER、EVENT """
+    series_ids: tuple = ()
+    """ 收錄於任一指定系列 """
+    min_cost: int = None
+    """ 最低費用 """
+    max_cost: int = None
+    """ 最高費用 """
+    min_power: int = None
+    """ 最低力量 """
+    max_power: int = None
+    """ 最高力量 """
+    min_counter: int = None
+    """ 最低反擊值 """
+    max_counter: int = None
+    """ 最高反擊值 """
+    order_by: str = "cid"
+    """ 排序欄位，須為 ORDER_COLUMNS 之一 """
+    descending: bool = False
+    """ 是否遞減排序 """
+    limit: int = None
+    """ 最多回傳筆數 """
+    offset: int = 0
+    """ 略過的筆數 """
+    languages: tuple = ()
+    """ 語言代碼，只適用於合併各語言的 optcg_all.db """
+
+    def build_where(self, multi_language: bool = False) -> tuple:
+        """
+        組合 WHERE 子句與參數
+
+        Args:
+            multi_language (bool): 是否為合併各語言的資料庫，cid 需與 language 一起比對
+
+        Returns:
+            tuple: (WHERE 子句，沒有條件時為空字串, 參數列表)
+
+        Raises:
+            ValueError: 單一語言的資料庫指定了 languages
+        """
+        if self.languages and not multi_language:
+            raise ValueError("單一語言的資料庫沒有 language 欄位，languages 只適用於 optcg_all.db")
+
+        conditions = []
+        params = []
+
+        def add_in(column: str, values: tuple) -> None:
+            if values:
+                conditions.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+
+        def add_range(column: str, minimum, maximum) -> None:
+            if minimum is not None:
+                conditions.append(f"{column} >= ?")
+                params.append(minimum)
+            if maximum is not None:
+                conditions.append(f"{column} <= ?")
+                params.append(maximum)
+
+        add_in("language", self.languages)
+        add_in("card_id", self.card_ids)
+        add_in("color", self.colors)
+        add_in("card_type", self.card_types)
+        if self.color_includes:
+            color_conditions = " OR ".join(
+                "instr(color, ?) > 0" for _ in self.color_includes
+            )
+            conditions.append(f"({color_conditions})")
+            params.extend(self.color_includes)
+        if self.series_ids:
+            placeholders = ", ".join("?" * len(self.series_ids))
+            # 合併的資料庫中各語言的 cid 會重複
+            key = "(language, cid)" if multi_language else "cid"
+            conditions.append(
+                f"""{key} IN (SELECT {key.strip("()")} FROM cards_image_info
+                WHERE series_id IN ({placeholders}))"""
+            )
+            params.extend(self.series_ids)
+        add_range("cost", self.min_cost, self.max_cost)
+        add_range("power", self.min_power, self.max_power)
+        add_range("counter", self.min_counter, self.max_counter)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+
+class CardQuery:
+    """
+    卡片查詢類別，提供有索引的條件查詢，並以 LRU 快取結果；
+    資料庫有任何寫入（包含其他連線或行程）時快取自動失效
+    """
+
+    def __init__(self, database: Database, cache_size: int = 128):
+        """
+        卡片查詢類別 建構子
+
+        Args:
+        database (Database): DB存取類別
+        cache_size (int): 最多快取幾個查詢結果，0 代表不快取
+        """
+        self._database: Database = database
+        """ DB存取類別 """
+        self._cache_size: int = max(0, cache_size)
+        """ 最多快取幾個查詢結果 """
+        self._cache: OrderedDict = OrderedDict()
+        """ 查詢結果快取，鍵為 (方法, 參數) """
+        self._cache_token: tuple = None
+        """ 建立快取時的資料庫版本 """
+        self._cache_lock: threading.Lock = threading.Lock()
+        """ 保護快取的鎖 """
+        self.cache_hits: int = 0
+        """ 快取命中次數 """
+        self.cache_misses: int = 0
+        """ 快取未命中次數 """
+
+    @staticmethod
+    def get_data_token(conn) -> tuple:
+        """
+        取得代表目前資料版本的值，任何寫入後都會改變
+
+        Args:
+            conn (sqlite3.Connection): 資料庫連線
+
+        Returns:
+            tuple: (連線, 本連線累計異動列數, 其他連線的寫入版本, 資料表結構版本)
+        """
+        # data_version 只反映其他連線的提交，本連線的寫入以 total_changes 判斷；
+        # 正規化的 DROP/RENAME 不計入 total_changes，以 schema_version 判斷
+        return (
+            id(conn),
+            conn.total_changes,
+            conn.execute("PRAGMA data_version").fetchone()[0],
+            conn.execute("PRAGMA schema_version").fetchone()[0],
+        )
+
+    def _cached(self, key: tuple, query_func):
+        """
+        以快取回傳查詢結果，資料版本改變時清空快取
+
+        Args:
+            key (tuple): 快取鍵
+            query_func (callable): 以連線為參數執行查詢的函式
+
+        Returns:
+            查詢結果
+        """
+        with self._database.connection() as conn:
+            token = self.get_data_token(conn)
+            with self._cache_lock:
+                if token != self._cache_token:
+                    self._cache.clear()
+                    self._cache_token = token
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    self.cache_hits += 1
+                    return self._cache[key]
+                self.cache_misses += 1
+
+            result = query_func(conn)
+
+        if self._cache_size:
+            with self._cache_lock:
+                if token == self._cache_token:
+                    self._cache[key] = result
+                    if len(self._cache) > self._cache_size:
+                        self._cache.popitem(last=False)
+        return result
+
+    @staticmethod
+    def is_multi_language(conn) -> bool:
+        """
+        判斷是否為合併各語言的資料庫（cards_info 有 language 欄位）
+
+        Args:
+            conn (sqlite3.Connection): 資料庫連線
+
+        Returns:
+            bool: 是否為合併的資料庫
+        """
+        return any(
+            row[1] == "language" for row in conn.execute("PRAGMA table_info(cards_info)")
+        )
+
+    @staticmethod
+    def get_select_columns(record_type, multi_language: bool) -> str:
+        """
+        取得查詢紀錄類別所需欄位的 SELECT 清單，單一語言的資料庫以空字串代替 language
+
+        Args:
+            record_type (type): CardRecord 或 CardImageRecord
+            multi_language (bool): 是否為合併各語言的資料庫
+
+        Returns:
+            str: SELECT 欄位清單
+        """
+        return ", ".join(
+            field.name if field.name != "language" or multi_language else "'' AS language"
+            for field in fields(record_type)
+        )
+
+    def clear_cache(self) -> None:
+        """
+        清空查詢結果快取
+        """
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_token = None
+
+    @Common.exception_handler
+    def find_cards(self, card_filter: CardFilter = CardFilter()) -> tuple:
+        """
+        依條件查詢卡片
+
+        Args:
+            card_filter (CardFilter): 查詢條件
+
+        Returns:
+            tuple: CardRecord 列表
+
+        Raises:
+            ValueError: 排序欄位不在 ORDER_COLUMNS 之中
+        """
+        if card_filter.order_by not in ORDER_COLUMNS:
+            raise ValueError(f"無效的排序欄位: {card_filter.order_by}")
+
+        def query(conn) -> tuple:
+            multi_language = self.is_multi_language(conn)
+            where, params = card_filter.build_where(multi_language)
+            direction = "DESC" if card_filter.descending else "ASC"
+            sql = f"""SELECT {self.get_select_columns(CardRecord, multi_language)}
+                FROM cards_info {where}
+                ORDER BY {card_filter.order_by} {direction}, cid
+                {", language" if multi_language else ""}"""
+            if card_filter.limit is not None or card_filter.offset:
+                sql += " LIMIT ? OFFSET ?"
+                params.extend(
+                    (
+                        -1 if card_filter.limit is None else card_filter.limit,
+                        card_filter.offset,
+                    )
+                )
+            return tuple(CardRecord(*row) for row in conn.execute(sql, params))
+
+        return self._cached(("find_cards", card_filter), query)
+
+    @Common.exception_handler
+    def count_cards(self, card_filter: CardFilter = CardFilter()) -> int:
+        """
+        計算符合條件的卡片數量，忽略排序與分頁
+
+        Args:
+            card_filter (CardFilter): 查詢條件
+
+        Returns:
+            int: 卡片數量
+        """
+
+        def query(conn) -> int:
+            where, params = card_filter.build_where(self.is_multi_language(conn))
+            sql = f"SELECT COUNT(*) FROM cards_info {where}"
+            return conn.execute(sql, params).fetchone()[0]
+
+        return self._cached(("count_cards", card_filter), query)
+
+    @Common.exception_handler
+    def get_card(self, card_id: str, language: str = None) -> CardRecord:
+        """
+        以卡號取得卡片
+
+        Args:
+            card_id (str): 卡號
+            language (str): 語言代碼，合併的資料庫中同一卡號各語言各有一筆
+
+        Returns:
+            CardRecord: 卡片資料，找不到時為 None
+        """
+        cards = self.find_cards(
+            CardFilter(card_ids=(card_id,), languages=(language,) if language else ())
+        )
+        return cards[0] if cards else None
+
+    @Common.exception_handler
+    def get_card_images(self, cid: int, language: str = None) -> tuple:
+        """
+        取得卡片的所有圖片（原圖、異圖與重印）
+
+        Args:
+            cid (int): 卡片的cid(識別碼)
+            language (str): 語言代碼，合併的資料庫中各語言的 cid 會重複，必須指定
+
+        Returns:
+            tuple: CardImageRecord 列表
+
+        Raises:
+            ValueError: 合併的資料庫未指定語言
+        """
+
+        def query(conn) -> tuple:
+            multi_language = self.is_multi_language(conn)
+            condition, params = "cid = ?", [cid]
+            if multi_language:
+                if not language:
+                    raise ValueError("合併的資料庫中各語言的 cid 會重複，請指定 language")
+                condition += " AND language = ?"
+                params.append(language)
+            rows = conn.execute(
+                f"""SELECT {self.get_select_columns(CardImageRecord, multi_language)}
+                FROM cards_image_info WHERE {condition} ORDER BY is_diff, rowid""",
+                params,
+            )
+            return tuple(CardImageRecord(*row) for row in rows)
+
+        return self._cached(("get_card_images", cid, language), query)
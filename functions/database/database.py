@@ -1,51 +1,314 @@
+import atexit
+import hashlib
+import json
 import os
 import re
 import shutil
 import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
 
 from functions.common.common import Common
 
+PARALLEL_ART_PATTERN: re.Pattern = re.compile(r"_p\d+\.png$")
+""" 異圖圖片檔名的正則表達式 """
+
+CATALOG_FIELDS: tuple = (
+    "card_id",
+    "card_name",
+    "card_species",
+    "card_type",
+    "cost",
+    "attribute",
+    "power",
+    "counter",
+    "color",
+    "feature",
+    "effect",
+)
+""" 計算卡片內容雜湊的欄位，不含收錄系列等每次重印都會不同的資訊 """
+
+CATALOG_TABLES: tuple = ("cards_catalog", "card_changes")
+""" 跨執行保存的卡片雜湊與變更記錄，完整重建資料庫時也會保留 """
+
+QUERY_INDEXES: tuple = (
+    ("cards_info", "color"),
+    ("cards_info", "cost"),
+    ("cards_info", "power"),
+    ("cards_info", "card_type"),
+    ("cards_image_info", "cid"),
+    ("cards_image_info", "series_id"),
+)
+""" CardQuery 條件查詢使用的索引，(資料表, 欄位)；合併的資料庫也會建立 """
+
+SEARCH_COLUMNS: tuple = ("card_name", "feature", "effect")
+""" 全文檢索索引的欄位 """
+
+SEARCH_TOKENIZERS: tuple = ("trigram", "unicode61 remove_diacritics 2")
+""" 全文檢索的分詞器，依序嘗試；trigram 不依賴空白分詞，適用日文與中文 """
+
+
+@dataclass(frozen=True, slots=True)
+class CardImageRow:
+    """
+    欲下載的一張卡圖，以 __slots__ 保存，大量串流讀取時每列只佔少量記憶體
+    """
+
+    cid: int
+    img_src: str
+    series_name: str
+
 
 class Database:
     """
     SQLite 存取類別
     """
 
-    def __init__(self, script_directory: str):
+    def __init__(
+        self, script_directory: str, file_info_batch_size: int = 200, language: str = ""
+    ):
         """
         SQLite 存取類別 建構子
 
         Args:
         script_directory (str): 腳本目錄的路徑
+        file_info_batch_size (int): 檔案資訊累積多少筆後批次寫入
+        language (str): 語言代碼，指定時使用各自的資料庫檔案 optcg_<language>.db
         """
 
         self._script_directory: str = script_directory
         """ 腳本目錄的路徑 """
-        self._db_path: str = os.path.join(script_directory, "storage", "optcg.db")
+        self._language: str = language
+        """ 語言代碼 """
+        self._db_path: str = os.path.join(
+            script_directory,
+            "storage",
+            f"optcg_{language}.db" if language else "optcg.db",
+        )
         """ db連接資訊 """
+        self._conn: sqlite3.Connection = None
+        """ 共用的資料庫連線，第一次使用時建立 """
+        self._lock: threading.RLock = threading.RLock()
+        """ 保護共用連線的鎖 """
+        self._file_info_batch_size: int = max(1, file_info_batch_size)
+        """ 檔案資訊累積多少筆後批次寫入 """
+        self._file_info_buffer: list = []
+        """ 尚未寫入的檔案資訊 """
+        self._close_registered: bool = False
+        """ 是否已註冊程式結束時關閉連線 """
+        self.run_id: str = datetime.now().strftime("%Y%m%d_%H%M%S")
+        """ 本次執行的識別碼，記錄在 card_changes 中 """
+        self._catalog: dict = None
+        """ cards_catalog 的內容，鍵為圖片網址，值為 (內容雜湊, 卡片欄位, 是否已移除) """
+        self._seen_card_keys: set = set()
+        """ 本次執行爬取到的卡片 """
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """
+        取得共用的資料庫連線，第一次呼叫時建立並設定 WAL 與效能參數
+
+        Returns:
+            sqlite3.Connection: 資料庫連線
+        """
+        if self._conn is None:
+            conn = sqlite3.connect(self._db_path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-16000")
+            conn.create_function(
+                "is_parallel_art", 1, self.is_parallel_art, deterministic=True
+            )
+            self._conn = conn
+            if not self._close_registered:
+                atexit.register(self.close)
+                self._close_registered = True
+        return self._conn
+
+    @staticmethod
+    def is_parallel_art(img_src: str) -> int:
+        """
+        判斷圖片是否為異圖（檔名以 _p數字.png 結尾），註冊為 SQL 函數 is_parallel_art 使用
+
+        Args:
+            img_src (str): 圖片網址
+
+        Returns:
+            int: 異圖為 1，否則為 0
+        """
+        return 1 if img_src and PARALLEL_ART_PATTERN.search(img_src) else 0
+
+    @contextmanager
+    def connection(self):
+        """
+        借用共用連線執行一段交易，成功時提交、失敗時回滾
+
+        Yields:
+            sqlite3.Connection: 資料庫連線
+        """
+        with self._lock:
+            conn = self._get_connection()
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
 
     @Common.exception_handler
-    def check_db_folder(self) -> None:
+    def close(self) -> None:
         """
-        檢查是否存在 'DB' 資料夾，若存在則刪除後重新建立
+        寫入緩衝中的檔案資訊並關閉連線，關閉前將日誌模式切回 DELETE，
+        讓上傳的資料庫檔案不依賴 -wal 檔案
+        """
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self.flush_file_info()
+                try:
+                    self._conn.execute("PRAGMA journal_mode=DELETE")
+                except sqlite3.OperationalError:
+                    # 其他連線仍在使用時無法切換，保留 WAL 模式
+                    pass
+            finally:
+                self._conn.close()
+                self._conn = None
+
+    @Common.exception_handler
+    def check_db_folder(self, incremental: bool = False) -> None:
+        """
+        檢查是否存在 'DB' 資料夾，不存在時建立，並刪除本資料庫的檔案後重新建立；
+        其他語言與合併的資料庫不受影響。重建時保留 cards_catalog 與 card_changes，卡片變更仍與上次執行比對
+
+        Args:
+            incremental (bool): 增量模式下保留資料庫，只清除本次執行會重建的資料表
         """
         db_dir = os.path.join(self._script_directory, "storage")
-        if os.path.exists(db_dir):
-            shutil.rmtree(db_dir)
-            print(f"已刪除資料夾: {db_dir}")
+        if incremental and os.path.exists(self._db_path):
+            self.clear_run_tables()
+            print(f"已清除上次執行的卡片資料表: {self._db_path}")
+            return
+
+        carried_path = self._carry_out_catalog()
+        self.close()
+        # 只清除自己的資料庫檔案，避免影響其他語言、並行中的行程與 optcg_all.db
+        for path in (self._db_path, f"{self._db_path}-wal", f"{self._db_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+                print(f"已刪除檔案: {path}")
 
         os.makedirs(db_dir, exist_ok=True)
-        print(f"已建立資料夾: {db_dir}")
+        if carried_path is not None:
+            self._carry_in_catalog(carried_path)
+
+    def _carry_out_catalog(self):
+        """
+        完整重建前將 cards_catalog 與 card_changes 複製到暫存資料庫，
+        讓非增量模式的執行也能與上次的內容雜湊比對
+
+        Returns:
+            str | None: 暫存資料庫路徑，沒有可保留的資料表時為 None
+        """
+        if not os.path.exists(self._db_path):
+            return None
+        tables = [table for table in CATALOG_TABLES if self.has_table(table)]
+        if not tables:
+            return None
+        carried_path = os.path.join(tempfile.mkdtemp(prefix="optcg_catalog_"), "catalog.db")
+        with self.connection() as conn:
+            conn.execute("ATTACH DATABASE ? AS carried", (carried_path,))
+            try:
+                for table in tables:
+                    conn.execute(
+                        f"CREATE TABLE carried.{table} AS SELECT * FROM main.{table}"
+                    )
+            finally:
+                conn.execute("DETACH DATABASE carried")
+        return carried_path
+
+    def _carry_in_catalog(self, carried_path: str) -> None:
+        """
+        將暫存的 cards_catalog 與 card_changes 寫回重建後的資料庫，並刪除暫存資料庫
+
+        Args:
+            carried_path (str): _carry_out_catalog 回傳的暫存資料庫路徑
+        """
+        try:
+            with self._lock:
+                self._catalog = None
+                with self.connection() as conn:
+                    self._create_catalog_tables(conn)
+                    conn.execute("ATTACH DATABASE ? AS carried", (carried_path,))
+                    try:
+                        carried_tables = {
+                            row[0]
+                            for row in conn.execute(
+                                "SELECT name FROM carried.sqlite_master WHERE type = 'table'"
+                            )
+                        }
+                        for table in CATALOG_TABLES:
+                            if table in carried_tables:
+                                conn.execute(
+                                    f"INSERT INTO main.{table} SELECT * FROM carried.{table}"
+                                )
+                        # DETACH 不能在交易中執行
+                        conn.commit()
+                    finally:
+                        conn.execute("DETACH DATABASE carried")
+            print(f"已保留卡片雜湊與變更記錄: {self._db_path}")
+        finally:
+            shutil.rmtree(os.path.dirname(carried_path), ignore_errors=True)
+
+    @Common.exception_handler
+    def clear_run_tables(self) -> None:
+        """
+        刪除每次執行都會重建的資料表，保留跨執行的圖片快取資訊
+        """
+        with self._lock:
+            self._file_info_buffer.clear()
+            self._catalog = None
+            self._seen_card_keys.clear()
+            with self.connection() as conn:
+                for table in (
+                    "series",
+                    "raw_cards_info",
+                    "cards_info",
+                    "new_cards_info",
+                    "cards_image_info",
+                    "files_info",
+                    "cards_fts",
+                ):
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+
+    @Common.exception_handler
+    def has_table(self, table: str) -> bool:
+        """
+        檢查資料表是否存在
+
+        Args:
+            table (str): 資料表名稱
+
+        Returns:
+            bool: 是否存在
+        """
+        with self.connection() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone()
+        return row is not None
 
     @Common.exception_handler
     def save_card_info(self, series: dict) -> None:
         """
         將卡片系列名稱及ID存入資料庫
         """
-        try:
-            conn = sqlite3.connect(self._db_path)
-            cursor = conn.cursor()
-            cursor.execute(
+        with self.connection() as conn:
+            conn.execute(
                 """
             CREATE TABLE IF NOT EXISTS series (
                 series_id TEXT PRIMARY KEY,
@@ -53,16 +316,12 @@ class Database:
             )
             """
             )
-            for series_name, series_id in series.items():
-                cursor.execute(
-                    """
-                INSERT OR IGNORE INTO series (series_id, series_name) VALUES (?, ?)
-                """,
-                    (series_id, series_name),
-                )
-            conn.commit()
-        finally:
-            conn.close()
+            conn.executemany(
+                """
+            INSERT OR IGNORE INTO series (series_id, series_name) VALUES (?, ?)
+            """,
+                [(series_id, series_name) for series_name, series_id in series.items()],
+            )
 
     @Common.exception_handler
     def load_card_info(self) -> dict:
@@ -72,18 +331,9 @@ class Database:
         Returns:
             dict : 包含所有卡片信息的字典，鍵為 series_name, 值為 series_id
         """
-        card_infos = {}
-        try:
-            conn = sqlite3.connect(self._db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT series_id, series_name FROM series")
-            rows = cursor.fetchall()
-            for row in rows:
-                card_infos[row[1]] = row[0]
-        finally:
-            conn.close()
-
-        return card_infos
+        with self.connection() as conn:
+            cursor = conn.execute("SELECT series_id, series_name FROM series")
+            return {series_name: series_id for series_id, series_name in cursor}
 
     @Common.exception_handler
     def save_series_database(self, card_series_list) -> None:
@@ -93,111 +343,394 @@ class Database:
         Args:
             card_series_list (list): 卡片系列資訊
         """
-        try:
-            conn = sqlite3.connect(self._db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                """CREATE TABLE IF NOT EXISTS cards_info (
-                            cid INTEGER PRIMARY KEY AUTOINCREMENT,
-                            card_id TEXT,
-                            card_name TEXT,
-                            card_species TEXT,
-                            card_type TEXT,
-                            img_src TEXT,
-                            cost INT,
-                            attribute TEXT,
-                            power INT,
-                            counter INT,
-                            color TEXT,
-                            feature TEXT,
-                            effect TEXT,
-                            get_info TEXT,
-                            series_id TEXT)"""
+        with self.connection() as conn:
+            self._insert_raw_cards(conn, card_series_list)
+
+    @Common.exception_handler
+    def replace_series_cards(self, series_id: str, card_series_list: list) -> None:
+        """
+        以本次爬取的卡片取代單一系列的原始卡片資料，其他系列不受影響，
+        刪除與寫入在同一個交易中，爬取失敗的系列會保留上次的資料
+
+        Args:
+            series_id (str): 系列ID
+            card_series_list (list): 該系列的卡片信息列表
+        """
+        with self.connection() as conn:
+            self._ensure_raw_cards(conn)
+            conn.execute("DELETE FROM raw_cards_info WHERE series_id = ?", (series_id,))
+            self._insert_raw_cards(conn, card_series_list)
+
+    def _ensure_raw_cards(self, conn: sqlite3.Connection) -> None:
+        """
+        確保 raw_cards_info 存在；舊版資料庫正規化後不保留原始資料，
+        以正規化後的 cards_info 與 cards_image_info 還原
+
+        Args:
+            conn (sqlite3.Connection): 資料庫連線
+        """
+        tables = {
+            row[0]
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        if "raw_cards_info" in tables:
+            return
+        self._create_raw_cards_table(conn)
+        if "cards_info" in tables and "cards_image_info" in tables:
+            conn.execute(
+                """INSERT INTO raw_cards_info (
+                    card_id, card_name, card_species, card_type, img_src, cost,
+                    attribute, power, counter, color, feature, effect, get_info, series_id
+                )
+                SELECT c.card_id, c.card_name, i.card_species, c.card_type, i.img_src,
+                    c.cost, c.attribute, c.power, c.counter, c.color, c.feature,
+                    c.effect, i.get_info, i.series_id
+                FROM cards_image_info i
+                INNER JOIN cards_info c ON c.cid = i.cid
+                ORDER BY i.rowid"""
             )
 
-            for card_info in card_series_list:
-                cursor.execute(
-                    """INSERT INTO cards_info (
-                        card_id,
-                        card_name,
-                        card_species,
-                        card_type,
-                        img_src,
-                        cost,
-                        attribute,
-                        power,
-                        counter,
-                        color,
-                        feature,
-                        effect,
-                        get_info,
-                        series_id
-                    ) VALUES (
-                        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
-                    )""",
-                    (
-                        card_info["card_id"],
-                        card_info["card_name"],
-                        card_info["card_species"],
-                        card_info["card_type"],
-                        card_info["img_src"],
-                        card_info["cost"],
-                        card_info["attribute"],
-                        card_info["power"],
-                        card_info["counter"],
-                        card_info["color"],
-                        card_info["feature"],
-                        card_info["effect"],
-                        card_info["get_info"],
-                        card_info["series_id"],
-                    ),
+    @staticmethod
+    def _create_raw_cards_table(conn: sqlite3.Connection) -> None:
+        """
+        建立保存爬取結果的 raw_cards_info，正規化時以此重建 cards_info
+
+        Args:
+            conn (sqlite3.Connection): 資料庫連線
+        """
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS raw_cards_info (
+                        cid INTEGER PRIMARY KEY AUTOINCREMENT,
+                        card_id TEXT,
+                        card_name TEXT,
+                        card_species TEXT,
+                        card_type TEXT,
+                        img_src TEXT,
+                        cost INT,
+                        attribute TEXT,
+                        power INT,
+                        counter INT,
+                        color TEXT,
+                        feature TEXT,
+                        effect TEXT,
+                        get_info TEXT,
+                        series_id TEXT)"""
+        )
+        conn.execute(
+            """CREATE INDEX IF NOT EXISTS idx_raw_cards_info_series_id
+            ON raw_cards_info (series_id)"""
+        )
+
+    def _insert_raw_cards(self, conn: sqlite3.Connection, card_series_list: list) -> None:
+        """
+        寫入原始卡片資料，並比對卡片內容雜湊記錄變更
+
+        Args:
+            conn (sqlite3.Connection): 資料庫連線
+            card_series_list (list): 卡片系列資訊
+        """
+        self._create_raw_cards_table(conn)
+        conn.executemany(
+            """INSERT INTO raw_cards_info (
+                card_id,
+                card_name,
+                card_species,
+                card_type,
+                img_src,
+                cost,
+                attribute,
+                power,
+                counter,
+                color,
+                feature,
+                effect,
+                get_info,
+                series_id
+            ) VALUES (
+                ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+            )""",
+            [
+                (
+                    card_info["card_id"],
+                    card_info["card_name"],
+                    card_info["card_species"],
+                    card_info["card_type"],
+                    card_info["img_src"],
+                    card_info["cost"],
+                    card_info["attribute"],
+                    card_info["power"],
+                    card_info["counter"],
+                    card_info["color"],
+                    card_info["feature"],
+                    card_info["effect"],
+                    card_info["get_info"],
+                    card_info["series_id"],
                 )
+                for card_info in card_series_list
+            ],
+        )
 
-            conn.commit()
-            conn.close()
-        finally:
-            conn.close()
+        self._update_catalog(conn, card_series_list)
+
+    @staticmethod
+    def hash_card(card_info: dict) -> str:
+        """
+        計算卡片內容的雜湊，效果或數值勘誤時會改變
+
+        Args:
+            card_info (dict): 卡片信息字典
+
+        Returns:
+            str: SHA-256 十六進位字串
+        """
+        content = json.dumps(
+            [card_info.get(field) for field in CATALOG_FIELDS], ensure_ascii=False
+        )
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _ensure_catalog(self, conn: sqlite3.Connection) -> None:
+        """
+        建立跨執行保存的 cards_catalog 與 card_changes，並讀取目前的內容雜湊
+
+        Args:
+            conn (sqlite3.Connection): 資料庫連線
+        """
+        if self._catalog is not None:
+            return
+        self._create_catalog_tables(conn)
+        self._catalog = {
+            row[0]: (row[1], json.loads(row[2]), row[3] is not None)
+            for row in conn.execute(
+                "SELECT card_key, content_hash, card_data, removed_run FROM cards_catalog"
+            )
+        }
+
+    @staticmethod
+    def _create_catalog_tables(conn: sqlite3.Connection) -> None:
+        """
+        建立 cards_catalog 與 card_changes
+
+        Args:
+            conn (sqlite3.Connection): 資料庫連線
+        """
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS cards_catalog (
+                            card_key TEXT PRIMARY KEY,
+                            card_id TEXT,
+                            content_hash TEXT,
+                            card_data TEXT,
+                            updated_run TEXT,
+                            removed_run TEXT)"""
+        )
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS card_changes (
+                            run_id TEXT,
+                            card_key TEXT,
+                            card_id TEXT,
+                            change_type TEXT,
+                            old_hash TEXT,
+                            new_hash TEXT,
+                            changed_fields TEXT)"""
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_card_changes_run_id ON card_changes (run_id)"
+        )
+
+    def _update_catalog(self, conn: sqlite3.Connection, card_series_list: list) -> None:
+        """
+        比對卡片內容雜湊，只寫入新增或變更的卡片並記錄變更
+
+        Args:
+            conn (sqlite3.Connection): 資料庫連線
+            card_series_list (list): 卡片系列資訊
+        """
+        self._ensure_catalog(conn)
+        catalog_rows = []
+        change_rows = []
+        for card_info in card_series_list:
+            card_key = card_info["img_src"]
+            if card_key in self._seen_card_keys:
+                # 重印卡共用圖片網址，同一次執行只以第一次爬取到的內容比對
+                continue
+            self._seen_card_keys.add(card_key)
+            content_hash = self.hash_card(card_info)
+            previous = self._catalog.get(card_key)
+            if previous is not None and previous[0] == content_hash and not previous[2]:
+                continue
+
+            card_data = {field: card_info.get(field) for field in CATALOG_FIELDS}
+            if previous is None or previous[2]:
+                change_type, old_hash, changed_fields = "added", None, list(CATALOG_FIELDS)
+            else:
+                change_type, old_hash = "changed", previous[0]
+                changed_fields = [
+                    field
+                    for field in CATALOG_FIELDS
+                    if previous[1].get(field) != card_data[field]
+                ]
+            self._catalog[card_key] = (content_hash, card_data, False)
+            card_data_json = json.dumps(card_data, ensure_ascii=False)
+            catalog_rows.append(
+                (card_key, card_info["card_id"], content_hash, card_data_json, self.run_id)
+            )
+            change_rows.append(
+                (
+                    self.run_id,
+                    card_key,
+                    card_info["card_id"],
+                    change_type,
+                    old_hash,
+                    content_hash,
+                    json.dumps(changed_fields),
+                )
+            )
+
+        if catalog_rows:
+            conn.executemany(
+                """INSERT OR REPLACE INTO cards_catalog
+                            (card_key, card_id, content_hash, card_data, updated_run, removed_run)
+                            VALUES (?, ?, ?, ?, ?, NULL)""",
+                catalog_rows,
+            )
+            conn.executemany(
+                """INSERT INTO card_changes
+                            (run_id, card_key, card_id, change_type, old_hash, new_hash,
+                            changed_fields)
+                            VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                change_rows,
+            )
+
+    @Common.exception_handler
+    def finalize_card_changes(self, detect_removed: bool = True) -> dict:
+        """
+        結束本次執行的卡片比對，將本次沒有爬取到的卡片標記為已移除，並統計變更
+
+        Args:
+            detect_removed (bool): 是否偵測移除的卡片；有系列爬取失敗時應為 False，
+                以免把未爬取的卡片誤判為移除
+
+        Returns:
+            dict: added、changed、removed 的卡片數量
+        """
+        with self._lock:
+            with self.connection() as conn:
+                self._ensure_catalog(conn)
+                if detect_removed:
+                    removed_keys = [
+                        card_key
+                        for card_key, (_, _, removed) in self._catalog.items()
+                        if not removed and card_key not in self._seen_card_keys
+                    ]
+                    conn.executemany(
+                        "UPDATE cards_catalog SET removed_run = ? WHERE card_key = ?",
+                        [(self.run_id, card_key) for card_key in removed_keys],
+                    )
+                    conn.executemany(
+                        """INSERT INTO card_changes
+                                    (run_id, card_key, card_id, change_type, old_hash,
+                                    new_hash, changed_fields)
+                                    SELECT ?, card_key, card_id, 'removed', content_hash,
+                                    NULL, '[]'
+                                    FROM cards_catalog WHERE card_key = ?""",
+                        [(self.run_id, card_key) for card_key in removed_keys],
+                    )
+                    for card_key in removed_keys:
+                        content_hash, card_data, _ = self._catalog[card_key]
+                        self._catalog[card_key] = (content_hash, card_data, True)
+
+                summary = {"added": 0, "changed": 0, "removed": 0}
+                for change_type, count in conn.execute(
+                    """SELECT change_type, COUNT(*) FROM card_changes
+                    WHERE run_id = ? GROUP BY change_type""",
+                    (self.run_id,),
+                ):
+                    summary[change_type] = count
+        return summary
+
+    @Common.exception_handler
+    def fetch_card_changes(self, since_run: str = None) -> list:
+        """
+        取得卡片變更記錄，供下游只讀取差異
+
+        Args:
+            since_run (str): 只取此執行識別碼之後的變更，未指定時為本次執行
+
+        Returns:
+            list: 變更字典列表，含 run_id、card_key、card_id、change_type、old_hash、
+                new_hash、changed_fields 與目前的 card_data
+        """
+        if since_run is None:
+            condition, params = "ch.run_id = ?", (self.run_id,)
+        else:
+            condition, params = "ch.run_id > ?", (since_run,)
+        with self.connection() as conn:
+            self._ensure_catalog(conn)
+            rows = conn.execute(
+                f"""SELECT ch.run_id, ch.card_key, ch.card_id, ch.change_type,
+                    ch.old_hash, ch.new_hash, ch.changed_fields, cc.card_data
+                FROM card_changes ch
+                LEFT JOIN cards_catalog cc ON cc.card_key = ch.card_key
+                WHERE {condition}
+                ORDER BY ch.rowid""",
+                params,
+            ).fetchall()
+        return [
+            {
+                "run_id": row[0],
+                "card_key": row[1],
+                "card_id": row[2],
+                "change_type": row[3],
+                "old_hash": row[4],
+                "new_hash": row[5],
+                "changed_fields": json.loads(row[6]),
+                "card_data": json.loads(row[7]) if row[7] else None,
+            }
+            for row in rows
+        ]
 
     @Common.exception_handler
     def normalize_database(self) -> None:
         """
-        正規化資料庫，將卡片資訊正規化並建立不同圖片資訊表
+        正規化資料庫，以 raw_cards_info 重建正規化的卡片資訊與不同圖片資訊表；
+        raw_cards_info 會保留，只更新部分系列時可再次正規化
         """
-        try:
-            conn = sqlite3.connect(self._db_path)
+        with self.connection() as conn:
+            self._ensure_raw_cards(conn)
             cursor = conn.cursor()
+            cursor.execute("DROP TABLE IF EXISTS new_cards_info")
+            cursor.execute("DROP TABLE IF EXISTS cards_image_info")
 
             # 創建新的cards_info資料表並加入新的cid
             cursor.execute(
                 """
             CREATE TABLE IF NOT EXISTS new_cards_info AS
-            SELECT 
-                row_number() OVER (ORDER BY card_id) as cid, 
-                card_id, 
-                card_name, 
-                card_type, 
-                cost, 
-                attribute, 
-                power, 
-                counter, 
-                color, 
-                feature, 
+            SELECT
+                row_number() OVER (ORDER BY card_id) as cid,
+                card_id,
+                card_name,
+                card_type,
+                cost,
+                attribute,
+                power,
+                counter,
+                color,
+                feature,
                 effect
             FROM (
-                SELECT 
-                    card_id, 
-                    card_name, 
-                    card_type, 
-                    cost, 
-                    attribute, 
-                    power, 
-                    counter, 
-                    color, 
-                    feature, 
+                SELECT
+                    card_id,
+                    card_name,
+                    card_type,
+                    cost,
+                    attribute,
+                    power,
+                    counter,
+                    color,
+                    feature,
                     effect,
                     ROW_NUMBER() OVER (PARTITION BY card_id ORDER BY img_src NOT LIKE '%_p%XX.png') as rn
-                FROM 
-                    cards_info
+                FROM
+                    raw_cards_info
             ) as RankedCards
             WHERE rn = 1;
             """
@@ -217,96 +750,579 @@ class Database:
             """
             )
 
-            # 從cards_info中選擇並插入到cards_image_info
+            # 以 card_id 索引取代逐筆查詢 cid
             cursor.execute(
-                "SELECT card_id, img_src, card_species, get_info, series_id FROM cards_info"
+                "CREATE INDEX IF NOT EXISTS idx_cards_info_card_id ON new_cards_info (card_id)"
             )
-            rows = cursor.fetchall()
 
-            # 使用正則表達式來判斷is_diff並插入資料到cards_image_info
-            for row in rows:
-                card_id, img_src, card_species, get_info, series_id = row
-                is_diff = 1 if re.search(r"_p\d+\.png$", img_src) else 0
+            # 從cards_info中選擇並插入到cards_image_info，is_diff 由註冊的 SQL 函數判斷
+            cursor.execute(
+                """
+            INSERT INTO cards_image_info (cid, img_src, card_species, get_info, series_id, is_diff)
+            SELECT
+                n.cid,
+                c.img_src,
+                c.card_species,
+                c.get_info,
+                c.series_id,
+                is_parallel_art(c.img_src)
+            FROM raw_cards_info c
+            INNER JOIN new_cards_info n ON n.card_id = c.card_id
+            ORDER BY c.cid
+            """
+            )
 
-                # 根據 card_id 從新的 cards_info 表中獲取 cid
+            # 刪除上次正規化的cards_info表
+            cursor.execute("DROP TABLE IF EXISTS cards_info;")
+
+            # 將new_cards_info重命名為cards_info
+            cursor.execute("ALTER TABLE new_cards_info RENAME TO cards_info;")
+
+            # 建立 CardQuery 條件查詢使用的索引
+            for table, column in QUERY_INDEXES:
                 cursor.execute(
-                    "SELECT cid FROM new_cards_info WHERE card_id = ?", (card_id,)
+                    f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table} ({column})"
                 )
-                cid = cursor.fetchone()[0]
 
-                cursor.execute(
-                    """
-                INSERT INTO cards_image_info (cid, img_src, card_species, get_info, series_id, is_diff)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                    (cid, img_src, card_species, get_info, series_id, is_diff),
+            # 建立卡名、特徵與效果的全文檢索索引
+            self._build_search_index(conn)
+
+    def _build_search_index(self, conn: sqlite3.Connection) -> str:
+        """
+        以 cards_info 重建 FTS5 全文檢索索引 cards_fts，並建立與 cards_info 同步的觸發器
+
+        Args:
+            conn (sqlite3.Connection): 資料庫連線
+
+        Returns:
+            str: 使用的分詞器
+        """
+        columns = ", ".join(SEARCH_COLUMNS)
+        new_columns = ", ".join(f"new.{column}" for column in SEARCH_COLUMNS)
+        conn.execute("DROP TABLE IF EXISTS cards_fts")
+        for tokenizer in SEARCH_TOKENIZERS:
+            try:
+                conn.execute(
+                    f"CREATE VIRTUAL TABLE cards_fts USING fts5({columns}, "
+                    f"tokenize='{tokenizer}')"
                 )
+                break
+            except sqlite3.OperationalError:
+                # 舊版 SQLite（3.34 以前）沒有 trigram 分詞器
+                continue
+        else:
+            raise sqlite3.OperationalError("此 SQLite 不支援 FTS5 全文檢索")
 
-            # 刪除原始的cards_info表
-            cursor.execute("DROP TABLE IF EXISTS cards_info;")
+        # 以 cards_info 的 rowid 對應，合併多語言的資料庫中 cid 會重複
+        conn.execute(
+            f"INSERT INTO cards_fts (rowid, {columns}) "
+            f"SELECT rowid, {columns} FROM cards_info"
+        )
+        conn.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS cards_fts_insert AFTER INSERT ON cards_info
+            BEGIN
+                INSERT INTO cards_fts (rowid, {columns}) VALUES (new.rowid, {new_columns});
+            END"""
+        )
+        conn.execute(
+            """CREATE TRIGGER IF NOT EXISTS cards_fts_delete AFTER DELETE ON cards_info
+            BEGIN
+                DELETE FROM cards_fts WHERE rowid = old.rowid;
+            END"""
+        )
+        conn.execute(
+            f"""CREATE TRIGGER IF NOT EXISTS cards_fts_update AFTER UPDATE ON cards_info
+            BEGIN
+                DELETE FROM cards_fts WHERE rowid = old.rowid;
+                INSERT INTO cards_fts (rowid, {columns}) VALUES (new.rowid, {new_columns});
+            END"""
+        )
+        conn.execute("INSERT INTO cards_fts (cards_fts) VALUES ('optimize')")
+        return tokenizer
 
-            # 將new_cards_info重命名為cards_info
-            cursor.execute("ALTER TABLE new_cards_info RENAME TO cards_info;")
+    @staticmethod
+    def build_match_query(query: str) -> str:
+        """
+        將輸入的關鍵字轉為 FTS5 查詢，每個以空白分隔的詞視為片語並全部符合
 
-            # 提交變更
-            conn.commit()
-        finally:
-            conn.close()
+        Args:
+            query (str): 搜尋關鍵字
+
+        Returns:
+            str: FTS5 MATCH 查詢字串
+        """
+        terms = query.split()
+        return " AND ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+    @staticmethod
+    def build_snippet(text: str, term: str, width: int = 16) -> str:
+        """
+        擷取關鍵字前後的文字並以 [] 標示，用於無法使用 FTS5 snippet 的短關鍵字
+
+        Args:
+            text (str): 欄位內容
+            term (str): 關鍵字
+            width (int): 關鍵字前後保留的字數
+
+        Returns:
+            str: 摘要，找不到關鍵字時為 None
+        """
+        index = (text or "").lower().find(term.lower())
+        if index < 0:
+            return None
+        end = index + len(term)
+        prefix = "…" if index > width else ""
+        suffix = "…" if end + width < len(text) else ""
+        return (
+            f"{prefix}{text[max(0, index - width):index]}[{text[index:end]}]"
+            f"{text[end:end + width]}{suffix}"
+        )
+
+    @Common.exception_handler
+    def search_cards(self, query: str, limit: int = 20) -> list:
+        """
+        以全文檢索搜尋卡名、特徵與效果，依相關度排序
+
+        Args:
+            query (str): 搜尋關鍵字，以空白分隔的多個詞需全部符合
+            limit (int): 最多回傳筆數
+
+        Returns:
+            list: 卡片資訊字典列表，另含 rank（越小越相關）與 snippet（[] 標示符合處）
+        """
+        terms = query.split()
+        if not terms:
+            return []
+
+        with self.connection() as conn:
+            tokenizer_sql = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE name = 'cards_fts'"
+            ).fetchone()
+            if tokenizer_sql is None:
+                raise sqlite3.OperationalError("尚未建立全文檢索索引，請先執行正規化")
+
+            if "trigram" in tokenizer_sql[0] and min(len(term) for term in terms) < 3:
+                # trigram 無法以索引比對少於三個字的詞，改以 LIKE 掃描索引內容
+                term_condition = " OR ".join(
+                    f"f.{column} LIKE ?" for column in SEARCH_COLUMNS
+                )
+                conditions = " AND ".join(f"({term_condition})" for _ in terms)
+                params = [f"%{term}%" for term in terms for _ in SEARCH_COLUMNS]
+                cursor = conn.execute(
+                    f"""SELECT c.*, 0.0 AS rank, NULL AS snippet
+                    FROM cards_fts f INNER JOIN cards_info c ON c.rowid = f.rowid
+                    WHERE {conditions}
+                    ORDER BY c.rowid LIMIT ?""",
+                    (*params, limit),
+                )
+            else:
+                cursor = conn.execute(
+                    """SELECT c.*, bm25(cards_fts, 10.0, 5.0, 1.0) AS rank,
+                        snippet(cards_fts, -1, '[', ']', '…', 16) AS snippet
+                    FROM cards_fts INNER JOIN cards_info c ON c.rowid = cards_fts.rowid
+                    WHERE cards_fts MATCH ?
+                    ORDER BY rank LIMIT ?""",
+                    (self.build_match_query(query), limit),
+                )
+            columns = [description[0] for description in cursor.description]
+            results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+        for result in results:
+            for column in SEARCH_COLUMNS:
+                if result["snippet"] is not None:
+                    break
+                result["snippet"] = self.build_snippet(result[column], terms[0])
+        return results
 
     @Common.exception_handler
-    def fetch_card_info_with_series_id(self) -> list:
+    def fetch_card_info_with_series_id(self, series_ids: list = None) -> list:
+        """
+        取得欲下載的檔案資訊；資料量大時請改用 iter_card_info_with_series_id
+
+        Args:
+            series_ids (list): 只取這些系列的圖片，未指定時為全部系列
+
+        Returns:
+            list: CardImageRow 列表，依圖片網址排序
+        """
+        return list(self.iter_card_info_with_series_id(series_ids))
+
+    def iter_card_info_with_series_id(
+        self, series_ids: list = None, chunk_size: int = 500
+    ):
+        """
+        以產生器逐批讀取欲下載的檔案資訊，記憶體中最多只有 chunk_size 列。
+        使用獨立的唯讀連線，讀取期間其他執行緒仍可透過共用連線寫入檔案資訊；
+        相同圖片網址的列會相鄰，下載時可就地合併
+
+        Args:
+            series_ids (list): 只取這些系列的圖片，未指定時為全部系列
+            chunk_size (int): 每次從資料庫取出的列數
+
+        Yields:
+            CardImageRow: 卡圖資訊
         """
-        取得欲下載的檔案資訊
+        where = ""
+        params = []
+        if series_ids:
+            where = f"WHERE cii.series_id IN ({', '.join('?' * len(series_ids))})"
+            params = list(series_ids)
+        query = f"""
+        SELECT ci.cid, cii.img_src, s.series_name
+        FROM cards_image_info cii
+        INNER JOIN cards_info ci on ci.cid = cii.cid
+        INNER JOIN series s ON cii.series_id = s.series_id
+        {where}
+        ORDER BY cii.img_src, s.series_name, s.series_id
         """
-        card_info_list = []
 
+        # 先確保資料庫為 WAL 模式，唯讀連線持有的讀取快照才不會阻擋共用連線寫入
+        with self.connection():
+            pass
+        # 以 as_uri 跳脫路徑中的 #、?、% 等字元，避免 URI 被截斷而另外建立空的資料庫
+        reader = sqlite3.connect(
+            f"{Path(self._db_path).resolve().as_uri()}?mode=ro", uri=True, timeout=30
+        )
         try:
-            conn = sqlite3.connect(self._db_path)
-            cursor = conn.cursor()
+            cursor = reader.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield CardImageRow(*row)
+        finally:
+            reader.close()
 
-            query = """
-            SELECT ci.cid, cii.img_src, s.series_name 
-            FROM cards_image_info cii 
-            INNER JOIN cards_info ci on ci.cid = cii.cid
-            INNER JOIN series s ON cii.series_id = s.series_id
-            ORDER BY s.series_name, s.series_id
-            """
+    @Common.exception_handler
+    def save_file_info(
+        self, cid: int, file_path: str, content_hash: str = None, img_src: str = None
+    ):
+        """
+        將檔案資訊放入緩衝區，累積到批次大小後一次寫入資料庫
+
+        Args:
+            cid (int): 圖片所屬卡片的cid(識別碼)，尚未正規化時為 None
+            file_path (str): 檔案的實際路徑
+            content_hash (str): 圖片內容的 SHA-256
+            img_src (str): 圖片網址
+        """
+        with self._lock:
+            self._file_info_buffer.append((cid, file_path, content_hash, img_src))
+            if len(self._file_info_buffer) >= self._file_info_batch_size:
+                self.flush_file_info()
 
-            cursor.execute(query)
-            rows = cursor.fetchall()
+    @Common.exception_handler
+    def flush_file_info(self) -> None:
+        """
+        將緩衝區中的檔案資訊批次寫入資料庫
+        """
+        with self._lock:
+            if not self._file_info_buffer:
+                return
+            with self.connection() as conn:
+                conn.execute(
+                    """CREATE TABLE IF NOT EXISTS files_info (
+                                    cid INTEGER,
+                                    file_path TEXT,
+                                    content_hash TEXT,
+                                    img_src TEXT)"""
+                )
+
+                conn.executemany(
+                    """INSERT INTO files_info (cid, file_path, content_hash, img_src)
+                                VALUES (?, ?, ?, ?)""",
+                    self._file_info_buffer,
+                )
+            self._file_info_buffer.clear()
 
+    @Common.exception_handler
+    def delete_file_info(self, file_paths: list) -> None:
+        """
+        刪除指定路徑的檔案資訊，重新下載部分系列前使用，避免重複記錄
+
+        Args:
+            file_paths (list): 檔案路徑
+        """
+        self.flush_file_info()
+        with self.connection() as conn:
+            tables = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                )
+            }
+            if "files_info" not in tables:
+                return
+            conn.executemany(
+                "DELETE FROM files_info WHERE file_path = ?",
+                [(file_path,) for file_path in file_paths],
+            )
+
+    @Common.exception_handler
+    def link_file_info_cid(self, relink: bool = False) -> None:
+        """
+        為正規化前就下載的圖片補上 cid，依 img_src 對應 cards_image_info
+
+        Args:
+            relink (bool): 重新對應所有檔案的 cid；重新正規化後 cid 可能改變時使用
+        """
+        self.flush_file_info()
+        with self.connection() as conn:
+            tables = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                )
+            }
+            if "files_info" not in tables or "cards_image_info" not in tables:
+                return
+            conn.execute(
+                """CREATE INDEX IF NOT EXISTS idx_cards_image_info_img_src
+                ON cards_image_info (img_src)"""
+            )
+            conn.execute(
+                f"""UPDATE files_info SET cid = (
+                    SELECT cii.cid FROM cards_image_info cii
+                    WHERE cii.img_src = files_info.img_src
+                    LIMIT 1
+                ) {"" if relink else "WHERE cid IS NULL"}"""
+            )
+
+    @staticmethod
+    def _create_image_meta_table(conn: sqlite3.Connection) -> None:
+        """
+        建立 image_meta，並為舊版的資料表補上記錄檢查執行的欄位
+
+        Args:
+            conn (sqlite3.Connection): 資料庫連線
+        """
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS image_meta (
+                            img_src TEXT PRIMARY KEY,
+                            content_hash TEXT,
+                            etag TEXT,
+                            last_modified TEXT,
+                            size INTEGER,
+                            checked_run TEXT,
+                            checked_status TEXT)"""
+        )
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(image_meta)")}
+        for column in ("checked_run", "checked_status"):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE image_meta ADD COLUMN {column} TEXT")
+
+    @Common.exception_handler
+    def load_image_meta(self, img_srcs: list = None) -> dict:
+        """
+        讀取記錄的圖片快取資訊
+
+        Args:
+            img_srcs (list): 只讀取這些圖片網址，未指定時讀取全部
+
+        Returns:
+            dict: 鍵為 img_src，值為包含 content_hash、etag、last_modified、size 的字典；
+                run_status 為本次執行檢查時的下載狀態，本次尚未檢查時為 None
+        """
+        image_meta = {}
+        with self.connection() as conn:
+            self._create_image_meta_table(conn)
+            query = (
+                "SELECT img_src, content_hash, etag, last_modified, size, "
+                "checked_run, checked_status FROM image_meta"
+            )
+            if img_srcs is None:
+                rows = conn.execute(query)
+            else:
+                rows = []
+                # 分批查詢，避免超過 SQLite 的參數數量上限
+                for start in range(0, len(img_srcs), 500):
+                    batch = img_srcs[start:start + 500]
+                    rows.extend(
+                        conn.execute(
+                            f"{query} WHERE img_src IN ({', '.join('?' * len(batch))})",
+                            batch,
+                        )
+                    )
             for row in rows:
-                card_info = {"cid": row[0], "img_src": row[1], "series_name": row[2]}
-                card_info_list.append(card_info)
-        finally:
-            conn.close()
+                image_meta[row[0]] = {
+                    "content_hash": row[1],
+                    "etag": row[2],
+                    "last_modified": row[3],
+                    "size": row[4],
+                    "run_status": row[6] if row[5] == self.run_id else None,
+                }
 
-        return card_info_list
+        return image_meta
 
     @Common.exception_handler
-    def save_file_info(self, cid: int, file_path: str):
+    def save_image_meta(self, image_meta_rows: list) -> None:
         """
-        將檔案資訊儲存到資料庫
+        批次記錄圖片的內容雜湊、ETag、Last-Modified 與檔案大小，供下次執行發送條件式請求，
+        並記錄本次執行的下載狀態，讓之後的批次沿用而不重新檢查
 
         Args:
-            cid (int): 圖片所屬卡片的cid(識別碼)
-            file_path (str): 檔案的實際路徑
+            image_meta_rows (list): (img_src, content_hash, etag, last_modified, size, status)
+                的列表
         """
-        try:
-            conn = sqlite3.connect(self._db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                """CREATE TABLE IF NOT EXISTS files_info (
-                                cid INTEGER,
-                                file_path TEXT)"""
+        with self.connection() as conn:
+            self._create_image_meta_table(conn)
+            conn.executemany(
+                """INSERT OR REPLACE INTO image_meta
+                            (img_src, content_hash, etag, last_modified, size,
+                            checked_status, checked_run)
+                            VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                [(*row, self.run_id) for row in image_meta_rows],
             )
 
-            cursor.execute(
-                """INSERT INTO files_info (cid, file_path)
-                            VALUES (?, ?)""",
-                (cid, file_path),
+    @Common.exception_handler
+    def save_variant_info(self, variant_rows: list) -> None:
+        """
+        記錄圖片的縮圖路徑，增量模式下保留未重新產生的縮圖記錄
+
+        Args:
+            variant_rows (list): (file_path, variant, variant_path, content_hash) 的列表
+        """
+        with self.connection() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS files_variant_info (
+                                file_path TEXT,
+                                variant TEXT,
+                                variant_path TEXT,
+                                content_hash TEXT,
+                                PRIMARY KEY (file_path, variant))"""
+            )
+            conn.executemany(
+                """INSERT OR REPLACE INTO files_variant_info
+                            (file_path, variant, variant_path, content_hash)
+                            VALUES (?, ?, ?, ?)""",
+                variant_rows,
             )
 
-            conn.commit()
-        finally:
-            conn.close()
+    @Common.exception_handler
+    def save_run_stats(self, run_id: str, started_at: str, stats_rows: list) -> None:
+        """
+        記錄本次執行的效能統計，增量模式下保留歷次記錄以便比較
+
+        Args:
+            run_id (str): 執行識別碼
+            started_at (str): 執行開始時間
+            stats_rows (list): (指標名稱, 數值) 的列表
+        """
+        with self.connection() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS run_stats (
+                                run_id TEXT,
+                                started_at TEXT,
+                                metric TEXT,
+                                value REAL)"""
+            )
+            conn.executemany(
+                """INSERT INTO run_stats (run_id, started_at, metric, value)
+                            VALUES (?, ?, ?, ?)""",
+                [(run_id, started_at, metric, value) for metric, value in stats_rows],
+            )
+
+    @staticmethod
+    def _merge_table(conn: sqlite3.Connection, table: str, language: str) -> None:
+        """
+        將已附加為 source 的語言資料庫中的資料表複製到合併的資料庫，
+        以欄位名稱對應，各語言缺少的欄位會補上，沒有該欄位的語言為 NULL
+
+        Args:
+            conn (sqlite3.Connection): 合併資料庫的連線
+            table (str): 資料表名稱
+            language (str): 語言代碼
+        """
+        source_columns = [
+            (row[1], row[2]) for row in conn.execute(f"PRAGMA source.table_info({table})")
+        ]
+        merged_columns = {
+            row[1] for row in conn.execute(f"PRAGMA main.table_info({table})")
+        }
+        if not merged_columns:
+            column_defs = ", ".join(
+                f'"{name}" {column_type}'.rstrip() for name, column_type in source_columns
+            )
+            conn.execute(f"CREATE TABLE main.{table} (language TEXT, {column_defs})")
+        else:
+            for name, column_type in source_columns:
+                if name not in merged_columns:
+                    conn.execute(
+                        f'ALTER TABLE main.{table} ADD COLUMN "{name}" {column_type}'.rstrip()
+                    )
+        column_list = ", ".join(f'"{name}"' for name, _ in source_columns)
+        conn.execute(
+            f"""INSERT INTO main.{table} (language, {column_list})
+            SELECT ?, {column_list} FROM source.{table}""",
+            (language,),
+        )
+
+    @Common.exception_handler
+    def merge_language_databases(self, languages: list) -> None:
+        """
+        將各語言的資料庫合併到本資料庫，每張資料表加上 language 欄位
+
+        Args:
+            languages (list): 欲合併的語言代碼
+        """
+        self.close()
+        for path in (self._db_path, f"{self._db_path}-wal", f"{self._db_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+        with self.connection() as conn:
+            for language in languages:
+                source_path = os.path.join(
+                    self._script_directory, "storage", f"optcg_{language}.db"
+                )
+                if not os.path.exists(source_path):
+                    print(f"找不到 {language} 的資料庫，略過合併")
+                    continue
+
+                conn.commit()
+                conn.execute("ATTACH DATABASE ? AS source", (source_path,))
+                try:
+                    source_tables = {
+                        row[0]
+                        for row in conn.execute(
+                            "SELECT name FROM source.sqlite_master WHERE type = 'table'"
+                        )
+                    }
+                    for table in (
+                        "series",
+                        "cards_info",
+                        "cards_image_info",
+                        "files_info",
+                        "files_variant_info",
+                        "run_stats",
+                        "card_changes",
+                    ):
+                        if table not in source_tables:
+                            continue
+                        self._merge_table(conn, table, language)
+                    conn.commit()
+                finally:
+                    conn.execute("DETACH DATABASE source")
+
+            merged_tables = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                )
+            }
+            for table in ("cards_info", "cards_image_info", "files_info"):
+                if table in merged_tables:
+                    conn.execute(
+                        f"""CREATE INDEX IF NOT EXISTS idx_{table}_language_cid
+                        ON {table} (language, cid)"""
+                    )
+            # 與單一語言的資料庫相同的條件查詢索引，CardQuery 在合併的資料庫上也能使用
+            for table, column in QUERY_INDEXES:
+                if table in merged_tables:
+                    conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table} ({column})"
+                    )
+            if "cards_info" in merged_tables:
+                # 合併後的全文檢索索引涵蓋所有語言
+                self._build_search_index(conn)
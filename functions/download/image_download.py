@@ -1,10 +1,31 @@
+import hashlib
 import os
 import shutil
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from functions.common.common import Common
 from functions.database.database import Database
+from functions.metrics.metrics import METRICS
+from functions.network.rate_limiter import RATE_LIMITER
+
+IMAGE_RESULT_FIELDS: tuple = (
+    "img_src",
+    "status",
+    "content_hash",
+    "store_path",
+    "size",
+    "etag",
+    "last_modified",
+    "error",
+)
+""" 不重複圖片下載結果的欄位，已下載的結果以此順序存成 tuple 以節省記憶體 """
+
+IMAGE_META_FIELDS: tuple = ("content_hash", "etag", "last_modified", "size")
+""" 下載結果中沿用 image_meta 記錄的欄位 """
 
 
 class Download:
@@ -12,59 +33,589 @@ class Download:
     圖片下載類別
     """
 
-    def __init__(self, script_directory: str):
+    def __init__(
+        self,
+        script_directory: str,
+        max_workers: int = 16,
+        incremental: bool = False,
+        database: Database = None,
+        language: str = "",
+        timeout: float = 10,
+    ):
         """
         圖片下載類別 建構子
 
         Args:
         script_directory (str): 腳本目錄的路徑
+        max_workers (int): 同時下載的執行緒數量，亦為每個主機保留的連線數量；
+            實際並行數量由 RATE_LIMITER 依伺服器狀況在此範圍內調整
+        incremental (bool): 增量模式，保留既有圖片並以條件式請求略過未變更的圖片
+        database (Database): 共用的 DB存取類別，未指定時自行建立
+        language (str): 語言代碼，指定時圖片存放在 image/<language>/ 之下
+        timeout (float): 單次請求的逾時秒數，逾時會退避重試
         """
         self._script_directory: str = script_directory
         """ 腳本目錄的路徑 """
-        self._database: Database = Database(script_directory)
+        self._database: Database = database or Database(
+            script_directory, language=language
+        )
         """ DB存取類別 """
+        self._image_dir: str = (
+            os.path.join(script_directory, "image", language)
+            if language
+            else os.path.join(script_directory, "image")
+        )
+        """ 圖片存放目錄，指定語言時為 image/<language> """
+        self._max_workers: int = max(1, max_workers)
+        """ 同時下載的執行緒數量 """
+        self._incremental: bool = incremental
+        """ 是否為增量模式 """
+        self._timeout: float = timeout
+        """ 單次請求的逾時秒數 """
+        self._store_dir: str = os.path.join(script_directory, "image", ".store")
+        """ 以內容雜湊定址的圖片儲存區 """
+        self._image_results: dict = {}
+        """ 本次執行已下載成功的圖片結果，鍵為圖片網址，值為依 IMAGE_RESULT_FIELDS 排列的 tuple """
+        self._session: requests.Session = requests.Session()
+        """ 共用連線的 HTTP session """
+        adapter = HTTPAdapter(
+            pool_connections=self._max_workers, pool_maxsize=self._max_workers
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
 
     @Common.exception_handler
     def check_image_folder(self):
         """
-        檢查是否存在 'image' 資料夾，若存在則刪除後重新建立
+        檢查是否存在 'image' 資料夾，若存在則刪除後重新建立，增量模式下保留既有圖片；
+        指定語言時只處理 image/<language>。共用的 image/.store 與其他語言的目錄一律保留，
+        不再使用的儲存區檔案由 prune_store 清理
         """
-        image_dir = os.path.join(self._script_directory, "image")
+        image_dir = self._image_dir
 
-        if os.path.exists(image_dir):
-            shutil.rmtree(image_dir)
-            print(f"已刪除資料夾: {image_dir}")
+        if self._incremental:
+            os.makedirs(image_dir, exist_ok=True)
+            print(f"增量模式，保留資料夾: {image_dir}")
+            return
+
+        image_root = os.path.join(self._script_directory, "image")
+        if image_dir != image_root:
+            if os.path.exists(image_dir):
+                shutil.rmtree(image_dir)
+                print(f"已刪除資料夾: {image_dir}")
+        elif os.path.exists(image_root):
+            # 單一語言的系列目錄直接放在 image/ 之下，與儲存區及各語言的目錄並列
+            kept_names = {".store", *Common().load_language_urls()}
+            for entry in os.scandir(image_root):
+                if entry.name in kept_names:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.remove(entry.path)
+            print(f"已清除資料夾: {image_root}")
 
         os.makedirs(image_dir, exist_ok=True)
         print(f"已建立資料夾: {image_dir}")
 
     @Common.exception_handler
-    def download_image(self, cid: int, img_url: str, series_name: str):
+    def get_image_path(self, img_url: str, series_name: str) -> str:
         """
-        下載檔案到指定目錄下
+        取得圖片保存路徑，目錄不存在時會自動建立
 
         Args:
-            cid (int): 圖片所屬卡片的cid (識別碼)
             img_url (str) : 圖片網址
             series_name (str): 系列名稱
+
+        Returns:
+            str: 圖片將被保存的完整路徑
         """
-        # 如果目錄不存在，創建目錄
-        dir_path = os.path.join(self._script_directory, "image", series_name)
+        dir_path = os.path.join(self._image_dir, series_name)
         os.makedirs(dir_path, exist_ok=True)
 
         # 從URL中提取檔名
-        file_name = os.path.basename(img_url)
+        return os.path.join(dir_path, os.path.basename(img_url))
+
+    @Common.exception_handler
+    def get_store_path(self, content_hash: str, img_url: str) -> str:
+        """
+        取得內容定址儲存區中的圖片路徑，目錄不存在時會自動建立
+
+        Args:
+            content_hash (str): 圖片內容的 SHA-256
+            img_url (str) : 圖片網址，用於保留副檔名
+
+        Returns:
+            str: 儲存區中的圖片路徑
+        """
+        extension = os.path.splitext(os.path.basename(img_url))[1]
+        dir_path = os.path.join(self._store_dir, content_hash[:2])
+        os.makedirs(dir_path, exist_ok=True)
+        return os.path.join(dir_path, f"{content_hash}{extension}")
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        """
+        計算檔案內容的 SHA-256
+
+        Args:
+            file_path (str): 檔案路徑
+
+        Returns:
+            str: SHA-256 十六進位字串
+        """
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(65536), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def link_image(source_path: str, file_path: str) -> None:
+        """
+        以硬連結將圖片放到目標路徑，檔案系統不支援時改為複製
+
+        Args:
+            source_path (str): 來源圖片路徑
+            file_path (str): 目標圖片路徑
+        """
+        if os.path.exists(file_path):
+            if os.path.samefile(source_path, file_path):
+                return
+            os.remove(file_path)
+        try:
+            os.link(source_path, file_path)
+        except OSError:
+            shutil.copyfile(source_path, file_path)
+
+    @Common.exception_handler
+    def fetch_image(self, img_url: str, headers: dict = None) -> dict:
+        """
+        以串流方式下載圖片至內容定址儲存區，相同內容只保存一份；
+        在主機並行限制內執行，遇到 429、5xx 或逾時時退避重試
+
+        Args:
+            img_url (str) : 圖片網址
+            headers (dict): 額外的請求標頭，例如條件式請求的 If-None-Match
+
+        Returns:
+            dict: 包含 status_code、size、etag、last_modified、content_hash、store_path 的回應資訊
+        """
+        return RATE_LIMITER.call(img_url, self._fetch_image_once, img_url, headers)
+
+    def _fetch_image_once(self, img_url: str, headers: dict = None) -> dict:
+        """
+        下載一次圖片，參數與回傳值同 fetch_image
+
+        Args:
+            img_url (str) : 圖片網址
+            headers (dict): 額外的請求標頭
+
+        Returns:
+            dict: 回應資訊
+        """
+        with self._session.get(
+            img_url, headers=headers, timeout=self._timeout, stream=True
+        ) as response:
+            response_info = {
+                "status_code": response.status_code,
+                "size": 0,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "content_hash": None,
+                "store_path": None,
+            }
+            if response.status_code == 304:
+                # 圖片未變更，保留既有檔案
+                return response_info
+            response.raise_for_status()  # 檢查請求是否成功
 
-        # 圖片將被保存的完整路徑
-        file_path = os.path.join(dir_path, file_name)
+            os.makedirs(self._store_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self._store_dir, suffix=".part")
+            digest = hashlib.sha256()
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=65536):
+                        f.write(chunk)
+                        digest.update(chunk)
+                        response_info["size"] += len(chunk)
 
-        # 下載圖片並保存到指定路徑
-        response = requests.get(img_url, timeout=10)
-        response.raise_for_status()  # 檢查請求是否成功
+                content_hash = digest.hexdigest()
+                store_path = self.get_store_path(content_hash, img_url)
+                if os.path.exists(store_path):
+                    # 相同內容已存在於儲存區
+                    os.remove(temp_path)
+                else:
+                    # mkstemp 建立的檔案權限為 0600，改為一般檔案權限
+                    os.chmod(temp_path, 0o644)
+                    os.replace(temp_path, store_path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
 
-        with open(file_path, "wb") as f:
-            f.write(response.content)
+        response_info["content_hash"] = content_hash
+        response_info["store_path"] = store_path
+        return response_info
+
+    @Common.exception_handler
+    def download_image(self, cid: int, img_url: str, series_name: str):
+        """
+        下載檔案到指定目錄下
+
+        Args:
+            cid (int): 圖片所屬卡片的cid (識別碼)
+            img_url (str) : 圖片網址
+            series_name (str): 系列名稱
+        """
+        file_path = self.get_image_path(img_url, series_name)
+
+        # 下載圖片至儲存區並連結到系列目錄
+        response_info = self.fetch_image(img_url)
+        self.link_image(response_info["store_path"], file_path)
 
         print(f"圖片已保存到 {file_path}")
         # 將檔案資訊儲存到資料庫
-        self._database.save_file_info(cid, file_path)
+        self._database.save_file_info(
+            cid, file_path, response_info["content_hash"], img_url
+        )
+
+    def _download_unique_image(
+        self, img_url: str, file_paths: list, previous: dict
+    ) -> dict:
+        """
+        下載單一不重複的圖片網址，錯誤不會拋出而是記錄在結果中
+
+        Args:
+            img_url (str) : 圖片網址
+            file_paths (list): 此圖片在各系列目錄下的保存路徑
+            previous (dict): Database.load_image_meta 記錄的圖片快取資訊，沒有時為 None
+
+        Returns:
+            dict: 下載結果，status 為 new、changed、unchanged 或 failed
+        """
+        result = {
+            "img_src": img_url,
+            "status": "new",
+            "content_hash": None,
+            "store_path": None,
+            "size": 0,
+            "etag": None,
+            "last_modified": None,
+            "error": "",
+        }
+        try:
+            headers = {}
+            if previous is not None and previous["run_status"]:
+                # 本次執行在先前的批次已處理過，直接沿用儲存區中的檔案
+                store_path = self.get_store_path(previous["content_hash"], img_url)
+                if os.path.exists(store_path):
+                    result.update({field: previous[field] for field in IMAGE_META_FIELDS})
+                    result.update(
+                        {"status": previous["run_status"], "store_path": store_path}
+                    )
+                    return result
+
+            if self._incremental and previous is not None:
+                store_path = self.get_store_path(previous["content_hash"], img_url)
+                if os.path.exists(store_path):
+                    if previous["etag"]:
+                        headers["If-None-Match"] = previous["etag"]
+                    if previous["last_modified"]:
+                        headers["If-Modified-Since"] = previous["last_modified"]
+                result.update({field: previous[field] for field in IMAGE_META_FIELDS})
+                result.update({"status": "changed", "store_path": store_path})
+            elif self._incremental:
+                existing_path = next(
+                    (path for path in file_paths if os.path.exists(path)), None
+                )
+                if existing_path is not None:
+                    # 已存在但沒有快取資訊的檔案直接匯入儲存區沿用
+                    content_hash = self.hash_file(existing_path)
+                    store_path = self.get_store_path(content_hash, img_url)
+                    if not os.path.exists(store_path):
+                        self.link_image(existing_path, store_path)
+                    result.update(
+                        {
+                            "status": "unchanged",
+                            "content_hash": content_hash,
+                            "store_path": store_path,
+                            "size": os.path.getsize(store_path),
+                        }
+                    )
+                    return result
+
+            response_info = self.fetch_image(img_url, headers or None)
+            if response_info["status_code"] == 304:
+                result["status"] = "unchanged"
+                return result
+
+            if result["content_hash"] == response_info["content_hash"]:
+                result["status"] = "unchanged"
+            result.update(
+                {
+                    "content_hash": response_info["content_hash"],
+                    "store_path": response_info["store_path"],
+                    "size": response_info["size"],
+                    "etag": response_info["etag"],
+                    "last_modified": response_info["last_modified"],
+                }
+            )
+        except (requests.RequestException, OSError) as err:
+            result["status"] = "failed"
+            result["error"] = str(err)
+        return result
+
+    def _link_image_group(self, image_result: dict, image_group: list) -> list:
+        """
+        將下載完成的圖片連結到各系列目錄，並記錄檔案資訊
+
+        Args:
+            image_result (dict): 不重複圖片的下載結果
+            image_group (list): 使用此圖片的 (CardImageRow, 保存路徑) 列表
+
+        Returns:
+            list: 每張卡片圖片的下載結果
+        """
+        results = []
+        for card_info, file_path in image_group:
+            result = dict(
+                image_result,
+                cid=card_info.cid,
+                series_name=card_info.series_name,
+                file_path=file_path,
+            )
+            if result["status"] != "failed":
+                try:
+                    self.link_image(result["store_path"], file_path)
+                except OSError as err:
+                    result.update({"status": "failed", "error": str(err)})
+                    print(f"圖片連結失敗 {file_path}: {err}")
+            if result["status"] != "failed":
+                if result["status"] != "unchanged":
+                    print(f"圖片已保存到 {file_path}")
+                self._database.save_file_info(
+                    result["cid"],
+                    file_path,
+                    result["content_hash"],
+                    result["img_src"],
+                )
+            results.append(result)
+        return results
+
+    @Common.exception_handler
+    def download_images(self, card_info_list, max_workers: int = None) -> list:
+        """
+        下載所有卡圖並回傳完整的下載結果列表；資料量大時請改用 iter_download_images
+
+        Args:
+            card_info_list (Iterable[CardImageRow]): 卡圖資訊，
+                cid 可為 None，待正規化後再以 Database.link_file_info_cid 補上
+            max_workers (int): 同時下載的執行緒數量，未指定時使用建構子設定
+
+        Returns:
+            list: 每張卡片圖片的下載結果
+        """
+        return list(self.iter_download_images(card_info_list, max_workers))
+
+    def iter_download_images(
+        self, card_info_rows, max_workers: int = None, remember_results: bool = True
+    ):
+        """
+        以多執行緒並行下載圖片並逐一產出結果，相同網址只下載一次，再以硬連結放到各系列目錄，
+        並將成功的檔案資訊儲存到資料庫。同一個實例中已下載成功的網址在之後的呼叫只會連結不會重新下載。
+        卡圖資訊只在送出下載時讀取，進行中的圖片最多為執行緒數量的四倍，
+        搭配 Database.iter_card_info_with_series_id 時記憶體用量不隨卡片數量增加
+
+        Args:
+            card_info_rows (Iterable[CardImageRow]): 卡圖資訊，相同網址相鄰時可合併為一次下載
+            max_workers (int): 同時下載的執行緒數量，未指定時使用建構子設定
+            remember_results (bool): 是否保留已下載的結果供之後的呼叫沿用；關閉時改由資料庫的
+                image_meta 查詢先前批次已下載的圖片，記憶體用量便不隨圖片數量增加
+
+        Yields:
+            dict: 每張卡片圖片的下載結果
+        """
+        max_workers = max_workers or self._max_workers
+        window = max_workers * 4
+        # 尚未下載完成的圖片，鍵為圖片網址，值為 (CardImageRow, 保存路徑) 列表
+        image_groups = {}
+        pending_urls = []
+        futures = set()
+        image_meta_rows = []
+        unique_count = 0
+        summary = {"new": 0, "changed": 0, "unchanged": 0, "failed": 0}
+
+        def submit_pending() -> None:
+            image_meta = (
+                self._database.load_image_meta(pending_urls)
+                if self._incremental or not remember_results
+                else {}
+            )
+            for img_url in pending_urls:
+                futures.add(
+                    executor.submit(
+                        self._download_unique_image,
+                        img_url,
+                        [file_path for _, file_path in image_groups[img_url]],
+                        image_meta.get(img_url),
+                    )
+                )
+            pending_urls.clear()
+
+        def finish_images(done: set):
+            for future in done:
+                image_result = future.result()
+                METRICS.increment("images")
+                if image_result["status"] in ("new", "changed"):
+                    METRICS.increment("bytes_downloaded", image_result["size"])
+                if image_result["status"] == "failed":
+                    print(f"圖片下載失敗 {image_result['img_src']}: {image_result['error']}")
+                else:
+                    if remember_results:
+                        self._image_results[image_result["img_src"]] = tuple(
+                            image_result[field] for field in IMAGE_RESULT_FIELDS
+                        )
+                    # 資料庫寫入集中在產出結果的執行緒進行，並累積後批次寫入
+                    image_meta_rows.append(
+                        (
+                            image_result["img_src"],
+                            image_result["content_hash"],
+                            image_result["etag"],
+                            image_result["last_modified"],
+                            image_result["size"],
+                            image_result["status"],
+                        )
+                    )
+                    if len(image_meta_rows) >= 200:
+                        self._database.save_image_meta(image_meta_rows)
+                        image_meta_rows.clear()
+                yield from self._link_image_group(
+                    image_result, image_groups.pop(image_result["img_src"])
+                )
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for card_info in card_info_rows:
+                img_url = card_info.img_src
+                file_path = self.get_image_path(img_url, card_info.series_name)
+                if img_url in image_groups:
+                    image_groups[img_url].append((card_info, file_path))
+                    continue
+                if img_url in self._image_results:
+                    image_result = dict(
+                        zip(IMAGE_RESULT_FIELDS, self._image_results[img_url])
+                    )
+                    for result in self._link_image_group(
+                        image_result, [(card_info, file_path)]
+                    ):
+                        summary[result["status"]] += 1
+                        yield result
+                    continue
+
+                # 出現新的網址時，先前累積的網址已收齊相鄰的重複列，可以送出下載
+                if len(pending_urls) >= max_workers:
+                    submit_pending()
+                while len(futures) >= window:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    futures.difference_update(done)
+                    for result in finish_images(done):
+                        summary[result["status"]] += 1
+                        yield result
+                image_groups[img_url] = [(card_info, file_path)]
+                pending_urls.append(img_url)
+                unique_count += 1
+
+            if pending_urls:
+                submit_pending()
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                futures.difference_update(done)
+                for result in finish_images(done):
+                    summary[result["status"]] += 1
+                    yield result
+
+        if image_meta_rows:
+            self._database.save_image_meta(image_meta_rows)
+        self._database.flush_file_info()
+
+        print(
+            f"圖片下載完成：共 {unique_count} 個不重複圖片，"
+            f"新增 {summary['new']} 張，更新 {summary['changed']} 張，"
+            f"未變更 {summary['unchanged']} 張，失敗 {summary['failed']} 張"
+        )
+
+    @staticmethod
+    def summarize_results(results: list) -> dict:
+        """
+        統計下載結果
+
+        Args:
+            results (list): download_images 回傳的下載結果
+
+        Returns:
+            dict: 各狀態的圖片數量
+        """
+        summary = {"new": 0, "changed": 0, "unchanged": 0, "failed": 0}
+        for result in results:
+            summary[result["status"]] += 1
+        return summary
+
+    @Common.exception_handler
+    def prune_store(self) -> dict:
+        """
+        刪除儲存區（含縮圖）中已沒有任何圖片連結的檔案，即硬連結數為 1 的檔案，
+        以及中斷下載留下的暫存檔。儲存區由所有語言共用，只能在沒有下載進行時呼叫；
+        檔案系統不支援硬連結時圖片為複製而來，無法判斷是否仍在使用，不會刪除
+
+        Returns:
+            dict: 刪除的檔案數量 removed 與釋放的位元組數 bytes
+        """
+        summary = {"removed": 0, "bytes": 0}
+        if not os.path.isdir(self._store_dir) or not self.supports_hardlinks(
+            self._store_dir
+        ):
+            return summary
+
+        for directory, _, file_names in os.walk(self._store_dir, topdown=False):
+            for file_name in file_names:
+                path = os.path.join(directory, file_name)
+                try:
+                    stat = os.stat(path)
+                    if stat.st_nlink > 1:
+                        continue
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+                summary["removed"] += 1
+                summary["bytes"] += stat.st_size
+            if directory != self._store_dir and not os.listdir(directory):
+                os.rmdir(directory)
+
+        print(
+            f"已清理圖片儲存區：刪除 {summary['removed']} 個未使用的檔案，"
+            f"釋放 {summary['bytes'] / 1024 / 1024:.1f} MB"
+        )
+        return summary
+
+    @staticmethod
+    def supports_hardlinks(directory: str) -> bool:
+        """
+        檢查目錄所在的檔案系統是否支援硬連結
+
+        Args:
+            directory (str): 目錄路徑
+
+        Returns:
+            bool: 是否支援
+        """
+        fd, probe_path = tempfile.mkstemp(dir=directory, suffix=".part")
+        os.close(fd)
+        link_path = f"{probe_path}.link"
+        try:
+            os.link(probe_path, link_path)
+            os.remove(link_path)
+            return True
+        except OSError:
+            return False
+        finally:
+            os.remove(probe_path)
@@ -0,0 +1,236 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from functions.common.common import Common
+from functions.database.database import Database
+from functions.download.image_download import Download
+
+DEFAULT_VARIANT_SIZES: dict = {"thumb": 200, "medium": 480}
+""" 預設產生的縮圖，鍵為名稱，值為寬度（像素） """
+
+
+def render_variant(source_path: str, output_path: str, width: int, webp: bool) -> str:
+    """
+    產生單一縮圖，在子行程中執行
+
+    Args:
+        source_path (str): 原圖路徑
+        output_path (str): 縮圖輸出路徑
+        width (int): 縮圖寬度，高度依比例計算，不會放大原圖
+        webp (bool): 是否輸出 WebP
+
+    Returns:
+        str: 縮圖輸出路徑
+    """
+    # 只在子行程需要 Pillow，未使用縮圖功能時不必載入
+    from PIL import Image  # pylint: disable=import-outside-toplevel
+
+    with Image.open(source_path) as image:
+        image.load()
+        if image.width > width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.Resampling.LANCZOS)
+
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(output_path), suffix=".part"
+        )
+        try:
+            with os.fdopen(fd, "wb") as file:
+                if webp:
+                    image.save(file, "WEBP", quality=80, method=4)
+                else:
+                    image.save(file, "PNG", optimize=True)
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, output_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    return output_path
+
+
+class ImageVariant:
+    """
+    縮圖產生類別，下載完成後以多行程產生各尺寸縮圖，
+    縮圖與原圖一樣以內容雜湊存放在儲存區，再連結到各系列目錄下的縮圖資料夾
+    """
+
+    def __init__(
+        self,
+        script_directory: str,
+        sizes: dict = None,
+        webp: bool = False,
+        max_workers: int = None,
+        database: Database = None,
+        language: str = "",
+    ):
+        """
+        縮圖產生類別 建構子
+
+        Args:
+        script_directory (str): 腳本目錄的路徑
+        sizes (dict): 鍵為縮圖名稱，值為寬度（像素），未指定時使用 DEFAULT_VARIANT_SIZES
+        webp (bool): 以 WebP 輸出縮圖，否則為 PNG
+        max_workers (int): 產生縮圖的行程數量，未指定時依 CPU 數量
+        database (Database): 共用的 DB存取類別，未指定時自行建立
+        language (str): 語言代碼，指定時使用該語言的資料庫
+        """
+        self._sizes: dict = dict(sizes or DEFAULT_VARIANT_SIZES)
+        """ 鍵為縮圖名稱，值為寬度 """
+        self._webp: bool = webp
+        """ 是否以 WebP 輸出 """
+        self._max_workers: int = max_workers
+        """ 產生縮圖的行程數量 """
+        self._database: Database = database or Database(
+            script_directory, language=language
+        )
+        """ DB存取類別 """
+        self._variant_store_dir: str = os.path.join(
+            script_directory, "image", ".store", "variants"
+        )
+        """ 縮圖的內容定址儲存區 """
+
+    @staticmethod
+    def parse_sizes(sizes: str) -> dict:
+        """
+        解析命令列的縮圖設定，例如 "thumb=200,medium=480"
+
+        Args:
+            sizes (str): 以逗號分隔的 名稱=寬度
+
+        Returns:
+            dict: 鍵為縮圖名稱，值為寬度
+
+        Raises:
+            ValueError: 格式錯誤或寬度不是正整數
+        """
+        parsed = {}
+        for item in sizes.split(","):
+            name, _, width = item.strip().partition("=")
+            if not name or not width.isdigit() or int(width) <= 0:
+                raise ValueError(f"無效的縮圖設定: {item}")
+            parsed[name] = int(width)
+        return parsed
+
+    @property
+    def extension(self) -> str:
+        """
+        縮圖的副檔名
+        """
+        return ".webp" if self._webp else ".png"
+
+    def get_variant_store_path(self, content_hash: str, name: str) -> str:
+        """
+        取得縮圖在儲存區的路徑，尺寸或格式改變時路徑也會改變
+
+        Args:
+            content_hash (str): 原圖內容的 SHA-256
+            name (str): 縮圖名稱
+
+        Returns:
+            str: 縮圖儲存路徑
+        """
+        return os.path.join(
+            self._variant_store_dir,
+            f"{name}-{self._sizes[name]}",
+            content_hash[:2],
+            f"{content_hash}{self.extension}",
+        )
+
+    def get_variant_path(self, file_path: str, name: str) -> str:
+        """
+        取得縮圖在系列目錄下的路徑，例如 image/<系列>/thumb/<檔名>.png
+
+        Args:
+            file_path (str): 原圖在系列目錄下的路徑
+            name (str): 縮圖名稱
+
+        Returns:
+            str: 縮圖路徑
+        """
+        directory, file_name = os.path.split(file_path)
+        stem = os.path.splitext(file_name)[0]
+        return os.path.join(directory, name, f"{stem}{self.extension}")
+
+    @Common.exception_handler
+    def generate_variants(self, download_results: list) -> dict:
+        """
+        為本次新增或變更的圖片產生縮圖，已是最新的縮圖會略過，並記錄縮圖路徑
+
+        Args:
+            download_results (list): Download.download_images 回傳的下載結果
+
+        Returns:
+            dict: 產生、略過與失敗的縮圖數量
+        """
+        summary = {"generated": 0, "skipped": 0, "failed": 0}
+        targets = [
+            result
+            for result in download_results
+            if result["status"] in ("new", "changed") and result.get("store_path")
+        ]
+
+        # 相同內容的圖片只產生一次縮圖
+        tasks = {}
+        for result in targets:
+            for name in self._sizes:
+                variant_store_path = self.get_variant_store_path(
+                    result["content_hash"], name
+                )
+                if variant_store_path in tasks or os.path.exists(variant_store_path):
+                    continue
+                tasks[variant_store_path] = (result["store_path"], name)
+
+        failed_paths = set()
+        if tasks:
+            with ProcessPoolExecutor(max_workers=self._max_workers) as executor:
+                futures = {
+                    variant_store_path: executor.submit(
+                        render_variant,
+                        source_path,
+                        variant_store_path,
+                        self._sizes[name],
+                        self._webp,
+                    )
+                    for variant_store_path, (source_path, name) in tasks.items()
+                }
+                for variant_store_path, future in futures.items():
+                    try:
+                        future.result()
+                        summary["generated"] += 1
+                    except Exception as err:  # pylint: disable=broad-exception-caught
+                        failed_paths.add(variant_store_path)
+                        summary["failed"] += 1
+                        print(f"縮圖產生失敗 {tasks[variant_store_path][0]}: {err}")
+
+        variant_rows = []
+        for result in targets:
+            for name in self._sizes:
+                variant_store_path = self.get_variant_store_path(
+                    result["content_hash"], name
+                )
+                if variant_store_path in failed_paths:
+                    continue
+                variant_path = self.get_variant_path(result["file_path"], name)
+                if variant_store_path not in tasks:
+                    summary["skipped"] += 1
+                os.makedirs(os.path.dirname(variant_path), exist_ok=True)
+                Download.link_image(variant_store_path, variant_path)
+                variant_rows.append(
+                    (
+                        result["file_path"],
+                        name,
+                        variant_path,
+                        result["content_hash"],
+                    )
+                )
+
+        if variant_rows:
+            self._database.save_variant_info(variant_rows)
+        print(
+            f"縮圖產生完成：產生 {summary['generated']} 張，"
+            f"已是最新 {summary['skipped']} 張，失敗 {summary['failed']} 張"
+        )
+        return summary
@@ -0,0 +1,237 @@
+import json
+import os
+import shutil
+
+import numpy as np
+
+from functions.common.common import Common
+from functions.database.database import Database
+
+EXPORT_TABLES: tuple = ("series", "cards_info", "cards_image_info")
+""" 匯出的資料表 """
+
+MANIFEST_NAME: str = "manifest.json"
+""" 記錄各資料表欄位與型別的檔案名稱 """
+
+NULL_CODE: int = -1
+""" 字典編碼中代表 NULL 的代碼 """
+
+
+class ColumnarTable:
+    """
+    以記憶體映射讀取的欄式資料表，數值欄位為 numpy 陣列，字串欄位為代碼陣列加字典
+    """
+
+    def __init__(self, table_dir: str, table_manifest: dict, mmap: bool = True):
+        """
+        欄式資料表 建構子
+
+        Args:
+        table_dir (str): 資料表的匯出目錄
+        table_manifest (dict): manifest 中此資料表的欄位資訊
+        mmap (bool): 以記憶體映射開啟，不會一次讀入整個檔案
+        """
+        self._table_dir: str = table_dir
+        """ 資料表的匯出目錄 """
+        self._mmap_mode: str = "r" if mmap else None
+        """ np.load 的 mmap_mode """
+        self.row_count: int = table_manifest["rows"]
+        """ 資料列數 """
+        self.column_kinds: dict = table_manifest["columns"]
+        """ 鍵為欄位名稱，值為 int、float 或 dict """
+        self._columns: dict = {}
+        """ 已開啟的欄位 """
+        self._dictionaries: dict = {}
+        """ 已讀取的字串字典 """
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """
+        取得欄位陣列，字串欄位回傳代碼陣列（NULL 為 -1）
+
+        Args:
+            column (str): 欄位名稱
+
+        Returns:
+            np.ndarray: 欄位陣列
+        """
+        if column not in self._columns:
+            kind = self.column_kinds[column]
+            file_name = f"{column}.codes.npy" if kind == "dict" else f"{column}.npy"
+            self._columns[column] = np.load(
+                os.path.join(self._table_dir, file_name), mmap_mode=self._mmap_mode
+            )
+        return self._columns[column]
+
+    def dictionary(self, column: str) -> np.ndarray:
+        """
+        取得字串欄位的字典，代碼即為字典的索引
+
+        Args:
+            column (str): 欄位名稱
+
+        Returns:
+            np.ndarray: 字串陣列
+        """
+        if column not in self._dictionaries:
+            self._dictionaries[column] = np.load(
+                os.path.join(self._table_dir, f"{column}.dict.npy")
+            )
+        return self._dictionaries[column]
+
+    def encode(self, column: str, value: str) -> int:
+        """
+        取得字串在欄位字典中的代碼，用於以代碼比較篩選
+
+        Args:
+            column (str): 欄位名稱
+            value (str): 字串
+
+        Returns:
+            int: 代碼，不存在時為 NULL_CODE
+        """
+        dictionary = self.dictionary(column)
+        index = int(np.searchsorted(dictionary, value))
+        if index < len(dictionary) and dictionary[index] == value:
+            return index
+        return NULL_CODE
+
+    def decode(self, column: str) -> list:
+        """
+        將字串欄位解碼為 Python 字串列表
+
+        Args:
+            column (str): 欄位名稱
+
+        Returns:
+            list: 字串列表，NULL 為 None
+        """
+        dictionary = self.dictionary(column).tolist()
+        return [None if code == NULL_CODE else dictionary[code] for code in self[column]]
+
+
+class ColumnarExport:
+    """
+    欄式匯出類別，將卡片資料表匯出為每欄一個的 .npy 檔，字串欄位以字典編碼
+    """
+
+    def __init__(self, database: Database):
+        """
+        欄式匯出類別 建構子
+
+        Args:
+        database (Database): DB存取類別
+        """
+        self._database: Database = database
+        """ DB存取類別 """
+
+    @staticmethod
+    def encode_column(values: list) -> tuple:
+        """
+        依欄位內容決定儲存型別並編碼
+
+        Args:
+            values (list): 欄位值
+
+        Returns:
+            tuple: (型別 int/float/dict, 陣列, 字典；非字串欄位為 None)
+        """
+        non_null = [value for value in values if value is not None]
+        if len(non_null) == len(values) and all(
+            isinstance(value, int) for value in non_null
+        ):
+            return "int", np.asarray(values, dtype=np.int64), None
+        if all(isinstance(value, (int, float)) for value in non_null):
+            # 含 NULL 的數值欄位以 NaN 表示
+            return (
+                "float",
+                np.asarray(
+                    [np.nan if value is None else value for value in values],
+                    dtype=np.float64,
+                ),
+                None,
+            )
+
+        dictionary = sorted({str(value) for value in non_null})
+        index = {value: code for code, value in enumerate(dictionary)}
+        code_dtype = np.int16 if len(dictionary) < 2**15 else np.int32
+        codes = np.fromiter(
+            (NULL_CODE if value is None else index[str(value)] for value in values),
+            dtype=code_dtype,
+            count=len(values),
+        )
+        return "dict", codes, np.asarray(dictionary, dtype=np.str_)
+
+    @Common.exception_handler
+    def export(self, output_dir: str) -> dict:
+        """
+        匯出資料表至 output_dir/<資料表>/，並寫入 manifest.json
+
+        Args:
+            output_dir (str): 匯出目錄，既有內容會被取代
+
+        Returns:
+            dict: manifest，鍵為資料表名稱，值為列數與欄位型別
+        """
+        manifest = {}
+        with self._database.connection() as conn:
+            existing_tables = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                )
+            }
+            tables = [table for table in EXPORT_TABLES if table in existing_tables]
+            snapshots = {}
+            for table in tables:
+                cursor = conn.execute(f"SELECT * FROM {table} ORDER BY rowid")
+                columns = [description[0] for description in cursor.description]
+                rows = cursor.fetchall()
+                snapshots[table] = (columns, rows)
+
+        temp_dir = f"{output_dir}.part"
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        # 沒有可匯出的資料表時仍建立目錄，寫出空的 manifest
+        os.makedirs(temp_dir)
+        for table, (columns, rows) in snapshots.items():
+            table_dir = os.path.join(temp_dir, table)
+            os.makedirs(table_dir)
+            column_kinds = {}
+            for index, column in enumerate(columns):
+                values = [row[index] for row in rows]
+                kind, array, dictionary = self.encode_column(values)
+                column_kinds[column] = kind
+                if kind == "dict":
+                    np.save(os.path.join(table_dir, f"{column}.codes.npy"), array)
+                    np.save(os.path.join(table_dir, f"{column}.dict.npy"), dictionary)
+                else:
+                    np.save(os.path.join(table_dir, f"{column}.npy"), array)
+            manifest[table] = {"rows": len(rows), "columns": column_kinds}
+
+        manifest_path = os.path.join(temp_dir, MANIFEST_NAME)
+        with open(manifest_path, "w", encoding="utf-8") as file:
+            json.dump(manifest, file, ensure_ascii=False, indent=2)
+
+        # 完成後才取代舊的匯出，讀取端不會看到寫到一半的檔案
+        shutil.rmtree(output_dir, ignore_errors=True)
+        os.replace(temp_dir, output_dir)
+        return manifest
+
+    @staticmethod
+    def load(export_dir: str, mmap: bool = True) -> dict:
+        """
+        讀取匯出的欄式資料，不需要 SQLite
+
+        Args:
+            export_dir (str): 匯出目錄
+            mmap (bool): 以記憶體映射開啟欄位
+
+        Returns:
+            dict: 鍵為資料表名稱，值為 ColumnarTable
+        """
+        manifest_path = os.path.join(export_dir, MANIFEST_NAME)
+        with open(manifest_path, "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+        return {
+            table: ColumnarTable(os.path.join(export_dir, table), table_manifest, mmap)
+            for table, table_manifest in manifest.items()
+        }
@@ -1,7 +1,176 @@
+import atexit
 import os
+import queue
+import threading
 from datetime import datetime
 
 
+class LogWriter:
+    """
+    背景寫入日誌的類別，以佇列接收訊息，保持檔案開啟並批次寫入，每日切換檔案
+    """
+
+    _writers: dict = {}
+    """ 各日誌目錄共用的寫入器，鍵為日誌目錄 """
+    _writers_lock: threading.Lock = threading.Lock()
+    """ 保護寫入器登錄表的鎖 """
+    _STOP: object = object()
+    """ 通知背景執行緒結束的標記 """
+
+    def __init__(self, log_folder: str, batch_size: int = 256):
+        """
+        背景寫入日誌的類別 建構子
+
+        Args:
+        log_folder (str): 日誌目錄
+        batch_size (int): 每次寫入檔案的最多訊息數量
+        """
+        self._log_folder: str = log_folder
+        """ 日誌目錄 """
+        self._batch_size: int = max(1, batch_size)
+        """ 每次寫入檔案的最多訊息數量 """
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        """ 待寫入的 (日期, 訊息) 佇列 """
+        self._file = None
+        """ 目前開啟的日誌檔案 """
+        self._file_date: str = ""
+        """ 目前開啟的日誌檔案日期 """
+        self._pid: int = os.getpid()
+        """ 建立寫入器的行程，子行程需要自己的寫入器 """
+        self._thread: threading.Thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        """ 背景寫入執行緒 """
+        self._thread.start()
+
+    @classmethod
+    def get_writer(cls, log_folder: str) -> "LogWriter":
+        """
+        取得日誌目錄對應的寫入器，同一行程內共用
+
+        Args:
+            log_folder (str): 日誌目錄
+
+        Returns:
+            LogWriter: 寫入器
+        """
+        with cls._writers_lock:
+            writer = cls._writers.get(log_folder)
+            if writer is None or not writer.is_current_process():
+                # 以 fork 建立的子行程不會繼承背景執行緒，需重新建立
+                writer = cls(log_folder)
+                cls._writers[log_folder] = writer
+            return writer
+
+    @classmethod
+    def close_all(cls) -> None:
+        """
+        寫出所有尚未寫入的訊息並關閉檔案，程式結束時自動呼叫
+        """
+        with cls._writers_lock:
+            writers = [
+                writer for writer in cls._writers.values() if writer.is_current_process()
+            ]
+            cls._writers = {}
+        for writer in writers:
+            writer.close()
+
+    def is_current_process(self) -> bool:
+        """
+        是否由目前的行程建立，以 fork 建立的子行程會繼承父行程的寫入器
+
+        Returns:
+            bool: 建立寫入器的行程是否為目前的行程
+        """
+        return self._pid == os.getpid()
+
+    def write(self, file_date: str, message: str) -> None:
+        """
+        將訊息排入佇列，由背景執行緒寫入
+
+        Args:
+            file_date (str): 訊息所屬的日期，決定寫入的檔案
+            message (str): 已格式化的訊息
+        """
+        self._queue.put((file_date, message))
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        等待目前佇列中的訊息全部寫入檔案
+
+        Args:
+            timeout (float): 最多等待秒數，未指定時等到完成
+
+        Returns:
+            bool: 是否在時間內完成
+        """
+        if not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """
+        寫出剩餘訊息後結束背景執行緒並關閉檔案
+        """
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+
+    def _open_file(self, file_date: str) -> None:
+        """
+        開啟指定日期的日誌檔案，日期改變時關閉前一天的檔案
+
+        Args:
+            file_date (str): 日期，格式為 YYYYMMDD
+        """
+        if self._file is not None:
+            self._file.close()
+        os.makedirs(self._log_folder, exist_ok=True)
+        self._file = open(
+            os.path.join(self._log_folder, f"{file_date}.txt"), "a", encoding="utf-8"
+        )
+        self._file_date = file_date
+
+    def _run(self) -> None:
+        """
+        背景執行緒：一次取出多筆訊息寫入後再 flush，直到收到結束標記
+        """
+        stopping = False
+        while not stopping:
+            items = [self._queue.get()]
+            while len(items) < self._batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            waiters = []
+            for item in items:
+                if item is self._STOP:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    file_date, message = item
+                    if file_date != self._file_date:
+                        self._open_file(file_date)
+                    self._file.write(message)
+
+            if self._file is not None:
+                self._file.flush()
+            for waiter in waiters:
+                waiter.set()
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+atexit.register(LogWriter.close_all)
+
+
 class Log:
     """
     錯誤紀錄類別
@@ -16,6 +185,8 @@ class Log:
         """
         self._script_directory: str = script_directory
         """ 腳本目錄的路徑 """
+        self._log_folder: str = os.path.join(script_directory, "log")
+        """ LOG文件夾的路徑 """
 
     def log_error_message(self, message: str) -> None:
         """
@@ -37,20 +208,25 @@ class Log:
 
     def log_message(self, level: str, message: str) -> None:
         """
-        寫入訊息至指定路徑
+        寫入訊息至指定路徑，實際寫檔由背景執行緒批次進行
 
         Args:
         level (str): 訊息等級
         message (str): 訊息內容
         """
-        # 創建LOG文件夾（如果不存在）
-        log_folder = os.path.join(self._script_directory, "log")
-        os.makedirs(log_folder, exist_ok=True)
-        # 獲取當前日期
-        current_date = datetime.now().strftime("%Y%m%d")
-        # 設置日誌文件名
-        log_file = os.path.join(log_folder, f"{current_date}.txt")
-        current_time = datetime.now().strftime("%H:%M:%S")
-        log_message = f"[{current_time}] [{level}] : {message}\n"
-        with open(log_file, "a", encoding="utf-8") as log:
-            log.write(log_message)
+        now = datetime.now()
+        log_message = f"[{now:%H:%M:%S}] [{level}] : {message}\n"
+        # 依訊息產生的日期決定寫入的檔案，跨日時自動切換
+        LogWriter.get_writer(self._log_folder).write(f"{now:%Y%m%d}", log_message)
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        等待已寫入的訊息全部落地到檔案
+
+        Args:
+            timeout (float): 最多等待秒數，未指定時等到完成
+
+        Returns:
+            bool: 是否在時間內完成
+        """
+        return LogWriter.get_writer(self._log_folder).flush(timeout)
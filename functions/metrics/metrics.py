@@ -0,0 +1,227 @@
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime
+
+LATENCY_BUCKETS: tuple = (
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    math.inf,
+)
+""" 延遲直方圖各區間的上限秒數 """
+
+RATE_COUNTERS: tuple = ("pages", "cards", "images")
+""" 需要換算為每秒速率的計數器 """
+
+
+class Metrics:
+    """
+    執行效能統計類別，記錄函式呼叫次數、延遲直方圖與吞吐量計數器，預設停用
+    """
+
+    def __init__(self):
+        """
+        執行效能統計類別 建構子
+        """
+        self._lock: threading.Lock = threading.Lock()
+        """ 保護統計資料的鎖 """
+        self.enabled: bool = False
+        """ 是否啟用統計，停用時 Common.exception_handler 不做任何量測 """
+        self._started_at: datetime = datetime.now()
+        """ 本次統計開始的時間 """
+        self._start: float = time.perf_counter()
+        """ 本次統計開始的計時點 """
+        self._functions: dict = {}
+        """ 各函式的呼叫統計，鍵為函式的 qualname """
+        self._counters: dict = {}
+        """ 吞吐量計數器，例如 pages、cards、images、bytes_downloaded、retries """
+
+    def enable(self) -> None:
+        """
+        啟用統計並清除先前的資料
+        """
+        self.reset()
+        self.enabled = True
+
+    def reset(self) -> None:
+        """
+        清除所有統計資料並重新開始計時
+        """
+        with self._lock:
+            self._started_at = datetime.now()
+            self._start = time.perf_counter()
+            self._functions = {}
+            self._counters = {}
+
+    def record_call(self, name: str, seconds: float, failed: bool = False) -> None:
+        """
+        記錄一次函式呼叫
+
+        Args:
+            name (str): 函式名稱
+            seconds (float): 耗時秒數
+            failed (bool): 是否拋出例外
+        """
+        bucket = next(
+            index for index, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound
+        )
+        with self._lock:
+            stats = self._functions.get(name)
+            if stats is None:
+                stats = {
+                    "calls": 0,
+                    "errors": 0,
+                    "total_seconds": 0.0,
+                    "max_seconds": 0.0,
+                    "histogram": [0] * len(LATENCY_BUCKETS),
+                }
+                self._functions[name] = stats
+            stats["calls"] += 1
+            stats["errors"] += int(failed)
+            stats["total_seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+            stats["histogram"][bucket] += 1
+
+    def increment(self, counter: str, amount: int = 1) -> None:
+        """
+        累加吞吐量計數器，停用時不做任何事
+
+        Args:
+            counter (str): 計數器名稱
+            amount (int): 累加的數量
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    @staticmethod
+    def estimate_percentile(histogram: list, percentile: float) -> float:
+        """
+        以直方圖估計百分位延遲，回傳所在區間的上限
+
+        Args:
+            histogram (list): 各區間的呼叫次數
+            percentile (float): 百分位，介於 0 與 1 之間
+
+        Returns:
+            float: 估計的延遲秒數，落在最後一個區間時為 None
+        """
+        target = math.ceil(sum(histogram) * percentile)
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, histogram):
+            seen += count
+            if count and seen >= target:
+                return bound if bound != math.inf else None
+        return None
+
+    def build_report(self, extra: dict = None) -> dict:
+        """
+        產生本次執行的統計報表
+
+        Args:
+            extra (dict): 附加到報表的資訊，例如語言與圖片統計
+
+        Returns:
+            dict: 包含 duration_seconds、counters、rates、functions 的報表
+        """
+        with self._lock:
+            duration = time.perf_counter() - self._start
+            counters = dict(self._counters)
+            functions = {
+                name: dict(stats, histogram=list(stats["histogram"]))
+                for name, stats in self._functions.items()
+            }
+            started_at = self._started_at
+
+        rates = {
+            f"{counter}_per_second": (
+                counters.get(counter, 0) / duration if duration > 0 else 0.0
+            )
+            for counter in RATE_COUNTERS
+        }
+        for stats in functions.values():
+            stats["average_seconds"] = stats["total_seconds"] / stats["calls"]
+            stats["p50_seconds"] = self.estimate_percentile(stats["histogram"], 0.5)
+            stats["p95_seconds"] = self.estimate_percentile(stats["histogram"], 0.95)
+            stats["histogram"] = {
+                ("inf" if bound == math.inf else f"{bound:g}"): count
+                for bound, count in zip(LATENCY_BUCKETS, stats["histogram"])
+            }
+
+        report = {
+            "run_id": started_at.strftime("%Y%m%d_%H%M%S"),
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "duration_seconds": duration,
+            "counters": counters,
+            "rates": rates,
+            "functions": functions,
+        }
+        report.update(extra or {})
+        return report
+
+    @staticmethod
+    def flatten_report(report: dict) -> list:
+        """
+        將報表攤平成 (指標名稱, 數值) 列表，供寫入 run_stats 資料表
+
+        Args:
+            report (dict): build_report 產生的報表
+
+        Returns:
+            list: (指標名稱, 數值) 列表
+        """
+        rows = [("duration_seconds", report["duration_seconds"])]
+        rows.extend(
+            (f"counter.{name}", value) for name, value in report["counters"].items()
+        )
+        rows.extend((f"rate.{name}", value) for name, value in report["rates"].items())
+        for name, stats in report["functions"].items():
+            for field in (
+                "calls",
+                "errors",
+                "total_seconds",
+                "average_seconds",
+                "p50_seconds",
+                "p95_seconds",
+                "max_seconds",
+            ):
+                if stats[field] is not None:
+                    rows.append((f"function.{name}.{field}", stats[field]))
+        return rows
+
+    @staticmethod
+    def write_report(script_directory: str, report: dict, suffix: str = "") -> str:
+        """
+        將報表寫入 report/run_<時間>[_<suffix>].json
+
+        Args:
+            script_directory (str): 腳本目錄的路徑
+            report (dict): build_report 產生的報表
+            suffix (str): 檔名後綴，例如語言代碼
+
+        Returns:
+            str: 報表檔案路徑
+        """
+        report_folder = os.path.join(script_directory, "report")
+        os.makedirs(report_folder, exist_ok=True)
+        file_name = f"run_{report['run_id']}{f'_{suffix}' if suffix else ''}.json"
+        report_path = os.path.join(report_folder, file_name)
+        with open(report_path, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        return report_path
+
+
+METRICS: Metrics = Metrics()
+""" 行程內共用的效能統計，由 Common.exception_handler 與各模組記錄 """
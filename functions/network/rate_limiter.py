@@ -0,0 +1,298 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+
+from functions.metrics.metrics import METRICS
+
+RETRYABLE_STATUS: tuple = (429, 500, 502, 503, 504)
+""" 代表伺服器忙碌或暫時錯誤、可重試的 HTTP 狀態碼 """
+
+CONGESTION_ERRORS: tuple = (
+    requests.Timeout,
+    requests.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+)
+""" 代表連線壅塞、可重試的例外 """
+
+
+class HostLimiter:
+    """
+    單一主機的並行數量限制，以 AIMD 調整：延遲正常時每輪加一，
+    遇到 429、5xx 或逾時時減半，並遵守 Retry-After
+    """
+
+    def __init__(
+        self,
+        initial_concurrency: int,
+        min_concurrency: int,
+        max_concurrency: int,
+        latency_tolerance: float = 2.0,
+    ):
+        """
+        主機並行限制 建構子
+
+        Args:
+        initial_concurrency (int): 初始並行數量
+        min_concurrency (int): 並行數量下限
+        max_concurrency (int): 並行數量上限
+        latency_tolerance (float): 平均延遲超過最低延遲的幾倍時視為伺服器排隊中，不再增加並行數量
+        """
+        self._min_concurrency: int = max(1, min_concurrency)
+        """ 並行數量下限 """
+        self._max_concurrency: int = max(self._min_concurrency, max_concurrency)
+        """ 並行數量上限 """
+        self.limit: float = float(
+            min(max(initial_concurrency, self._min_concurrency), self._max_concurrency)
+        )
+        """ 目前的並行數量上限 """
+        self._latency_tolerance: float = latency_tolerance
+        """ 延遲容許倍數 """
+        self._in_flight: int = 0
+        """ 進行中的請求數量 """
+        self._blocked_until: float = 0.0
+        """ 依 Retry-After 暫停送出請求直到此時間（monotonic） """
+        self._latency_average: float = None
+        """ 延遲的指數移動平均 """
+        self._min_latency: float = None
+        """ 觀察到的最低延遲 """
+        self._last_decrease: float = 0.0
+        """ 上次減少並行數量的時間（monotonic） """
+        self._condition: threading.Condition = threading.Condition()
+        """ 等待可用並行數量的條件變數 """
+
+    def acquire(self) -> None:
+        """
+        等待直到並行數量未達上限且不在暫停期間
+        """
+        with self._condition:
+            while True:
+                wait_seconds = self._blocked_until - time.monotonic()
+                if wait_seconds > 0:
+                    self._condition.wait(wait_seconds)
+                elif self._in_flight < int(self.limit):
+                    break
+                else:
+                    self._condition.wait()
+            self._in_flight += 1
+
+    def release(
+        self, latency: float = None, congested: bool = False, retry_after: float = None
+    ) -> None:
+        """
+        結束一個請求並依結果調整並行數量
+
+        Args:
+            latency (float): 請求耗時秒數，請求失敗時為 None
+            congested (bool): 是否遇到 429、5xx 或逾時
+            retry_after (float): 伺服器要求等待的秒數
+        """
+        with self._condition:
+            saturated = self._in_flight >= int(self.limit)
+            self._in_flight -= 1
+            now = time.monotonic()
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+            if congested:
+                METRICS.increment("throttled")
+                # 同一批進行中的請求一起失敗時只減半一次
+                if now - self._last_decrease >= (self._latency_average or 0.1):
+                    self.limit = max(self._min_concurrency, self.limit / 2)
+                    self._last_decrease = now
+            elif latency is not None:
+                self._min_latency = (
+                    latency
+                    if self._min_latency is None
+                    else min(self._min_latency, latency)
+                )
+                self._latency_average = (
+                    latency
+                    if self._latency_average is None
+                    else self._latency_average * 0.8 + latency * 0.2
+                )
+                healthy = self._latency_average <= max(
+                    self._min_latency * self._latency_tolerance,
+                    self._min_latency + 0.05,
+                )
+                # 只有並行數量用滿時才增加，約每輪請求加一
+                if healthy and saturated:
+                    self.limit = min(self._max_concurrency, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+class RateLimiter:
+    """
+    依主機限制並行數量並以隨機指數退避重試，爬蟲與圖片下載共用同一個實例
+    """
+
+    def __init__(
+        self,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 16,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+    ):
+        """
+        請求速率限制類別 建構子
+
+        Args:
+        initial_concurrency (int): 每個主機的初始並行數量
+        min_concurrency (int): 每個主機的並行數量下限
+        max_concurrency (int): 每個主機的並行數量上限
+        max_retries (int): 可重試的錯誤最多重試幾次
+        base_delay (float): 第一次重試前的最長等待秒數，之後每次加倍
+        max_delay (float): 重試前的最長等待秒數，亦為遵守 Retry-After 的上限
+        """
+        self._initial_concurrency: int = initial_concurrency
+        """ 每個主機的初始並行數量 """
+        self._min_concurrency: int = min_concurrency
+        """ 每個主機的並行數量下限 """
+        self._max_concurrency: int = max_concurrency
+        """ 每個主機的並行數量上限 """
+        self._max_retries: int = max(0, max_retries)
+        """ 可重試的錯誤最多重試幾次 """
+        self._base_delay: float = base_delay
+        """ 第一次重試前的最長等待秒數 """
+        self._max_delay: float = max_delay
+        """ 重試前的最長等待秒數 """
+        self._hosts: dict = {}
+        """ 鍵為主機，值為 HostLimiter """
+        self._lock: threading.Lock = threading.Lock()
+        """ 保護 _hosts 的鎖 """
+
+    def get_host(self, url: str) -> HostLimiter:
+        """
+        取得網址所屬主機的並行限制
+
+        Args:
+            url (str): 請求網址
+
+        Returns:
+            HostLimiter: 主機並行限制
+        """
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = HostLimiter(
+                    self._initial_concurrency,
+                    self._min_concurrency,
+                    self._max_concurrency,
+                )
+            return self._hosts[host]
+
+    def get_retry_delay(self, attempt: int) -> float:
+        """
+        取得第 attempt 次重試前的等待秒數，在 0 到指數上限之間隨機，避免同時重試
+
+        Args:
+            attempt (int): 第幾次重試，從 0 開始
+
+        Returns:
+            float: 等待秒數
+        """
+        return random.uniform(0, min(self._max_delay, self._base_delay * 2**attempt))
+
+    def parse_retry_after(self, response) -> float:
+        """
+        解析 Retry-After 標頭，最長只等待 max_delay 秒，
+        避免過長的秒數或遙遠的日期讓同一主機的所有請求停擺
+
+        Args:
+            response (requests.Response): 回應
+
+        Returns:
+            float | None: 等待秒數，沒有或無法解析時為 None
+        """
+        value = response.headers.get("Retry-After") if response is not None else None
+        if not value:
+            return None
+        if value.strip().isdigit():
+            seconds = float(value)
+        else:
+            try:
+                seconds = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return min(self._max_delay, max(0.0, seconds))
+
+    def classify_error(self, err: Exception, congestion_errors: tuple) -> tuple:
+        """
+        判斷例外是否代表主機壅塞，以及是否可以重試
+
+        Args:
+            err (Exception): 請求拋出的例外
+            congestion_errors (tuple): 額外視為壅塞的例外類別，例如瀏覽器的逾時
+
+        Returns:
+            tuple: (是否壅塞, Retry-After 秒數)；不是壅塞的錯誤不重試
+        """
+        if isinstance(err, requests.HTTPError):
+            response = err.response
+            if response is not None and response.status_code in RETRYABLE_STATUS:
+                return True, self.parse_retry_after(response)
+            return False, None
+        return isinstance(err, CONGESTION_ERRORS + congestion_errors), None
+
+    def call(
+        self,
+        url: str,
+        func,
+        *args,
+        max_retries: int = None,
+        congestion_errors: tuple = (),
+        **kwargs,
+    ):
+        """
+        在主機並行限制內執行請求，遇到壅塞時退避重試。
+        func 需在 HTTP 錯誤時拋出 requests.HTTPError（例如呼叫 raise_for_status）
+
+        Args:
+            url (str): 請求網址
+            func (callable): 執行請求的函式，以 *args、**kwargs 呼叫
+            max_retries (int): 最多重試幾次，未指定時使用建構子設定
+            congestion_errors (tuple): 額外視為壅塞、可重試的例外類別
+
+        Returns:
+            func 的回傳值
+        """
+        host_limiter = self.get_host(url)
+        max_retries = self._max_retries if max_retries is None else max_retries
+        attempt = 0
+        while True:
+            host_limiter.acquire()
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                # func 可能是 HTTP 請求或瀏覽器載入，任何例外都要先歸還並行名額，非壅塞時原樣拋出
+                congested, retry_after = self.classify_error(err, congestion_errors)
+                host_limiter.release(congested=congested, retry_after=retry_after)
+                if not congested or attempt >= max_retries:
+                    raise
+                METRICS.increment("request_retries")
+                delay = max(self.get_retry_delay(attempt), retry_after or 0)
+                print(f"請求失敗，{delay:.1f} 秒後重試第 {attempt + 1} 次 {url}: {err}")
+                time.sleep(delay)
+                attempt += 1
+                continue
+            host_limiter.release(latency=time.perf_counter() - start)
+            return result
+
+    def report(self) -> dict:
+        """
+        取得各主機目前的並行數量上限
+
+        Returns:
+            dict: 鍵為主機，值為並行數量上限
+        """
+        with self._lock:
+            return {host: round(limiter.limit, 2) for host, limiter in self._hosts.items()}
+
+
+RATE_LIMITER: RateLimiter = RateLimiter()
+""" 行程共用的請求速率限制，同一主機的爬蟲與圖片下載一起計算並行數量 """
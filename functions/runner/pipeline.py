@@ -0,0 +1,196 @@
+import queue
+import threading
+import time
+
+from functions.common.common import Common
+from functions.crawler.crawler import Crawler
+from functions.database.database import CardImageRow, Database
+from functions.download.image_download import Download
+
+
+class Pipeline:
+    """
+    串流執行流程類別，每個系列爬取完成後立即送往儲存與下載階段，
+    階段之間以有界佇列銜接以提供背壓
+    """
+
+    _STOP: object = object()
+    """ 通知下一個階段結束的標記 """
+
+    def __init__(
+        self,
+        crawler: Crawler,
+        database: Database,
+        download: Download,
+        queue_size: int = 4,
+        keep_changed: bool = False,
+    ):
+        """
+        串流執行流程類別 建構子
+
+        Args:
+        crawler (Crawler): 爬蟲相關類別
+        database (Database): DB存取類別
+        download (Download): 圖片下載類別
+        queue_size (int): 階段之間的佇列最多暫存幾個系列
+        keep_changed (bool): 是否保留新增或變更的下載結果，產生縮圖時需要
+        """
+        self._crawler: Crawler = crawler
+        """ 爬蟲相關類別 """
+        self._database: Database = database
+        """ DB存取類別 """
+        self._download: Download = download
+        """ 圖片下載類別 """
+        self._store_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        """ 爬取 → 儲存 的佇列 """
+        self._download_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        """ 儲存 → 下載 的佇列 """
+        self._errors: list = []
+        """ 背景階段發生的錯誤 """
+        self._keep_changed: bool = keep_changed
+        """ 是否保留新增或變更的下載結果 """
+        self.download_results: list = []
+        """ 失敗以及需要產生縮圖的下載結果 """
+        self.summary: dict = {"new": 0, "changed": 0, "unchanged": 0, "failed": 0}
+        """ 各狀態的圖片數量 """
+        self.stage_seconds: dict = {"crawl": 0.0, "store": 0.0, "download": 0.0}
+        """ 各階段實際工作的秒數 """
+        self.failed_series: dict = {}
+        """ 重試後仍爬取失敗的系列，鍵為系列名稱、值為錯誤訊息 """
+        self._stop_event: threading.Event = threading.Event()
+        """ 其他階段失敗時通知爬蟲 worker 停止 """
+
+    def _store_stage(self) -> None:
+        """
+        儲存階段：將系列卡片寫入資料庫，再把圖片送往下載階段
+        """
+        while True:
+            item = self._store_queue.get()
+            if item is self._STOP:
+                break
+            if self._errors:
+                # 已有階段失敗，只清空佇列讓爬取階段不被阻塞
+                continue
+
+            series_name, card_list = item
+            start = time.perf_counter()
+            try:
+                self._database.save_series_database(card_list)
+                card_info_list = [
+                    CardImageRow(None, card_info["img_src"], series_name)
+                    for card_info in card_list
+                    if card_info.get("img_src")
+                ]
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                self._errors.append(err)
+                self._stop_event.set()
+                continue
+            finally:
+                self.stage_seconds["store"] += time.perf_counter() - start
+            self._download_queue.put(card_info_list)
+
+        self._download_queue.put(self._STOP)
+
+    def _download_stage(self) -> None:
+        """
+        下載階段：逐批下載儲存階段送來的圖片，只保留後續需要的結果，記憶體不隨卡片數量增加
+        """
+        while True:
+            item = self._download_queue.get()
+            if item is self._STOP:
+                break
+            if self._errors:
+                continue
+
+            start = time.perf_counter()
+            try:
+                # 其他系列已下載的圖片由資料庫的 image_meta 查得，不需保留已下載的結果
+                for result in self._download.iter_download_images(
+                    item, remember_results=False
+                ):
+                    self.summary[result["status"]] += 1
+                    if result["status"] == "failed" or (
+                        self._keep_changed and result["status"] in ("new", "changed")
+                    ):
+                        self.download_results.append(result)
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                self._errors.append(err)
+                self._stop_event.set()
+            finally:
+                self.stage_seconds["download"] += time.perf_counter() - start
+
+    def _crawl_stage(self, language_url: str) -> None:
+        """
+        爬取階段：取得系列列表後由爬蟲 worker 並行爬取系列卡片並送往儲存階段
+
+        Args:
+            language_url (str): 用戶選擇的語言對應的網址
+        """
+
+        def enqueue_series_cards(product_name: str, card_list: list) -> None:
+            self._store_queue.put((product_name, card_list))
+            print(f"{product_name} 已爬取完畢，送往儲存與下載")
+
+        start = time.perf_counter()
+        try:
+            self._crawler.get_card_list(language_url)
+            all_card_list_infos = self._database.load_card_info()
+            self.failed_series = self._crawler.crawl_all_series(
+                all_card_list_infos,
+                language_url,
+                enqueue_series_cards,
+                self._stop_event,
+            )
+        finally:
+            self.stage_seconds["crawl"] += time.perf_counter() - start
+            self._crawler.close()
+
+    def _raise_stage_error(self) -> None:
+        """
+        若背景階段發生錯誤，拋出第一個錯誤
+        """
+        if self._errors:
+            raise self._errors[0]
+
+    @Common.exception_handler
+    def run(self, language_url: str) -> list:
+        """
+        執行串流流程：爬取、儲存、下載同時進行，爬取與儲存結束後正規化資料庫，
+        下載結束後為圖片補上正規化後的 cid
+
+        Args:
+            language_url (str): 用戶選擇的語言對應的網址
+
+        Returns:
+            list: 失敗以及需要產生縮圖的下載結果，各狀態的圖片數量見 summary
+        """
+        start = time.perf_counter()
+        store_thread = threading.Thread(target=self._store_stage, daemon=True)
+        download_thread = threading.Thread(target=self._download_stage, daemon=True)
+        store_thread.start()
+        download_thread.start()
+
+        try:
+            try:
+                self._crawl_stage(language_url)
+            finally:
+                self._store_queue.put(self._STOP)
+                store_thread.join()
+
+            self._raise_stage_error()
+            # 正規化只需要完整的卡片資料，可與尚在進行的下載同時執行
+            self._database.normalize_database()
+        finally:
+            download_thread.join()
+
+        self._raise_stage_error()
+        self._database.link_file_info_cid()
+
+        elapsed = time.perf_counter() - start
+        print(
+            f"串流流程完成，總耗時 {elapsed:.2f} 秒；各階段工作時間："
+            f"爬取 {self.stage_seconds['crawl']:.2f} 秒，"
+            f"儲存 {self.stage_seconds['store']:.2f} 秒，"
+            f"下載 {self.stage_seconds['download']:.2f} 秒"
+        )
+        return self.download_results
@@ -0,0 +1,565 @@
+import fnmatch
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from functions.common.common import Common
+from functions.crawler.crawler import Crawler
+from functions.crawler.page_cache import DEFAULT_TTL_SECONDS, PageCache
+from functions.database.database import Database
+from functions.download.image_download import Download
+from functions.download.image_variant import ImageVariant
+from functions.log.log import Log
+from functions.metrics.metrics import METRICS
+from functions.network.rate_limiter import RATE_LIMITER
+from functions.runner.pipeline import Pipeline
+
+SCOPED_STAGES: tuple = ("list", "crawl", "normalize", "download")
+""" 指定範圍執行時可選擇的階段，依此順序執行 """
+
+
+class Runner:
+    """
+    執行流程類別，負責串接爬蟲、正規化與圖片下載
+    """
+
+    def __init__(
+        self,
+        script_directory: str,
+        incremental: bool = False,
+        pipeline: bool = True,
+        crawl_workers: int = 1,
+        metrics: bool = False,
+        variant_sizes: dict = None,
+        webp: bool = False,
+        page_cache_ttl: float = DEFAULT_TTL_SECONDS,
+        refresh: bool = False,
+    ):
+        """
+        執行流程類別 建構子
+
+        Args:
+        script_directory (str): 腳本目錄的路徑
+        incremental (bool): 增量模式，保留上次的圖片與資料庫
+        pipeline (bool): 以串流方式同時爬取、儲存與下載；False 時依序執行三個階段
+        crawl_workers (int): 每個語言同時爬取系列的 worker 數量
+        metrics (bool): 記錄效能統計並輸出執行報表
+        variant_sizes (dict): 下載後產生的縮圖，鍵為名稱，值為寬度；未指定時不產生縮圖
+        webp (bool): 縮圖以 WebP 輸出
+        page_cache_ttl (float): 卡表頁面快取的有效秒數，0 代表不快取
+        refresh (bool): 忽略頁面快取重新取得所有卡表頁面
+        """
+        self._script_directory: str = script_directory
+        """ 腳本目錄的路徑 """
+        self._incremental: bool = incremental
+        """ 是否為增量模式 """
+        self._pipeline: bool = pipeline
+        """ 是否以串流方式執行 """
+        self._crawl_workers: int = crawl_workers
+        """ 每個語言同時爬取系列的 worker 數量 """
+        self._metrics: bool = metrics
+        """ 是否記錄效能統計 """
+        self._variant_sizes: dict = variant_sizes
+        """ 下載後產生的縮圖 """
+        self._webp: bool = webp
+        """ 縮圖是否以 WebP 輸出 """
+        self._page_cache_ttl: float = page_cache_ttl
+        """ 卡表頁面快取的有效秒數 """
+        self._refresh: bool = refresh
+        """ 是否忽略頁面快取 """
+
+    @Common.exception_handler
+    def run_language(self, language: str, language_url: str) -> dict:
+        """
+        完整處理單一語言：爬取卡表、正規化資料庫並下載卡圖
+
+        Args:
+            language (str): 語言代碼，空字串時沿用 storage/optcg.db 與 image/ 的單一語言配置
+            language_url (str): 語言對應的網址
+
+        Returns:
+            dict: 各狀態的圖片數量
+        """
+        if self._metrics:
+            # 多語言模式下每個行程各自統計
+            METRICS.enable()
+        log = Log(self._script_directory)
+        prefix = f"[{language}] " if language else ""
+        database = Database(self._script_directory, language=language)
+        try:
+            database.check_db_folder(self._incremental)
+            download = Download(
+                self._script_directory,
+                incremental=self._incremental,
+                database=database,
+                language=language,
+            )
+            download.check_image_folder()
+            crawler = Crawler(
+                self._script_directory,
+                database=database,
+                crawl_workers=self._crawl_workers,
+                page_cache=PageCache(
+                    self._script_directory,
+                    language,
+                    self._page_cache_ttl,
+                    refresh=self._refresh,
+                ),
+            )
+
+            log.log_info_message(f"{prefix}Selected language URL: {language_url}")
+            if self._pipeline:
+                # 爬取、儲存、下載同時進行
+                pipeline = Pipeline(
+                    crawler, database, download, keep_changed=bool(self._variant_sizes)
+                )
+                download_results = pipeline.run(language_url)
+                summary = pipeline.summary
+                failed_series = pipeline.failed_series
+                log.log_info_message(f"{prefix}串流爬取、正規化與下載完畢")
+            else:
+                download_results, summary, failed_series = self.run_serial(
+                    crawler, database, download, log, prefix, language_url
+                )
+            for series_name, error in failed_series.items():
+                log.log_error_message(f"{prefix}Series crawl error: {series_name} {error}")
+            # 有系列爬取失敗時，未爬取到的卡片不能視為已移除
+            card_changes = database.finalize_card_changes(not failed_series)
+            log.log_info_message(
+                f"{prefix}卡片變更 {database.run_id}：新增 {card_changes['added']} 張，"
+                f"變更 {card_changes['changed']} 張，移除 {card_changes['removed']} 張"
+            )
+            for result in download_results:
+                if result["status"] == "failed":
+                    log.log_error_message(
+                        f"{prefix}Download error: {result['img_src']} {result['error']}"
+                    )
+            log.log_info_message(
+                f"{prefix}下載全系列卡圖完畢：新增 {summary['new']} 張，"
+                f"更新 {summary['changed']} 張，未變更 {summary['unchanged']} 張，"
+                f"失敗 {summary['failed']} 張"
+            )
+            print(f"{prefix}下載全系列卡圖完畢....")
+            if self._variant_sizes:
+                # 只為新增或變更的圖片產生縮圖
+                variant_summary = ImageVariant(
+                    self._script_directory,
+                    self._variant_sizes,
+                    self._webp,
+                    database=database,
+                ).generate_variants(download_results)
+                log.log_info_message(
+                    f"{prefix}縮圖產生完畢：產生 {variant_summary['generated']} 張，"
+                    f"已是最新 {variant_summary['skipped']} 張，"
+                    f"失敗 {variant_summary['failed']} 張"
+                )
+            if self._metrics:
+                self.write_run_report(
+                    database,
+                    log,
+                    language,
+                    summary,
+                    failed_series,
+                    crawler.get_wait_stats(),
+                )
+            return summary
+        finally:
+            database.close()
+            # 子行程結束時不會執行 atexit，需在此寫出日誌
+            log.flush()
+
+    @Common.exception_handler
+    def write_run_report(
+        self,
+        database: Database,
+        log: Log,
+        language: str,
+        summary: dict,
+        failed_series: dict,
+        browser_wait: dict = None,
+    ) -> dict:
+        """
+        輸出本次執行的效能報表至 report/ 並寫入 run_stats 資料表
+
+        Args:
+            database (Database): DB存取類別
+            log (Log): 錯誤紀錄類別
+            language (str): 語言代碼
+            summary (dict): 各狀態的圖片數量
+            failed_series (dict): 重試後仍爬取失敗的系列
+            browser_wait (dict): Crawler.get_wait_stats 的瀏覽器等待頁面載入統計
+
+        Returns:
+            dict: 執行報表
+        """
+        report = METRICS.build_report(
+            {
+                "language": language,
+                "incremental": self._incremental,
+                "pipeline": self._pipeline,
+                "crawl_workers": self._crawl_workers,
+                "images": summary,
+                "failed_series": failed_series,
+                "host_concurrency": RATE_LIMITER.report(),
+                "browser_wait": browser_wait or {},
+            }
+        )
+        report_path = METRICS.write_report(self._script_directory, report, language)
+        database.save_run_stats(
+            report["run_id"], report["started_at"], METRICS.flatten_report(report)
+        )
+        rates = report["rates"]
+        log.log_info_message(
+            f"{f'[{language}] ' if language else ''}執行報表已輸出至 {report_path}："
+            f"{rates['pages_per_second']:.2f} 頁/秒，"
+            f"{rates['cards_per_second']:.2f} 張卡片/秒，"
+            f"{rates['images_per_second']:.2f} 張圖片/秒"
+        )
+        print(f"執行報表已輸出至 {report_path}")
+        return report
+
+    @staticmethod
+    def select_series(series: dict, patterns: list) -> dict:
+        """
+        依系列ID或名稱篩選系列；名稱不含萬用字元時為部分符合，不分大小寫
+
+        Args:
+            series (dict): 鍵為系列名稱、值為系列ID
+            patterns (list): 系列ID或名稱樣式，例如 "569110"、"OP-10"、"*ROYAL*"；空列表代表全部系列
+
+        Returns:
+            dict: 符合的系列，鍵為系列名稱、值為系列ID
+        """
+        if not patterns:
+            return dict(series)
+
+        selected = {}
+        for series_name, series_id in series.items():
+            for pattern in patterns:
+                name_pattern = pattern.casefold()
+                if not any(char in name_pattern for char in "*?["):
+                    name_pattern = f"*{name_pattern}*"
+                if pattern == series_id or fnmatch.fnmatchcase(
+                    series_name.casefold(), name_pattern
+                ):
+                    selected[series_name] = series_id
+                    break
+        return selected
+
+    @Common.exception_handler
+    def run_scoped(
+        self, language: str, language_url: str, patterns: list, stages: list
+    ) -> dict:
+        """
+        只對選定的系列執行指定的階段，沿用既有的資料庫與圖片，不清除其他系列的資料
+
+        Args:
+            language (str): 語言代碼
+            language_url (str): 語言對應的網址
+            patterns (list): 系列ID或名稱樣式，空列表代表全部系列
+            stages (list): SCOPED_STAGES 中欲執行的階段
+
+        Returns:
+            dict: 選定的系列、重試後仍爬取失敗的系列與各狀態的圖片數量
+        """
+        if self._metrics:
+            METRICS.enable()
+        log = Log(self._script_directory)
+        prefix = f"[{language}] " if language else ""
+        os.makedirs(os.path.join(self._script_directory, "storage"), exist_ok=True)
+        database = Database(self._script_directory, language=language)
+        crawler = None
+        failed_series = {}
+        images = None
+        try:
+            if "list" in stages or "crawl" in stages:
+                crawler = Crawler(
+                    self._script_directory,
+                    database=database,
+                    crawl_workers=self._crawl_workers,
+                    page_cache=PageCache(
+                        self._script_directory,
+                        language,
+                        self._page_cache_ttl,
+                        refresh=self._refresh,
+                    ),
+                )
+                # 系列列表只在 list 階段或資料庫還沒有系列時重新取得
+                if "list" in stages or not database.has_table("series"):
+                    crawler.get_card_list(language_url)
+            if not database.has_table("series"):
+                raise ValueError(f"{prefix}資料庫沒有系列列表，請先執行 list 階段")
+
+            selected = self.select_series(database.load_card_info(), patterns)
+            if not selected:
+                raise ValueError(f"{prefix}沒有符合的系列: {', '.join(patterns)}")
+            series_ids = list(selected.values())
+
+            if "list" in stages:
+                for series_name, series_id in selected.items():
+                    print(f"{prefix}{series_id}\t{series_name}")
+
+            if "crawl" in stages:
+
+                def replace_series_cards(product_name: str, card_list: list) -> None:
+                    database.replace_series_cards(selected[product_name], card_list)
+                    print(f"{prefix}{product_name} 已更新至資料庫")
+
+                failed_series = crawler.crawl_all_series(
+                    selected, language_url, replace_series_cards
+                )
+                for series_name, error in failed_series.items():
+                    log.log_error_message(
+                        f"{prefix}Series crawl error: {series_name} {error}"
+                    )
+                # 只爬取部分系列，未爬取的卡片不能視為已移除
+                card_changes = database.finalize_card_changes(False)
+                log.log_info_message(
+                    f"{prefix}已爬取 {len(selected)} 個系列，卡片變更："
+                    f"新增 {card_changes['added']} 張，變更 {card_changes['changed']} 張"
+                )
+
+            if "normalize" in stages:
+                database.normalize_database()
+                # 重新正規化後 cid 可能改變，其他系列的檔案資訊也需重新對應
+                database.link_file_info_cid(relink=True)
+                log.log_info_message(f"{prefix}資料庫正規化完畢")
+                print(f"{prefix}資料庫正規化完畢")
+
+            if "download" in stages:
+                download = Download(
+                    self._script_directory,
+                    incremental=True,
+                    database=database,
+                    language=language,
+                )
+                download.check_image_folder()
+                card_info_list = database.fetch_card_info_with_series_id(series_ids)
+                database.delete_file_info(
+                    [
+                        download.get_image_path(card_info.img_src, card_info.series_name)
+                        for card_info in card_info_list
+                    ]
+                )
+                download_results = download.download_images(card_info_list)
+                images = download.summarize_results(download_results)
+                log.log_info_message(
+                    f"{prefix}下載 {len(selected)} 個系列的卡圖完畢："
+                    f"新增 {images['new']} 張，更新 {images['changed']} 張，"
+                    f"未變更 {images['unchanged']} 張，失敗 {images['failed']} 張"
+                )
+                if self._variant_sizes:
+                    ImageVariant(
+                        self._script_directory,
+                        self._variant_sizes,
+                        self._webp,
+                        database=database,
+                    ).generate_variants(download_results)
+            return {"series": selected, "failed_series": failed_series, "images": images}
+        finally:
+            if crawler is not None:
+                crawler.close()
+            database.close()
+            log.flush()
+
+    @Common.exception_handler
+    def run_scoped_languages(
+        self, language_urls: dict, patterns: list, stages: list
+    ) -> dict:
+        """
+        依序對各語言執行 run_scoped；已有 storage/optcg_all.db 時重新合併所有語言的資料庫
+
+        Args:
+            language_urls (dict): 鍵為語言代碼，值為網址
+            patterns (list): 系列ID或名稱樣式
+            stages (list): 欲執行的階段
+
+        Returns:
+            dict: 鍵為語言代碼，值為 run_scoped 的結果
+        """
+        invalid = [stage for stage in stages if stage not in SCOPED_STAGES]
+        if invalid or not stages:
+            raise ValueError(
+                f"無效的階段: {', '.join(invalid) or '（空白）'}，"
+                f"可用的階段為 {', '.join(SCOPED_STAGES)}"
+            )
+
+        results = {
+            language: self.run_scoped(language, language_url, patterns, stages)
+            for language, language_url in language_urls.items()
+        }
+
+        merged_path = os.path.join(self._script_directory, "storage", "optcg_all.db")
+        if os.path.exists(merged_path) and ("normalize" in stages or "download" in stages):
+            languages = sorted(
+                os.path.basename(path)[len("optcg_"):-len(".db")]
+                for path in glob.glob(
+                    os.path.join(self._script_directory, "storage", "optcg_*.db")
+                )
+                if os.path.abspath(path) != os.path.abspath(merged_path)
+            )
+            merged_database = Database(self._script_directory, language="all")
+            try:
+                merged_database.merge_language_databases(languages)
+            finally:
+                merged_database.close()
+            print("已重新合併至 storage/optcg_all.db")
+        return results
+
+    @Common.exception_handler
+    def run_serial(
+        self,
+        crawler: Crawler,
+        database: Database,
+        download: Download,
+        log: Log,
+        prefix: str,
+        language_url: str,
+    ) -> tuple:
+        """
+        依序執行爬取、正規化與下載三個階段
+
+        Args:
+            crawler (Crawler): 爬蟲相關類別
+            database (Database): DB存取類別
+            download (Download): 圖片下載類別
+            log (Log): 錯誤紀錄類別
+            prefix (str): 訊息前綴
+            language_url (str): 語言對應的網址
+
+        Returns:
+            tuple: (失敗以及需要產生縮圖的下載結果, 各狀態的圖片數量, 重試後仍爬取失敗的系列)
+        """
+        # 將所有的卡片資料存入資料庫
+        failed_series = crawler.handle_all_card_list(language_url)
+        log.log_info_message(f"{prefix}儲存卡片資料至資料庫完畢....")
+        print(f"{prefix}儲存卡片資料至資料庫完畢....")
+        # 資料庫正規化
+        database.normalize_database()
+        log.log_info_message(f"{prefix}資料庫正規化完畢")
+        print(f"{prefix}資料庫正規化完畢")
+        # 逐批讀取卡片資料並行下載所有卡圖，只保留後續需要的結果，記憶體不隨卡片數量增加
+        log.log_info_message(f"{prefix}取出儲存資料")
+        print(f"{prefix}取出儲存資料")
+        summary = {"new": 0, "changed": 0, "unchanged": 0, "failed": 0}
+        download_results = []
+        # 卡圖資訊依網址排序，相同圖片相鄰，不需保留已下載的結果
+        for result in download.iter_download_images(
+            database.iter_card_info_with_series_id(), remember_results=False
+        ):
+            summary[result["status"]] += 1
+            if result["status"] == "failed" or (
+                self._variant_sizes and result["status"] in ("new", "changed")
+            ):
+                download_results.append(result)
+        return download_results, summary, failed_series
+
+    @Common.exception_handler
+    def run_languages(self, language_urls: dict, max_workers: int = None) -> dict:
+        """
+        以多個行程並行處理多個語言，各語言使用獨立的資料庫與圖片目錄，
+        完成後合併至 storage/optcg_all.db
+
+        Args:
+            language_urls (dict): 鍵為語言代碼，值為網址
+            max_workers (int): 同時執行的行程數量，未指定時每個語言一個行程
+
+        Returns:
+            dict: 鍵為語言代碼，值為圖片統計或錯誤訊息
+        """
+        log = Log(self._script_directory)
+        results = {}
+        start = time.perf_counter()
+        with ProcessPoolExecutor(
+            max_workers=max_workers or len(language_urls)
+        ) as executor:
+            futures = {
+                language: executor.submit(self.run_language, language, language_url)
+                for language, language_url in language_urls.items()
+            }
+            for language, future in futures.items():
+                try:
+                    results[language] = future.result()
+                except Exception as err:  # pylint: disable=broad-exception-caught
+                    # 單一語言失敗不影響其他語言的結果
+                    results[language] = {"error": str(err)}
+                    log.log_error_message(f"[{language}] {type(err).__name__}: {err}")
+                    print(f"[{language}] 處理失敗: {err}")
+
+        succeeded = [language for language in results if "error" not in results[language]]
+        merged_database = Database(self._script_directory, language="all")
+        try:
+            merged_database.merge_language_databases(succeeded)
+        finally:
+            merged_database.close()
+
+        elapsed = time.perf_counter() - start
+        log.log_info_message(
+            f"多語言處理完畢，成功 {len(succeeded)}/{len(language_urls)} 個語言，"
+            f"耗時 {elapsed:.1f} 秒"
+        )
+        print(f"多語言處理完畢，已合併至 storage/optcg_all.db，耗時 {elapsed:.1f} 秒")
+        return results
+
+    @Common.exception_handler
+    def prune_image_store(self) -> dict:
+        """
+        清理 image/.store 中已沒有任何圖片使用的檔案，例如被新版本取代的卡圖；
+        儲存區由所有語言共用，需在所有語言處理完畢後執行
+
+        Returns:
+            dict: 刪除的檔案數量與釋放的位元組數
+        """
+        summary = Download(self._script_directory).prune_store()
+        Log(self._script_directory).log_info_message(
+            f"清理圖片儲存區：刪除 {summary['removed']} 個未使用的檔案，"
+            f"釋放 {summary['bytes']} 位元組"
+        )
+        return summary
+
+    @Common.exception_handler
+    def export_columnar(self, output_dir: str) -> dict:
+        """
+        將 storage/ 下所有資料庫的卡片資料表匯出為欄式檔案，
+        storage/optcg_<語言>.db 匯出至 <output_dir>/optcg_<語言>/
+
+        Args:
+            output_dir (str): 匯出目錄，相對路徑以腳本目錄為基準
+
+        Returns:
+            dict: 鍵為資料庫名稱，值為 manifest
+        """
+        log = Log(self._script_directory)
+        output_dir = os.path.join(self._script_directory, output_dir)
+        db_paths = sorted(
+            glob.glob(os.path.join(self._script_directory, "storage", "optcg*.db"))
+        )
+        if not db_paths:
+            raise IOError("storage/ 下沒有可匯出的資料庫，請先執行爬取")
+
+        # numpy 只有匯出時需要，不在一般爬取流程載入
+        from functions.export.columnar_export import (  # pylint: disable=import-outside-toplevel
+            ColumnarExport,
+        )
+
+        manifests = {}
+        for db_path in db_paths:
+            db_name = os.path.splitext(os.path.basename(db_path))[0]
+            language = db_name[len("optcg_"):] if db_name.startswith("optcg_") else ""
+            database = Database(self._script_directory, language=language)
+            try:
+                start = time.perf_counter()
+                manifests[db_name] = ColumnarExport(database).export(
+                    os.path.join(output_dir, db_name)
+                )
+            finally:
+                database.close()
+            rows = sum(table["rows"] for table in manifests[db_name].values())
+            message = (
+                f"{db_name} 已匯出至 {os.path.join(output_dir, db_name)}："
+                f"{rows} 列，耗時 {time.perf_counter() - start:.2f} 秒"
+            )
+            log.log_info_message(message)
+            print(message)
+        return manifests
@@ -1,60 +1,180 @@
+import argparse
+import multiprocessing
 import sqlite3
+import sys
 
 import requests
-from selenium.common.exceptions import WebDriverException
 
 from functions.common.common import Common
-from functions.crawler.crawler import Crawler
-from functions.database.database import Database
-from functions.download.image_download import Download
+from functions.crawler.page_cache import DEFAULT_TTL_SECONDS
+from functions.download.image_variant import DEFAULT_VARIANT_SIZES, ImageVariant
 from functions.log.log import Log
+from functions.runner.runner import SCOPED_STAGES, Runner
 
-# 初始化設定
-_common: Common = Common()
-_script_directory: str = _common.get_script_directory(__file__)
-_database: Database = Database(_script_directory)
-_database.check_db_folder()
-_download: Download = Download(_script_directory)
-_download.check_image_folder()
 
-# 初始化類別
-_crawler: Crawler = Crawler(_script_directory)
-_log: Log = Log(_script_directory)
+def parse_args() -> argparse.Namespace:
+    """
+    解析命令列參數
 
+    Returns:
+        argparse.Namespace: 命令列參數
+    """
+    # 未指定參數時會清除 storage/ 與 image/ 重新爬取，拼錯或縮寫的參數一律視為錯誤
+    parser = argparse.ArgumentParser(description="optcg_card", allow_abbrev=False)
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="保留上次的圖片與資料庫，只下載新增或變更的卡圖",
+    )
+    parser.add_argument(
+        "--serial",
+        action="store_true",
+        help="依序執行爬取、正規化、下載三個階段，不使用串流流程",
+    )
+    parser.add_argument(
+        "--languages",
+        help="以逗號分隔的語言代碼（例如 ja,en），或 all 代表全部語言；"
+        "指定時各語言以獨立行程並行處理，未指定時互動選擇單一語言",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="多語言模式同時執行的行程數量，預設每個語言一個行程",
+    )
+    parser.add_argument(
+        "--crawl-workers",
+        type=int,
+        default=1,
+        help="每個語言同時爬取系列的 worker 數量，失敗的系列會自動重試",
+    )
+    parser.add_argument(
+        "--variants",
+        nargs="?",
+        type=ImageVariant.parse_sizes,
+        const=DEFAULT_VARIANT_SIZES,
+        help="下載後為新增或變更的圖片產生縮圖，格式為 名稱=寬度（以逗號分隔），"
+        "只加上參數時為 thumb=200,medium=480",
+    )
+    parser.add_argument(
+        "--webp",
+        action="store_true",
+        help="縮圖以 WebP 格式輸出",
+    )
+    parser.add_argument(
+        "--export",
+        nargs="?",
+        const="export",
+        help="不爬取，將 storage/ 下的資料庫匯出為欄式 .npy 檔（預設輸出至 export/）",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="記錄函式呼叫次數、延遲與吞吐量，輸出 report/ 下的 JSON 報表與 run_stats 資料表",
+    )
+    parser.add_argument(
+        "--page-cache-ttl",
+        type=float,
+        default=DEFAULT_TTL_SECONDS,
+        help="卡表頁面快取在 cache/pages/ 的有效秒數，0 代表不使用快取（預設 3600）",
+    )
+    parser.add_argument(
+        "--series",
+        help="以逗號分隔的系列ID或名稱樣式（例如 569110,*ROYAL*），只處理符合的系列，"
+        "沿用既有的資料庫與圖片；需搭配 --languages",
+    )
+    parser.add_argument(
+        "--stages",
+        help=f"以逗號分隔的執行階段：{', '.join(SCOPED_STAGES)}；"
+        "指定 --series 時預設為 crawl,normalize,download",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="忽略頁面快取，重新取得所有卡表頁面",
+    )
+    return parser.parse_args()
+
+
+def get_webdriver_errors() -> tuple:
+    """
+    取得瀏覽器錯誤的例外類別；selenium 只在需要瀏覽器時載入，未載入時不可能發生此類錯誤
+
+    Returns:
+        tuple: 已載入 selenium 時為 (WebDriverException,)，否則為空 tuple
+    """
+    selenium_exceptions = sys.modules.get("selenium.common.exceptions")
+    if selenium_exceptions is None:
+        return ()
+    return (selenium_exceptions.WebDriverException,)
+
+
+def main() -> None:
+    """
+    程式進入點
+    """
+    args = parse_args()
+    common = Common()
+    script_directory = common.get_script_directory(__file__)
+    log = Log(script_directory)
+    runner = Runner(
+        script_directory,
+        incremental=args.incremental,
+        pipeline=not args.serial,
+        crawl_workers=args.crawl_workers,
+        metrics=args.metrics,
+        variant_sizes=args.variants,
+        webp=args.webp,
+        page_cache_ttl=args.page_cache_ttl,
+        refresh=args.refresh,
+    )
 
-if __name__ == "__main__":
     try:
-        # 選擇網站語言(Y:日文 N:中文)
-        LANGUAGE_URL = _common.get_user_choice_language_url()
-        _log.log_info_message("Selected language URL: " + LANGUAGE_URL)
-        # 將所有的卡片資料存入資料庫
-        _crawler.handle_all_card_list(LANGUAGE_URL)
-        _log.log_info_message("儲存卡片資料至資料庫完畢....")
-        print("儲存卡片資料至資料庫完畢....")
-        # 資料庫正規化
-        _database.normalize_database()
-        _log.log_info_message("資料庫正規化完畢")
-        print("資料庫正規化完畢")
-        # 逐一讀取卡片資料
-        all_cards_info = _database.fetch_card_info_with_series_id()
-        _log.log_info_message("取出儲存資料")
-        print("取出儲存資料")
-        # 逐一取出 series_id 並處理
-        for card_info in all_cards_info:
-            _download.download_image(
-                card_info["cid"], card_info["img_src"], card_info["series_name"]
+        if args.export:
+            # 匯出既有資料庫供分析使用
+            runner.export_columnar(args.export)
+        elif args.series or args.stages:
+            # 只對選定的系列執行指定的階段
+            if not args.languages:
+                raise ValueError("--series 與 --stages 需搭配 --languages 指定語言")
+            runner.run_scoped_languages(
+                common.get_language_urls(args.languages),
+                [item.strip() for item in (args.series or "").split(",") if item.strip()],
+                [
+                    item.strip().lower()
+                    for item in (args.stages or "crawl,normalize,download").split(",")
+                    if item.strip()
+                ],
             )
-        _log.log_info_message("下載全系列卡圖完畢....")
-        print("下載全系列卡圖完畢....")
+        elif args.languages:
+            # 並行處理多個語言
+            language_urls = common.get_language_urls(args.languages)
+            runner.run_languages(language_urls, args.workers)
+        else:
+            # 選擇網站語言
+            language_url = common.get_user_choice_language_url()
+            runner.run_language("", language_url)
+        if not args.export:
+            # 所有語言都處理完畢後，刪除儲存區中已被取代而不再使用的圖片
+            runner.prune_image_store()
     except sqlite3.DatabaseError as err:
-        _log.log_error_message(f"Database error: {err}")
+        log.log_error_message(f"Database error: {err}")
         print(f"Database error: {err}")
     except requests.RequestException as err:
-        _log.log_error_message(f"Request error: {err}")
+        log.log_error_message(f"Request error: {err}")
         print(f"Request error: {err}")
-    except WebDriverException as err:
-        _log.log_error_message(f"WebDriver error: {err}")
+    except get_webdriver_errors() as err:
+        log.log_error_message(f"WebDriver error: {err}")
         print(f"WebDriver error: {err}")
     except IOError as err:
-        _log.log_error_message(f"An I/O error occurred: {err}")
+        log.log_error_message(f"An I/O error occurred: {err}")
         print(f"I/O error occurred: {err}")
+    except ValueError as err:
+        log.log_error_message(f"Invalid argument: {err}")
+        print(f"Invalid argument: {err}")
+
+
+if __name__ == "__main__":
+    # 打包為可執行文件時，多語言模式的子行程需要此設定
+    multiprocessing.freeze_support()
+    main()
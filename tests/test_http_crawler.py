@@ -0,0 +1,122 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from functions.crawler.crawler import Crawler
+from functions.crawler.http_crawler import HttpCrawler
+
+FIXTURE_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+""" 測試用的錄製頁面目錄 """
+
+LANGUAGE_URL: str = "https://www.onepiece-cardgame.com"
+""" build_card_record 使用的語言網址 """
+
+
+def load_fixture(file_name: str) -> str:
+    """
+    讀取錄製頁面
+
+    Args:
+        file_name (str): 檔名
+
+    Returns:
+        str: 檔案內容
+    """
+    with open(os.path.join(FIXTURE_DIR, file_name), "r", encoding="utf-8") as file:
+        return file.read()
+
+
+@pytest.fixture(name="series_html")
+def fixture_series_html() -> str:
+    return load_fixture("series_cards.html")
+
+
+@pytest.fixture(name="browser_cards")
+def fixture_browser_cards() -> list:
+    # Crawler.bulk_extract_script 對 series_cards.html 的預期回傳值，依腳本邏輯人工撰寫，
+    # 尚未以實際瀏覽器產生；安裝 Chrome 時由 test_browser_script_matches_fixture 驗證
+    return json.loads(load_fixture("series_cards_browser.json"))
+
+
+@pytest.fixture(name="crawler")
+def fixture_crawler(tmp_path) -> Crawler:
+    return Crawler(str(tmp_path))
+
+
+def test_parse_series_cards_matches_browser_script(series_html, browser_cards):
+    assert HttpCrawler().parse_series_cards(series_html) == browser_cards
+
+
+def test_card_records_match_browser_script(series_html, browser_cards, crawler):
+    http_records = [
+        crawler.build_card_record(raw_card, LANGUAGE_URL, "569101")
+        for raw_card in HttpCrawler().parse_series_cards(series_html)
+    ]
+    browser_records = [
+        crawler.build_card_record(raw_card, LANGUAGE_URL, "569101")
+        for raw_card in browser_cards
+    ]
+    assert http_records == browser_records
+    assert http_records[0]["img_src"] == (
+        f"{LANGUAGE_URL}/images/cardlist/card/OP01-001.png"
+    )
+    assert http_records[2]["power"] == 0
+
+
+def test_effect_markup(series_html):
+    leader, character, event = HttpCrawler().parse_series_cards(series_html)
+    # <h3> 標題移除、<br> 換成空白，文字中的 & 與 > 與 innerHTML 相同保持跳脫
+    assert leader["effect"] == (
+        "【ドン!!×1】【相手のターン中】自分のキャラ全てのパワー+1000。 「麦わら」&amp;「ゾロ」"
+    )
+    assert character["effect"] == "【登場時】カード1枚を引き、A&amp;B &gt; C。 【ブロッカー】 ドン!!−1"
+    assert "<h3>" not in event["effect"]
+    # 屬性取 img 的 alt，沒有圖示時為 "-"；alt 屬性中的 &amp; 會被解碼
+    assert (leader["attribute"], character["attribute"], event["attribute"]) == (
+        "斬",
+        "特",
+        "-",
+    )
+    assert character["card_name"] == "ウソップ & カヤ"
+
+
+@pytest.mark.parametrize("removed", ['<div class="backCol">', '<div class="text">'])
+def test_missing_markup_falls_back_to_browser(series_html, removed):
+    html = series_html.replace(removed, '<div class="other">', 1)
+    assert HttpCrawler().parse_series_cards(html) is None
+
+
+def test_missing_result_col_returns_none():
+    assert HttpCrawler().parse_series_cards("<html><body></body></html>") is None
+
+
+def test_empty_result_col_returns_empty_list():
+    html = '<html><body><div class="resultCol"></div></body></html>'
+    assert HttpCrawler().parse_series_cards(html) == []
+
+
+def test_browser_script_matches_fixture(crawler, browser_cards):
+    """
+    有安裝 Chrome 時實際在瀏覽器執行批次提取腳本，確認錄製的回傳值仍然正確
+    """
+    if not any(
+        shutil.which(name)
+        for name in ("google-chrome", "chrome", "chromium", "chromium-browser")
+    ):
+        pytest.skip("未安裝 Chrome")
+    webdriver = pytest.importorskip("selenium.webdriver")
+    from selenium.webdriver.common.by import By  # pylint: disable=import-outside-toplevel
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    driver = webdriver.Chrome(options=options)
+    try:
+        driver.get(Path(FIXTURE_DIR, "series_cards.html").as_uri())
+        result_col = driver.find_element(By.CLASS_NAME, "resultCol")
+        assert driver.execute_script(crawler.bulk_extract_script, result_col) == browser_cards
+    finally:
+        driver.quit()